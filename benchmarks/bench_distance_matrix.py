@@ -0,0 +1,47 @@
+"""Time location x station distance matrices at statewide size.
+
+Run from the repository root: ``python benchmarks/bench_distance_matrix.py``.
+"""
+from __future__ import annotations
+
+import random
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.fixtures import statewide_stations
+from custom_components.nsw_fuel.distance import distance_matrix, haversine_km, np
+
+LOCATIONS = 50
+
+
+def _scalar_loop(origins, targets):
+    return [[haversine_km(*origin, *target) for target in targets] for origin in origins]
+
+
+def main() -> None:
+    rng = random.Random(11)
+    origins = [(rng.uniform(-34.2, -32.8), rng.uniform(150.6, 151.8)) for _ in range(LOCATIONS)]
+    targets = [
+        (s["location"]["latitude"], s["location"]["longitude"]) for s in statewide_stations()
+    ]
+    print(f"locations={len(origins)} stations={len(targets)}")
+    runs = [
+        ("scalar loop", lambda: _scalar_loop(origins, targets)),
+        ("matrix lists", lambda: distance_matrix(origins, targets, vectorised=False)),
+    ]
+    if np is not None:
+        runs.append(("matrix numpy", lambda: distance_matrix(origins, targets)))
+    else:
+        print("numpy not installed; skipping the vectorised backend")
+    for label, run in runs:
+        elapsed = timeit.timeit(run, number=5) / 5
+        print(f"{label:<13} {elapsed * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Compare JSON decode paths for the statewide all-prices payload.
+
+``text + json`` is the old path (bytes decoded to str, then parsed);
+the others parse the response bytes directly, as NswFuelApi does now.
+Run from the repository root: ``python benchmarks/bench_json_decode.py``.
+"""
+from __future__ import annotations
+
+import json
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.fixtures import statewide_payload
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _decoders() -> List[Tuple[str, Callable[[bytes], Any]]]:
+    decoders: List[Tuple[str, Callable[[bytes], Any]]] = [
+        ("text + json", lambda body: json.loads(body.decode("utf-8"))),
+        ("bytes + json", json.loads),
+    ]
+    if orjson is not None:
+        decoders.append(("bytes + orjson", orjson.loads))
+    return decoders
+
+
+def _peak_kib(decode: Callable[[bytes], Any], body: bytes) -> float:
+    tracemalloc.start()
+    result = decode(body)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak / 1024
+
+
+def main() -> None:
+    payload: Dict[str, Any] = statewide_payload()
+    body = json.dumps(payload).encode("utf-8")
+    number = 20
+    print(
+        f"stations={len(payload['stations'])} prices={len(payload['prices'])} "
+        f"body={len(body) / 1024:.0f} KiB"
+    )
+    if orjson is None:
+        print("orjson not installed; skipping the orjson backend")
+    for label, decode in _decoders():
+        assert decode(body) == payload
+        seconds = timeit.timeit(lambda: decode(body), number=number)
+        print(
+            f"{label:<16} {seconds / number * 1e3:8.2f} ms/decode"
+            f" {_peak_kib(decode, body):10.0f} KiB peak"
+        )
+
+
+if __name__ == "__main__":
+    main()
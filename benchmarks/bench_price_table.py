@@ -0,0 +1,46 @@
+"""Compare snapshot ranking with the columnar price table and list loops.
+
+Run from the repository root: ``python benchmarks/bench_price_table.py``.
+"""
+from __future__ import annotations
+
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.fixtures import statewide_payload
+from custom_components.nsw_fuel.coordinator import _iter_station_prices
+from custom_components.nsw_fuel.price_table import PriceTable, np
+
+LOCATIONS = [(-33.8688 + i * 0.01, 151.2093 - i * 0.01) for i in range(10)]
+FUELS = {"E10", "U91"}
+RADII = (2, 5, 10)
+
+
+def _rank(table: PriceTable) -> None:
+    keep = table.brand_mask([], ["Shell"])
+    for distances in table.distances_from(LOCATIONS):
+        for radius in RADII:
+            table.cheapest(keep, distances, radius)
+
+
+def main() -> None:
+    payload = statewide_payload()
+    records = list(_iter_station_prices(payload, fuels=FUELS))
+    print(f"rows={len(records)} locations={len(LOCATIONS)} radii={RADII}")
+    backends = [("lists", False)] + ([("numpy", True)] if np is not None else [])
+    for label, vectorised in backends:
+        build = timeit.timeit(lambda: PriceTable(records, vectorised), number=10) / 10
+        table = PriceTable(records, vectorised)
+        rank = timeit.timeit(lambda: _rank(table), number=10) / 10
+        print(f"{label:<6} build {build * 1e3:7.2f} ms  rank {rank * 1e3:8.2f} ms")
+    if np is None:
+        print("numpy not installed; skipping the vectorised backend")
+
+
+if __name__ == "__main__":
+    main()
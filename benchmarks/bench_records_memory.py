@@ -0,0 +1,70 @@
+"""Compare memory held by joined price dicts and by shared-station records.
+
+Run from the repository root: ``python benchmarks/bench_records_memory.py``.
+"""
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.fixtures import statewide_payload
+from custom_components.nsw_fuel.coordinator import _iter_station_prices
+
+
+def _joined_dicts(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # The previous join: one flat dict per price, station fields copied in.
+    stations = {str(s.get("code")): s for s in payload.get("stations", [])}
+    joined = []
+    for price in payload.get("prices", []):
+        station = stations.get(str(price.get("stationcode"))) or {}
+        location = station.get("location") or {}
+        joined.append(
+            {
+                "stationcode": str(price.get("stationcode")),
+                "fueltype": price.get("fueltype"),
+                "price": float(price["price"]),
+                "lastupdated": price.get("lastupdated"),
+                "brand": station.get("brand"),
+                "name": station.get("name"),
+                "address": station.get("address"),
+                "distance": location.get("distance"),
+                "latitude": location.get("latitude"),
+                "longitude": location.get("longitude"),
+            }
+        )
+    return joined
+
+
+def _records(payload: Dict[str, Any]) -> List[Any]:
+    return list(_iter_station_prices(payload))
+
+
+def _measure(label: str, build: Callable[[Dict[str, Any]], List[Any]], payload) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    built = build(payload)
+    elapsed = time.perf_counter() - started
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<8} {len(built):6d} records {elapsed * 1e3:7.1f} ms "
+        f"{held / 1024:8.0f} KiB held {peak / 1024:8.0f} KiB peak"
+    )
+
+
+def main() -> None:
+    payload = statewide_payload()
+    print(f"stations={len(payload['stations'])} prices={len(payload['prices'])}")
+    _measure("dicts", _joined_dicts, payload)
+    _measure("records", _records, payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Compare the materialised and streaming price joins on a statewide body.
+
+Run from the repository root: ``python benchmarks/bench_stream_parse.py``.
+"""
+from __future__ import annotations
+
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Iterable, List
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT, ROOT / "src"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from benchmarks.fixtures import statewide_payload
+from parser import filter_cheapest_fuels, join_station_prices, stream_station_prices
+
+CHUNK_SIZE = 64 * 1024
+FUELS = ["E10"]
+
+
+def _chunks(body: bytes) -> Iterable[bytes]:
+    return (body[i : i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE))
+
+
+def _materialised(body: bytes) -> List[dict]:
+    joined = join_station_prices(json.loads(b"".join(_chunks(body))))
+    return filter_cheapest_fuels(joined, FUELS, limit=10)
+
+
+def _streamed(body: bytes) -> List[dict]:
+    return filter_cheapest_fuels(stream_station_prices(_chunks(body), FUELS), FUELS, limit=10)
+
+
+def _measure(label: str, run: Callable[[bytes], List[dict]], body: bytes) -> List[dict]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = run(body)
+    elapsed = time.perf_counter() - started
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<14} {elapsed * 1e3:8.1f} ms {peak / 1024:10.0f} KiB peak")
+    return result
+
+
+def _first_record_ms(body: bytes) -> float:
+    started = time.perf_counter()
+    next(stream_station_prices(_chunks(body), FUELS))
+    return (time.perf_counter() - started) * 1e3
+
+
+def main() -> None:
+    body = json.dumps(statewide_payload()).encode("utf-8")
+    print(f"body={len(body) / 1024:.0f} KiB chunk={CHUNK_SIZE // 1024} KiB fuels={FUELS}")
+    expected = _measure("materialised", _materialised, body)
+    assert _measure("streamed", _streamed, body) == expected
+    print(f"first streamed record after {_first_record_ms(body):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Synthetic statewide-size payloads shared by the benchmarks."""
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, List
+
+STATEWIDE_STATIONS = 2500
+FUEL_TYPES = ("E10", "U91", "P95", "P98", "DL", "PDL", "LPG")
+BRANDS = ("Ampol", "BP", "Caltex", "Coles Express", "Metro Fuel", "Shell", "United", "7-Eleven")
+
+# Population-weighted centres so stations cluster like the real network.
+_CENTRES = (
+    (-33.8688, 151.2093, 0.35, 0.55),
+    (-32.9283, 151.7817, 0.15, 0.15),
+    (-34.4278, 150.8931, 0.15, 0.10),
+    (-32.5000, 147.5000, 2.50, 0.20),
+)
+
+
+def statewide_stations(count: int = STATEWIDE_STATIONS, seed: int = 7) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    weights = [centre[3] for centre in _CENTRES]
+    stations: List[Dict[str, Any]] = []
+    for idx in range(count):
+        lat, lon, spread, _weight = rng.choices(_CENTRES, weights=weights)[0]
+        stations.append(
+            {
+                "brandid": str(idx % len(BRANDS)),
+                "stationid": str(10000 + idx),
+                "brand": BRANDS[idx % len(BRANDS)],
+                "code": str(1000 + idx),
+                "name": f"Station {idx}",
+                "address": f"{idx} Example Road, Somewhere NSW 2000",
+                "location": {
+                    "latitude": round(rng.gauss(lat, spread), 6),
+                    "longitude": round(rng.gauss(lon, spread), 6),
+                },
+                "state": "NSW",
+            }
+        )
+    return stations
+
+
+def statewide_payload(count: int = STATEWIDE_STATIONS, seed: int = 7) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    stations = statewide_stations(count, seed)
+    prices: List[Dict[str, Any]] = []
+    for station in stations:
+        for fueltype in rng.sample(FUEL_TYPES, rng.randint(3, len(FUEL_TYPES))):
+            prices.append(
+                {
+                    "stationcode": station["code"],
+                    "state": "NSW",
+                    "fueltype": fueltype,
+                    "price": round(rng.uniform(165.0, 235.0), 1),
+                    "lastupdated": "01/01/2026 01:00:00",
+                }
+            )
+    return {"stations": stations, "prices": prices}
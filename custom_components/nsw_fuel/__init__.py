@@ -2,27 +2,49 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from datetime import datetime, timedelta
+from functools import partial
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.core import ServiceCall
+from homeassistant.core import ServiceCall, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers import entity_registry as er
 
 from .api import NswFuelApi
+from .catalogue import CATALOGUE_REFRESH_INTERVAL, async_get_catalogue
 from .const import (
+    API_CACHE_TTLS,
     CONF_API_KEY,
     CONF_API_SECRET,
+    CONF_DAILY_QUOTA,
+    CONF_FAVOURITE_UPDATE_MINUTES,
+    CONF_NEARBY_UPDATE_MINUTES,
     CONF_PERSON_ENTITIES,
+    CONF_REQUEST_TIMEOUT_SECONDS,
+    CONF_SNAPSHOT_TIMEOUT_SECONDS,
+    CONF_TRACK_PERSON_CHANGES,
+    DEFAULT_DAILY_QUOTA,
+    DEFAULT_FAVOURITE_UPDATE_MINUTES,
+    DEFAULT_NEARBY_UPDATE_MINUTES,
+    DEFAULT_REQUEST_TIMEOUT_SECONDS,
+    DEFAULT_SNAPSHOT_TIMEOUT_SECONDS,
+    DEFAULT_TRACK_PERSON_CHANGES,
     DOMAIN,
     SERVICE_REFRESH,
 )
 from .coordinator import ApiCallCounter, FavouriteStationCoordinator, NearbyCoordinator
+from .scheduler import RefreshScheduler
+from .store import NswFuelStore
 
 PLATFORMS = ["sensor"]
 _LOGGER = logging.getLogger(__name__)
 
+# Clients shared by config entries with the same API key, keyed by that key.
+DATA_CLIENTS = f"{DOMAIN}_clients"
+
 
 async def _async_handle_refresh(hass: HomeAssistant, call: ServiceCall) -> None:
     """Refresh all NSW fuel coordinators across all config entries."""
@@ -32,7 +54,11 @@ async def _async_handle_refresh(hass: HomeAssistant, call: ServiceCall) -> None:
     coros = []
     for entry_id, entry_data in entry_map.items():
         for coordinator_name, coordinator in entry_data.get("coordinators", {}).items():
-            coros.append(coordinator.async_request_refresh())
+            # Manual refreshes re-query every location, not only moved ones.
+            refresh = getattr(
+                coordinator, "async_request_full_refresh", coordinator.async_request_refresh
+            )
+            coros.append(refresh())
             contexts.append((entry_id, coordinator_name, coordinator.name))
     if not coros:
         _LOGGER.debug("Manual refresh requested with no active coordinators.")
@@ -67,26 +93,72 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     _migrate_entity_ids(hass, entry)
 
-    api_calls = ApiCallCounter(hass, entry)
-    hass.data[DOMAIN][entry.entry_id]["api_calls"] = api_calls
+    store = NswFuelStore(hass, entry.entry_id)
+    await store.async_load()
+
+    client = _acquire_client(hass, entry, store)
+    hass.data[DOMAIN][entry.entry_id]["unsub"] = [partial(_release_client, hass, entry)]
+    try:
+        await _async_setup_with_client(hass, entry, store, client)
+    except Exception:
+        # Drop this entry's hold on the shared client and anything registered so far.
+        for unsub in hass.data[DOMAIN].pop(entry.entry_id, {}).get("unsub", []):
+            unsub()
+        raise
+    return True
 
-    session = async_get_clientsession(hass)
-    api = NswFuelApi(
-        session=session,
-        base_url="https://api.onegov.nsw.gov.au",
-        api_key=entry.data[CONF_API_KEY],
-        api_secret=entry.data[CONF_API_SECRET],
-        on_api_call=api_calls.async_increment,
-    )
 
+async def _async_setup_with_client(
+    hass: HomeAssistant, entry: ConfigEntry, store: NswFuelStore, client: dict
+) -> None:
+    api_calls: ApiCallCounter = client["api_calls"]
+    api: NswFuelApi = client["api"]
+    hass.data[DOMAIN][entry.entry_id]["api_calls"] = api_calls
+
+    catalogue = await async_get_catalogue(hass)
     nearby_coordinator = NearbyCoordinator(hass, entry, api)
     favourite_coordinator = FavouriteStationCoordinator(hass, entry, api)
+    nearby_coordinator.catalogue = catalogue
+    favourite_coordinator.catalogue = catalogue
 
-    hass.data[DOMAIN][entry.entry_id]["coordinators"] = {
+    coordinators = {
         "nearby": nearby_coordinator,
         "favourite": favourite_coordinator,
     }
-    hass.data[DOMAIN][entry.entry_id]["unsub"] = []
+    hass.data[DOMAIN][entry.entry_id]["coordinators"] = coordinators
+
+    @callback
+    def _persist_api_calls() -> None:
+        store.async_set_api_calls(api_calls.data)
+
+    hass.data[DOMAIN][entry.entry_id]["unsub"].append(
+        api_calls.async_add_listener(_persist_api_calls)
+    )
+    intervals = _update_intervals(entry)
+    last_refreshed = _warm_start_coordinators(hass, entry, store, coordinators, intervals)
+
+    scheduler = RefreshScheduler(
+        hass,
+        coordinators,
+        intervals,
+        last_refreshed,
+        planner=api_calls,
+        cycle_prefix=f"{entry.entry_id}:",
+    )
+    hass.data[DOMAIN][entry.entry_id]["scheduler"] = scheduler
+    hass.data[DOMAIN][entry.entry_id]["unsub"].append(scheduler.async_start())
+
+    async def _refresh_catalogue(_now: datetime | None = None) -> None:
+        await catalogue.async_refresh_if_due(api)
+
+    hass.async_create_task(_refresh_catalogue())
+    hass.data[DOMAIN][entry.entry_id]["unsub"].append(
+        async_track_time_interval(hass, _refresh_catalogue, CATALOGUE_REFRESH_INTERVAL)
+    )
+    if entry.data.get(CONF_TRACK_PERSON_CHANGES, DEFAULT_TRACK_PERSON_CHANGES):
+        hass.data[DOMAIN][entry.entry_id]["unsub"].append(
+            nearby_coordinator.async_track_person_changes()
+        )
 
     if not hass.services.has_service(DOMAIN, SERVICE_REFRESH):
         async def _handle_refresh(call: ServiceCall) -> None:
@@ -99,7 +171,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -113,6 +184,161 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await NswFuelStore(hass, entry.entry_id).async_remove()
+
+
+def _acquire_client(hass: HomeAssistant, entry: ConfigEntry, store: NswFuelStore) -> dict:
+    """Return the API client and call counter shared by entries with this API key.
+
+    The first entry creates them: its stored token seeds the client and its
+    stored count seeds the counter. Later entries join the same client, so
+    they share the access token, coalesce identical in-flight requests and
+    count calls against one daily total. The client keeps the first entry's
+    secret, timeouts and daily quota; a warning names any a later entry
+    sets differently.
+    """
+    clients = hass.data.setdefault(DATA_CLIENTS, {})
+    api_key = entry.data[CONF_API_KEY]
+    client = clients.get(api_key)
+    if client is None:
+        api_calls = ApiCallCounter(hass, entry)
+        api_calls.async_restore(store.api_calls())
+        stores: dict[str, NswFuelStore] = {}
+
+        @callback
+        def _on_token(token: str, expiry: float | None) -> None:
+            for entry_store in stores.values():
+                entry_store.async_set_token(token, expiry)
+
+        stored_token, stored_token_expiry = store.token() or (None, None)
+        api = NswFuelApi(
+            session=async_get_clientsession(hass),
+            base_url="https://api.onegov.nsw.gov.au",
+            api_key=api_key,
+            api_secret=entry.data[CONF_API_SECRET],
+            on_api_call=api_calls.async_increment,
+            on_token=_on_token,
+            token=stored_token,
+            token_expiry=stored_token_expiry,
+            on_retry=api_calls.record_retry,
+            timeouts=_request_timeouts(entry),
+            cache_ttls=API_CACHE_TTLS,
+        )
+        client = {
+            "api": api,
+            "api_calls": api_calls,
+            "stores": stores,
+            "settings": _client_settings(entry),
+        }
+        clients[api_key] = client
+    else:
+        _LOGGER.debug("Sharing API client for entry %s", entry.entry_id)
+        settings = _client_settings(entry)
+        differing = sorted(k for k, v in settings.items() if client["settings"][k] != v)
+        if differing:
+            _LOGGER.warning(
+                "Entry %s shares an API client with an entry using the same API key, "
+                "but sets %s differently; the settings of the first entry set up apply",
+                entry.entry_id,
+                ", ".join(differing),
+            )
+    client["stores"][entry.entry_id] = store
+    return client
+
+
+@callback
+def _release_client(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    clients = hass.data.get(DATA_CLIENTS, {})
+    api_key = entry.data[CONF_API_KEY]
+    client = clients.get(api_key)
+    if client is None:
+        return
+    client["stores"].pop(entry.entry_id, None)
+    if not client["stores"]:
+        client["api"].close()
+        clients.pop(api_key, None)
+
+
+def _client_settings(entry: ConfigEntry) -> dict[str, object]:
+    """Settings taken from the entry that creates a shared client."""
+    return {
+        "api_secret": entry.data[CONF_API_SECRET],
+        "daily_quota": str(entry.data.get(CONF_DAILY_QUOTA, DEFAULT_DAILY_QUOTA)),
+        "timeouts": _request_timeouts(entry),
+    }
+
+
+def _update_intervals(entry: ConfigEntry) -> dict[str, timedelta]:
+    """Return refresh intervals per coordinator; zero means manual only."""
+    configured = {
+        "nearby": entry.data.get(CONF_NEARBY_UPDATE_MINUTES, DEFAULT_NEARBY_UPDATE_MINUTES),
+        "favourite": entry.data.get(
+            CONF_FAVOURITE_UPDATE_MINUTES, DEFAULT_FAVOURITE_UPDATE_MINUTES
+        ),
+    }
+    intervals: dict[str, timedelta] = {}
+    for name, minutes in configured.items():
+        try:
+            intervals[name] = timedelta(minutes=max(0, int(float(minutes))))
+        except (TypeError, ValueError):
+            _LOGGER.warning("Invalid %s update minutes %r; refreshing manually", name, minutes)
+            intervals[name] = timedelta(0)
+    return intervals
+
+
+def _request_timeouts(entry: ConfigEntry) -> dict[str, float]:
+    """Return per-endpoint request timeouts in seconds."""
+    request = entry.data.get(CONF_REQUEST_TIMEOUT_SECONDS, DEFAULT_REQUEST_TIMEOUT_SECONDS)
+    snapshot = entry.data.get(CONF_SNAPSHOT_TIMEOUT_SECONDS, DEFAULT_SNAPSHOT_TIMEOUT_SECONDS)
+    try:
+        request_seconds = max(1.0, float(request))
+    except (TypeError, ValueError):
+        request_seconds = float(DEFAULT_REQUEST_TIMEOUT_SECONDS)
+    try:
+        snapshot_seconds = max(1.0, float(snapshot))
+    except (TypeError, ValueError):
+        snapshot_seconds = float(DEFAULT_SNAPSHOT_TIMEOUT_SECONDS)
+    return {
+        "token": request_seconds,
+        "nearby": request_seconds,
+        "station": request_seconds,
+        "all_prices": snapshot_seconds,
+    }
+
+
+def _warm_start_coordinators(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    store: NswFuelStore,
+    coordinators: dict,
+    intervals: dict[str, timedelta],
+) -> dict[str, datetime]:
+    """Seed coordinators from stored results and persist future updates.
+
+    Returns when each warm-started coordinator's results were saved.
+    """
+    last_refreshed: dict[str, datetime] = {}
+    unsub = hass.data[DOMAIN][entry.entry_id]["unsub"]
+    for name, coordinator in coordinators.items():
+        # Manually refreshed coordinators reuse stored results of any age.
+        max_age = intervals.get(name) or timedelta.max
+        stored = store.coordinator_data(name, max_age)
+        saved_at = store.coordinator_saved_at(name)
+        if stored and saved_at:
+            _LOGGER.debug("Warm-starting %s coordinator from stored results", name)
+            coordinator.async_set_updated_data(stored)
+            last_refreshed[name] = saved_at
+
+        @callback
+        def _persist(name: str = name, coordinator=coordinator) -> None:
+            if coordinator.last_update_success:
+                store.async_set_coordinator_data(name, coordinator.data)
+
+        unsub.append(coordinator.async_add_listener(_persist))
+    return last_refreshed
+
+
 def _migrate_entity_ids(hass: HomeAssistant, entry: ConfigEntry) -> None:
     registry = er.async_get(hass)
     entries = er.async_entries_for_config_entry(registry, entry.entry_id)
@@ -1,14 +1,101 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import json
+import logging
+import random
 import time
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Awaitable, Callable, Dict, Optional
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
 
-from aiohttp import ClientSession
-from aiohttp.client_exceptions import ContentTypeError
+from aiohttp import ClientError, ClientResponse, ClientSession, ClientTimeout
+
+# orjson ships with Home Assistant; the stdlib decoder also reads bytes.
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+from .breaker import STATE_CLOSED, STATE_OPEN, CircuitBreaker
+from .cache import ResponseCache
+
+_LOGGER = logging.getLogger(__name__)
+
+# Renew this long before the token expires so requests keep using a valid
+# token; short-lived tokens renew at half their lifetime instead.
+TOKEN_RENEW_BEFORE_SECONDS = 300
+
+# Transient failures (5xx, 429, network errors) are retried this many times
+# with exponential backoff and full jitter.
+MAX_RETRIES = 3
+RETRY_BACKOFF_BASE_SECONDS = 1.0
+RETRY_BACKOFF_MAX_SECONDS = 30.0
+# A 429 asking to wait longer than this fails the request instead of stalling the cycle.
+MAX_RETRY_AFTER_SECONDS = 120.0
+
+# Seconds each kind of request may take, including reading the body.
+DEFAULT_REQUEST_TIMEOUTS: Dict[str, float] = {
+    "token": 20.0,
+    "nearby": 20.0,
+    "station": 20.0,
+    "all_prices": 60.0,
+    "reference": 60.0,
+}
+
+# Responses cached per endpoint for stale-while-revalidate, as
+# (fresh seconds, stale seconds) in NswFuelApi's ``cache_ttls``.
+CacheTtls = Dict[str, Tuple[float, float]]
+
+# Responses kept to answer callers while the circuit is open. The
+# statewide payload is left out: it is by far the largest response, the
+# all-prices cache entry already holds it, and coordinators keep their
+# last result when an update fails.
+LAST_GOOD_MAX_AGE_SECONDS = 24 * 3600
+LAST_GOOD_MAX_ENTRIES = 16
+LAST_GOOD_EXCLUDED_KEYS = frozenset({"all_prices"})
+
+RETRY_SERVER_ERROR = "server_error"
+RETRY_NETWORK = "network"
+RETRY_RATE_LIMITED = "rate_limited"
+RETRY_UNAUTHORIZED = "unauthorized"
+
+
+class NswFuelApiError(RuntimeError):
+    """A request the API answered with an error status."""
+
+    def __init__(self, status: int, text: str) -> None:
+        super().__init__(f"{status} {text}")
+        self.status = status
+
+
+class NswFuelCircuitOpenError(RuntimeError):
+    """Calls are being short-circuited after repeated upstream failures."""
+
+
+def _backoff_delay(attempt: int) -> float:
+    ceiling = min(RETRY_BACKOFF_MAX_SECONDS, RETRY_BACKOFF_BASE_SECONDS * 2**attempt)
+    return random.uniform(0, ceiling)
+
+
+def _retry_after_seconds(resp: ClientResponse) -> Optional[float]:
+    """Seconds the server asked us to wait, from a delay or an HTTP date."""
+    value = resp.headers.get("Retry-After") if resp.headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
 
 
 class NswFuelApi:
@@ -19,19 +106,53 @@ class NswFuelApi:
         api_key: str,
         api_secret: str,
         on_api_call: Optional[Callable[[int], Awaitable[None]]] = None,
+        on_token: Optional[Callable[[str, Optional[float]], None]] = None,
+        token: Optional[str] = None,
+        token_expiry: Optional[float] = None,
+        on_retry: Optional[Callable[[str], None]] = None,
+        timeouts: Optional[Dict[str, float]] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        cache_ttls: Optional[CacheTtls] = None,
+        last_good_entries: int = LAST_GOOD_MAX_ENTRIES,
     ) -> None:
         self._session = session
         self._base_url = base_url.rstrip("/")
         self._api_key = api_key
         self._api_secret = api_secret
-        self._token: Optional[str] = None
-        self._token_expiry: Optional[float] = None
+        self._token: Optional[str] = token
+        self._token_expiry: Optional[float] = token_expiry if token else None
+        # Unknown for a restored token until it is next renewed.
+        self._token_lifetime: Optional[float] = None
         self._on_api_call = on_api_call
+        self._on_token = on_token
+        self._on_retry = on_retry
+        self._token_task: Optional[asyncio.Task[str]] = None
+        self._token_used = False
+        self._renew_handle: Optional[asyncio.TimerHandle] = None
+        self._inflight: Dict[Hashable, asyncio.Task[Dict[str, Any]]] = {}
+        self._timeouts = {**DEFAULT_REQUEST_TIMEOUTS, **(timeouts or {})}
+        self.breaker = breaker or CircuitBreaker()
+        self._last_good: ResponseCache[Hashable, Dict[str, Any]] = ResponseCache(
+            LAST_GOOD_MAX_AGE_SECONDS, max_entries=last_good_entries
+        )
+        self._fresh_seconds: Dict[str, float] = {}
+        self._caches: Dict[str, ResponseCache[Hashable, Dict[str, Any]]] = {}
+        for endpoint, (fresh, stale) in (cache_ttls or {}).items():
+            self._fresh_seconds[endpoint] = fresh
+            self._caches[endpoint] = ResponseCache(max(fresh, stale))
+        self._revalidations: Set[asyncio.Task[None]] = set()
 
     async def _count_call(self) -> None:
         if self._on_api_call:
             await self._on_api_call(1)
 
+    def _timeout(self, endpoint: str) -> ClientTimeout:
+        return ClientTimeout(total=self._timeouts[endpoint])
+
+    def _record_retry(self, reason: str) -> None:
+        if self._on_retry:
+            self._on_retry(reason)
+
     def _basic_auth_header(self) -> str:
         raw = f"{self._api_key}:{self._api_secret}".encode("utf-8")
         encoded = base64.b64encode(raw).decode("ascii")
@@ -42,28 +163,204 @@ class NswFuelApi:
         headers = {"Authorization": self._basic_auth_header(), "Accept": "application/json"}
         params = {"grant_type": "client_credentials"}
         await self._count_call()
-        async with self._session.get(url, headers=headers, params=params) as resp:
+        async with self._session.get(
+            url, headers=headers, params=params, timeout=self._timeout("token")
+        ) as resp:
             resp.raise_for_status()
-            try:
-                payload = await resp.json(content_type=None)
-            except ContentTypeError:
-                payload = json.loads(await resp.text())
+            payload = json_loads(await resp.read())
         token = payload.get("access_token")
         expires_in = payload.get("expires_in")
         if not token:
             raise ValueError("Access token missing from response.")
         if expires_in:
-            self._token_expiry = time.time() + int(expires_in) - 30
+            self._token_lifetime = max(0.0, int(expires_in) - 30.0)
+            self._token_expiry = time.time() + self._token_lifetime
         else:
+            self._token_lifetime = None
             self._token_expiry = None
         return token
 
+    def _renew_margin(self) -> float:
+        """Seconds before expiry to renew, at most half the token's lifetime."""
+        if self._token_lifetime is None:
+            return TOKEN_RENEW_BEFORE_SECONDS
+        return min(TOKEN_RENEW_BEFORE_SECONDS, self._token_lifetime / 2)
+
     async def _get_access_token(self) -> str:
         if self._token and self._token_expiry:
-            if time.time() < self._token_expiry:
+            now = time.time()
+            if now < self._token_expiry:
+                self._token_used = True
+                if now >= self._token_expiry - self._renew_margin():
+                    self._renew_token_in_background()
                 return self._token
-        self._token = await self._fetch_access_token()
-        return self._token
+        token = await asyncio.shield(self._refresh_token())
+        self._token_used = True
+        return token
+
+    def _refresh_token(self) -> asyncio.Task[str]:
+        """Return the in-flight token fetch, starting one if none is running.
+
+        Concurrent callers share the same task so a burst of requests after
+        expiry costs a single token call.
+        """
+        if self._token_task is None or self._token_task.done():
+            self._token_task = asyncio.get_running_loop().create_task(
+                self._async_refresh_token()
+            )
+        return self._token_task
+
+    async def _async_refresh_token(self) -> str:
+        token = await self._fetch_access_token()
+        self._token = token
+        self._token_used = False
+        self._schedule_token_renewal()
+        if self._on_token:
+            self._on_token(token, self._token_expiry)
+        return token
+
+    def _schedule_token_renewal(self) -> None:
+        self._cancel_token_renewal()
+        if not self._token_expiry:
+            return
+        delay = max(0.0, self._token_expiry - self._renew_margin() - time.time())
+        self._renew_handle = asyncio.get_running_loop().call_later(
+            delay, self._on_token_renewal_due
+        )
+
+    def _cancel_token_renewal(self) -> None:
+        if self._renew_handle is not None:
+            self._renew_handle.cancel()
+            self._renew_handle = None
+
+    def _on_token_renewal_due(self) -> None:
+        self._renew_handle = None
+        # Only keep the token warm while it is being used; an idle
+        # integration should not spend quota on tokens nobody needs.
+        if self._token_used:
+            self._renew_token_in_background()
+
+    def _renew_token_in_background(self) -> None:
+        if self._token_task is not None and not self._token_task.done():
+            return
+        task = self._refresh_token()
+        task.add_done_callback(self._log_renewal_failure)
+
+    @staticmethod
+    def _log_renewal_failure(task: asyncio.Task[str]) -> None:
+        if task.cancelled():
+            return
+        err = task.exception()
+        if err is not None:
+            _LOGGER.warning("Background access token renewal failed: %s", err)
+
+    def _invalidate_token(self, token: str) -> None:
+        """Forget a token the API rejected, unless it has already been replaced."""
+        if self._token != token:
+            return
+        self._token = None
+        self._token_expiry = None
+        self._cancel_token_renewal()
+
+    def close(self) -> None:
+        """Cancel pending token renewal work and in-flight requests."""
+        self._cancel_token_renewal()
+        if self._token_task is not None and not self._token_task.done():
+            self._token_task.cancel()
+        for task in [*self._inflight.values(), *self._revalidations]:
+            task.cancel()
+        self._inflight.clear()
+        self._revalidations.clear()
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {endpoint: cache.stats() for endpoint, cache in self._caches.items()}
+
+    def is_fresh(self, endpoint: str, key: Hashable) -> bool:
+        """Whether the endpoint's cache holds a fresh answer for ``key``."""
+        cache = self._caches.get(endpoint)
+        age = cache.age(key) if cache is not None else None
+        return age is not None and age < self._fresh_seconds[endpoint]
+
+    async def _cached(
+        self,
+        endpoint: str,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]],
+        force: bool = False,
+    ) -> Dict[str, Any]:
+        """Answer from the endpoint's cache, revalidating stale entries in the background.
+
+        Fresh entries are returned as they are. Stale entries are returned
+        too, and one background request replaces them. Only a miss waits
+        for the network. ``force`` skips the cache and stores the new answer.
+        """
+        cache = self._caches.get(endpoint)
+        if cache is None:
+            return await self._coalesced(key, fetch)
+        hit = None if force else cache.get_with_age(key)
+        if hit is not None:
+            value, age = hit
+            if age >= self._fresh_seconds[endpoint]:
+                self._revalidate(cache, key, fetch)
+            return value
+        result = await self._coalesced(key, fetch)
+        cache.set(key, result)
+        return result
+
+    def _revalidate(
+        self,
+        cache: ResponseCache[Hashable, Dict[str, Any]],
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> None:
+        if key in self._inflight:
+            return
+
+        async def _refresh() -> None:
+            try:
+                cache.set(key, await self._coalesced(key, fetch))
+            except Exception as err:
+                _LOGGER.debug("Background revalidation of %s failed: %s", key, err)
+
+        task = asyncio.get_running_loop().create_task(_refresh())
+        self._revalidations.add(task)
+        task.add_done_callback(self._revalidations.discard)
+
+    async def _coalesced(
+        self, key: Hashable, fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Share one in-flight request between callers asking for the same thing.
+
+        Config entries using the same credentials share this client, so
+        identical queries they issue at the same time cost a single call.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._fetch_or_last_good(key, fetch))
+            self._inflight[key] = task
+
+            def _forget(done: asyncio.Task[Dict[str, Any]]) -> None:
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+
+            task.add_done_callback(_forget)
+        return await asyncio.shield(task)
+
+    async def _fetch_or_last_good(
+        self, key: Hashable, fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Fetch and remember the response; answer from memory while the circuit is open."""
+        try:
+            result = await fetch()
+        except NswFuelCircuitOpenError:
+            last_good = self._last_good.get(key)
+            if last_good is None:
+                raise
+            _LOGGER.debug("Circuit open; serving last known response for %s", key)
+            return last_good
+        if result is not None and key not in LAST_GOOD_EXCLUDED_KEYS:
+            self._last_good.set(key, result)
+        return result
 
     @staticmethod
     def _utc_timestamp() -> str:
@@ -80,6 +377,129 @@ class NswFuelApi:
             "requesttimestamp": self._utc_timestamp(),
         }
 
+    async def _request(
+        self,
+        endpoint: str,
+        send: Callable[..., Any],
+        url: str,
+        empty: Dict[str, Any],
+        **kwargs: Any,
+    ) -> Optional[Dict[str, Any]]:
+        """Send one API request through the circuit breaker.
+
+        Upstream failures (5xx, 429, network errors and timeouts that
+        outlast the retries) count towards opening the circuit. While it is
+        open, requests fail at once without spending quota.
+        """
+        if not self.breaker.allow():
+            raise NswFuelCircuitOpenError(
+                f"FuelCheck API unavailable; retrying in {self.breaker.retry_in():.0f}s"
+            )
+        try:
+            result = await self._request_with_retries(
+                send, url, empty, timeout=self._timeout(endpoint), **kwargs
+            )
+        except NswFuelApiError as err:
+            if err.status >= 500 or err.status == 429:
+                self._record_failure()
+            else:
+                self.breaker.record_success()
+            raise
+        except (ClientError, asyncio.TimeoutError):
+            self._record_failure()
+            raise
+        finally:
+            self.breaker.release()
+        self.breaker.record_success()
+        return result
+
+    def _record_failure(self) -> None:
+        was_open = self.breaker.state != STATE_CLOSED
+        self.breaker.record_failure()
+        if self.breaker.state == STATE_OPEN and not was_open:
+            _LOGGER.warning(
+                "FuelCheck API keeps failing; pausing requests for %.0fs",
+                self.breaker.cool_down_seconds,
+            )
+
+    async def _request_with_retries(
+        self,
+        send: Callable[..., Any],
+        url: str,
+        empty: Dict[str, Any],
+        extra_headers: Optional[Dict[str, str]] = None,
+        **kwargs: Any,
+    ) -> Optional[Dict[str, Any]]:
+        """Send one API request, retrying transient failures.
+
+        5xx responses and network errors back off exponentially with jitter,
+        a 429 waits for its ``Retry-After`` and a 401 fetches a new token
+        once. Every attempt counts as an API call. A 304 returns ``None``
+        without reading the body.
+        """
+        attempt = 0
+        reauthenticated = False
+        while True:
+            headers = {**await self._headers(), **(extra_headers or {})}
+            await self._count_call()
+            try:
+                async with send(url, headers=headers, **kwargs) as resp:
+                    status = resp.status
+                    body = b"" if status == 304 else await resp.read()
+                    retry_after = _retry_after_seconds(resp) if status == 429 else None
+            except (ClientError, asyncio.TimeoutError) as err:
+                if attempt >= MAX_RETRIES:
+                    raise
+                delay = _backoff_delay(attempt)
+                _LOGGER.debug("Request to %s failed (%s); retrying in %.1fs", url, err, delay)
+                self._record_retry(RETRY_NETWORK)
+            else:
+                if status == 304:
+                    return None
+                if status < 400:
+                    # Decode straight from bytes; the payload is never built as a str.
+                    return json_loads(body) if body else empty
+                if status == 401 and not reauthenticated:
+                    _LOGGER.debug("Access token rejected; fetching a new one")
+                    self._invalidate_token(headers["Authorization"].removeprefix("Bearer "))
+                    reauthenticated = True
+                    self._record_retry(RETRY_UNAUTHORIZED)
+                    continue
+                if status == 429:
+                    delay = retry_after if retry_after is not None else _backoff_delay(attempt)
+                    if attempt >= MAX_RETRIES or delay > MAX_RETRY_AFTER_SECONDS:
+                        raise NswFuelApiError(status, body.decode("utf-8", "replace"))
+                    self._record_retry(RETRY_RATE_LIMITED)
+                elif status >= 500 and attempt < MAX_RETRIES:
+                    delay = _backoff_delay(attempt)
+                    self._record_retry(RETRY_SERVER_ERROR)
+                else:
+                    raise NswFuelApiError(status, body.decode("utf-8", "replace"))
+                _LOGGER.debug("Request to %s returned %s; retrying in %.1fs", url, status, delay)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def get_reference_data(
+        self, if_modified_since: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Return stations, brands and fuel types, or ``None`` if unchanged.
+
+        ``if_modified_since`` uses the API's request timestamp format.
+        """
+        return await self._coalesced(
+            ("reference", if_modified_since),
+            lambda: self._fetch_reference_data(if_modified_since),
+        )
+
+    async def _fetch_reference_data(
+        self, if_modified_since: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        url = f"{self._base_url}/FuelCheckRefData/v1/fuel/lovs"
+        extra_headers = {"if-modified-since": if_modified_since} if if_modified_since else None
+        return await self._request(
+            "reference", self._session.get, url, {}, extra_headers=extra_headers
+        )
+
     async def get_prices_nearby(
         self,
         *,
@@ -91,6 +511,7 @@ class NswFuelApi:
         radius_km: str,
         sortby: str = "price",
         sortascending: str = "true",
+        force: bool = False,
     ) -> Dict[str, Any]:
         url = f"{self._base_url}/FuelPriceCheck/v1/fuel/prices/nearby"
         payload = {
@@ -103,24 +524,35 @@ class NswFuelApi:
             "sortby": sortby,
             "sortascending": sortascending,
         }
-        headers = await self._headers()
-        await self._count_call()
-        async with self._session.post(url, headers=headers, json=payload) as resp:
-            text = await resp.text()
-            if resp.status >= 400:
-                raise RuntimeError(f"{resp.status} {text}")
-            if not text:
-                return {"stations": [], "prices": []}
-            return json.loads(text)
-
-    async def get_station_prices(self, station_code: str) -> Dict[str, Any]:
+        return await self._cached(
+            "nearby",
+            ("nearby", json.dumps(payload, sort_keys=True)),
+            lambda: self._fetch_prices_nearby(url, payload),
+            force,
+        )
+
+    async def _fetch_prices_nearby(self, url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._request(
+            "nearby", self._session.post, url, {"stations": [], "prices": []}, json=payload
+        )
+
+    async def get_all_prices(self, force: bool = False) -> Dict[str, Any]:
+        return await self._cached("all_prices", "all_prices", self._fetch_all_prices, force)
+
+    async def _fetch_all_prices(self) -> Dict[str, Any]:
+        url = f"{self._base_url}/FuelPriceCheck/v1/fuel/prices"
+        return await self._request(
+            "all_prices", self._session.get, url, {"stations": [], "prices": []}
+        )
+
+    async def get_station_prices(self, station_code: str, force: bool = False) -> Dict[str, Any]:
+        return await self._cached(
+            "station",
+            ("station", str(station_code)),
+            lambda: self._fetch_station_prices(station_code),
+            force,
+        )
+
+    async def _fetch_station_prices(self, station_code: str) -> Dict[str, Any]:
         url = f"{self._base_url}/FuelPriceCheck/v1/fuel/prices/station/{station_code}"
-        headers = await self._headers()
-        await self._count_call()
-        async with self._session.get(url, headers=headers) as resp:
-            text = await resp.text()
-            if resp.status >= 400:
-                raise RuntimeError(f"{resp.status} {text}")
-            if not text:
-                return {"prices": []}
-            return json.loads(text)
+        return await self._request("station", self._session.get, url, {"prices": []})
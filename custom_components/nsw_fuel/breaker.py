@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, Optional
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_COOL_DOWN_SECONDS = 900.0
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop calling an upstream that keeps failing until it has had time to recover.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    ``allow`` refuses calls for ``cool_down_seconds``. The first call after
+    that is a trial: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cool_down_seconds: float = DEFAULT_COOL_DOWN_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.cool_down_seconds = cool_down_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return STATE_CLOSED
+        if self._clock() - self._opened_at < self.cool_down_seconds:
+            return STATE_OPEN
+        return STATE_HALF_OPEN
+
+    def retry_in(self) -> float:
+        """Seconds until the circuit lets a trial call through."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self.cool_down_seconds - self._clock())
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == STATE_CLOSED:
+            return True
+        if state == STATE_OPEN or self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._trial_in_flight = False
+        self._failures += 1
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+
+    def release(self) -> None:
+        """Give up a trial call that ended without an outcome (e.g. cancelled)."""
+        self._trial_in_flight = False
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from math import cos, radians, sqrt
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+KM_PER_DEG_LAT = 111.32
+DEFAULT_MAX_ENTRIES = 256
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+def snap_coordinates(lat: float, lon: float, grid_km: float) -> Tuple[str, str]:
+    """Snap a point to the centre of its ``grid_km`` cell.
+
+    Points in the same cell produce the same strings, so queries from
+    people parked near each other (or someone who has not moved) share a
+    cache key. A non-positive grid keeps the coordinates as they are.
+    """
+    if grid_km <= 0:
+        return f"{lat:.6f}", f"{lon:.6f}"
+    lat_step = grid_km / KM_PER_DEG_LAT
+    snapped_lat = round(lat / lat_step) * lat_step
+    lon_step = lat_step / max(cos(radians(snapped_lat)), 0.01)
+    snapped_lon = round(lon / lon_step) * lon_step
+    return f"{snapped_lat:.6f}", f"{snapped_lon:.6f}"
+
+
+def snap_offset_km(grid_km: float) -> float:
+    """Furthest a point can lie from the centre of its snapped cell."""
+    return max(grid_km, 0.0) * sqrt(2) / 2
+
+
+class ResponseCache(Generic[K, V]):
+    """Bounded LRU cache whose entries expire after ``ttl_seconds``."""
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._clock = clock
+        self._entries: OrderedDict[K, Tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> Optional[V]:
+        hit = self.get_with_age(key)
+        return hit[0] if hit is not None else None
+
+    def get_with_age(self, key: K) -> Optional[Tuple[V, float]]:
+        """Return the cached value and its age in seconds, if not expired."""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        stored_at, value = entry
+        age = self._clock() - stored_at
+        if age >= self.ttl_seconds:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value, age
+
+    def age(self, key: K) -> Optional[float]:
+        """Seconds since ``key`` was stored, without counting a lookup."""
+        entry = self._entries.get(key) if self.enabled else None
+        if entry is None:
+            return None
+        age = self._clock() - entry[0]
+        return age if age < self.ttl_seconds else None
+
+    def set(self, key: K, value: V) -> None:
+        if not self.enabled:
+            return
+        self._entries[key] = (self._clock(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "entries": len(self._entries),
+            "evictions": self.evictions,
+        }
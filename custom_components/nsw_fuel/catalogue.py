@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import NswFuelApi
+from .const import DOMAIN
+from .store import STORAGE_SAVE_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.catalogue"
+
+# Catalogue shared by every config entry, kept in hass.data under this key.
+DATA_CATALOGUE = f"{DOMAIN}_catalogue"
+
+# Format the API uses for request timestamps and if-modified-since.
+REQUEST_TIMESTAMP_FORMAT = "%d/%m/%Y %I:%M:%S %p"
+
+# Stations, brands and fuel types change rarely; check for changes this often.
+CATALOGUE_REFRESH_INTERVAL = timedelta(hours=24)
+
+
+def _items(section: Any) -> List[Dict[str, Any]]:
+    """Return the ``items`` of a lovs section, which may also be a bare list."""
+    if isinstance(section, dict):
+        section = section.get("items")
+    return [item for item in section or [] if isinstance(item, dict)]
+
+
+class StationCatalogue:
+    """Stations, brands and fuel types from the FuelCheck reference data.
+
+    Refreshes send ``if-modified-since`` with the time of the last change
+    seen, so an unchanged catalogue costs one call and no parsing. The
+    catalogue is saved to storage and shared by all config entries.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[Dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self.stations: Dict[str, Dict[str, Any]] = {}
+        self.brands: List[str] = []
+        self.fuel_types: Dict[str, str] = {}
+        self.modified_since: Optional[str] = None
+        self.checked_at: Optional[datetime] = None
+        self._refresh_lock = asyncio.Lock()
+
+    async def async_load(self) -> None:
+        data = await self._store.async_load()
+        if not isinstance(data, dict):
+            return
+        self.stations = dict(data.get("stations") or {})
+        self.brands = list(data.get("brands") or [])
+        self.fuel_types = dict(data.get("fuel_types") or {})
+        self.modified_since = data.get("modified_since")
+        self.checked_at = dt_util.parse_datetime(str(data.get("checked_at") or ""))
+
+    @callback
+    def _async_save(self) -> None:
+        self._store.async_delay_save(self._as_dict, STORAGE_SAVE_DELAY)
+
+    def _as_dict(self) -> Dict[str, Any]:
+        return {
+            "stations": self.stations,
+            "brands": self.brands,
+            "fuel_types": self.fuel_types,
+            "modified_since": self.modified_since,
+            "checked_at": self.checked_at.isoformat() if self.checked_at else None,
+        }
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self.stations)
+
+    def due(self, now: Optional[datetime] = None) -> bool:
+        if self.checked_at is None or not self.loaded:
+            return True
+        return (now or dt_util.utcnow()) - self.checked_at >= CATALOGUE_REFRESH_INTERVAL
+
+    def station(self, code: Any) -> Optional[Dict[str, Any]]:
+        return self.stations.get(str(code))
+
+    async def async_refresh(self, api: NswFuelApi) -> bool:
+        """Fetch the catalogue if it changed; returns whether anything was updated."""
+        requested_at = dt_util.utcnow().strftime(REQUEST_TIMESTAMP_FORMAT)
+        payload = await api.get_reference_data(
+            self.modified_since if self.loaded else None
+        )
+        self.checked_at = dt_util.utcnow()
+        if payload is None:
+            _LOGGER.debug("Station catalogue unchanged since %s", self.modified_since)
+            self._async_save()
+            return False
+        self._apply(payload)
+        self.modified_since = requested_at
+        self._async_save()
+        _LOGGER.debug("Station catalogue updated: %d stations", len(self.stations))
+        return True
+
+    async def async_refresh_if_due(self, api: NswFuelApi) -> None:
+        # Entries set up together wait for one refresh instead of each sending one.
+        async with self._refresh_lock:
+            if not self.due():
+                return
+            try:
+                await self.async_refresh(api)
+            except Exception as err:
+                _LOGGER.warning("Station catalogue refresh failed: %s", err)
+
+    def _apply(self, payload: Dict[str, Any]) -> None:
+        stations: Dict[str, Dict[str, Any]] = {}
+        for item in _items(payload.get("stations")):
+            code = item.get("code")
+            if code is None:
+                continue
+            stations[str(code)] = {
+                "code": str(code),
+                "name": item.get("name"),
+                "brand": item.get("brand"),
+                "address": item.get("address"),
+                "location": item.get("location") or {},
+            }
+        self.stations = stations
+        self.brands = sorted(
+            {str(item["name"]) for item in _items(payload.get("brands")) if item.get("name")}
+        )
+        self.fuel_types = {
+            str(item["code"]): str(item.get("name") or item["code"])
+            for item in _items(payload.get("fueltypes"))
+            if item.get("code")
+        }
+
+
+async def async_get_catalogue(hass: HomeAssistant) -> StationCatalogue:
+    """Return the shared catalogue, loading it from storage on first use."""
+    catalogue: Optional[StationCatalogue] = hass.data.get(DATA_CATALOGUE)
+    if catalogue is None:
+        catalogue = StationCatalogue(hass)
+        await catalogue.async_load()
+        hass.data[DATA_CATALOGUE] = catalogue
+    return catalogue
@@ -8,6 +8,7 @@ from homeassistant import config_entries
 from homeassistant.const import CONF_NAME
 from homeassistant.helpers import selector
 
+from .catalogue import StationCatalogue, async_get_catalogue
 from .const import (
     CONF_API_KEY,
     CONF_API_SECRET,
@@ -19,10 +20,46 @@ from .const import (
     CONF_PREFERRED_FUELS,
     CONF_PERSON_ENTITIES,
     CONF_FAVOURITE_STATION_CODE,
+    CONF_FETCH_MODE,
+    CONF_NEARBY_MAX_CONCURRENCY,
+    CONF_NEARBY_UPDATE_MINUTES,
+    CONF_FAVOURITE_UPDATE_MINUTES,
+    CONF_DAILY_QUOTA,
+    CONF_MOVE_THRESHOLD_KM,
+    CONF_NEARBY_RESULT_TTL_MINUTES,
+    CONF_TRACK_PERSON_CHANGES,
+    CONF_PERSON_DEBOUNCE_SECONDS,
+    CONF_NEARBY_CACHE_GRID_KM,
+    CONF_NEARBY_CACHE_TTL_MINUTES,
+    CONF_MERGE_NEARBY_QUERIES,
+    CONF_EXCLUDED_BRANDS,
+    CONF_LOCAL_BRAND_FILTER,
+    CONF_FETCH_RADIUS_KM,
+    CONF_REQUEST_TIMEOUT_SECONDS,
+    CONF_SNAPSHOT_TIMEOUT_SECONDS,
     DEFAULT_RADIUS_KM,
     DEFAULT_BRANDS,
     DEFAULT_PREFERRED_FUELS,
+    DEFAULT_FETCH_MODE,
+    DEFAULT_NEARBY_MAX_CONCURRENCY,
+    DEFAULT_NEARBY_UPDATE_MINUTES,
+    DEFAULT_FAVOURITE_UPDATE_MINUTES,
+    DEFAULT_DAILY_QUOTA,
+    DEFAULT_MOVE_THRESHOLD_KM,
+    DEFAULT_TRACK_PERSON_CHANGES,
+    DEFAULT_PERSON_DEBOUNCE_SECONDS,
+    DEFAULT_NEARBY_CACHE_GRID_KM,
+    DEFAULT_NEARBY_CACHE_TTL_MINUTES,
+    DEFAULT_MERGE_NEARBY_QUERIES,
+    DEFAULT_EXCLUDED_BRANDS,
+    DEFAULT_LOCAL_BRAND_FILTER,
+    DEFAULT_FETCH_RADIUS_KM,
+    DEFAULT_FUEL_TYPES,
+    DEFAULT_REQUEST_TIMEOUT_SECONDS,
+    DEFAULT_SNAPSHOT_TIMEOUT_SECONDS,
     DOMAIN,
+    FETCH_MODE_NEARBY,
+    FETCH_MODE_SNAPSHOT,
 )
 
 
@@ -40,20 +77,86 @@ def _comma_list(value: Any) -> list[str]:
 
 def _normalise_form_data(user_input: dict[str, Any]) -> dict[str, Any]:
     data = dict(user_input)
-    preferred = data.get(CONF_PREFERRED_FUELS)
-    if isinstance(preferred, list):
-        data[CONF_PREFERRED_FUELS] = "|".join(preferred)
-    person_entities = data.get(CONF_PERSON_ENTITIES)
-    if isinstance(person_entities, list):
-        data[CONF_PERSON_ENTITIES] = ",".join(person_entities)
+    for key in (CONF_PREFERRED_FUELS, CONF_BRANDS, CONF_EXCLUDED_BRANDS):
+        if isinstance(data.get(key), list):
+            data[key] = "|".join(data[key])
+    for key in (CONF_PERSON_ENTITIES, CONF_FAVOURITE_STATION_CODE):
+        if isinstance(data.get(key), list):
+            data[key] = ",".join(data[key])
     return data
 
 
+def _fuel_type_options(catalogue: StationCatalogue | None, selected: list[str]) -> list:
+    fuel_types = dict(catalogue.fuel_types) if catalogue else {}
+    if not fuel_types:
+        fuel_types = {code: code for code in DEFAULT_FUEL_TYPES}
+    for code in selected:
+        fuel_types.setdefault(code, code)
+    return [
+        selector.SelectOptionDict(
+            value=code, label=code if name == code else f"{code} - {name}"
+        )
+        for code, name in sorted(fuel_types.items())
+    ]
+
+
+def _brand_field(
+    catalogue: StationCatalogue | None, value: Any
+) -> tuple[Any, selector.Selector]:
+    """Pick from catalogue brands when known, otherwise type a |-separated list."""
+    if catalogue and catalogue.brands:
+        return _pipe_list(value), selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=catalogue.brands,
+                multiple=True,
+                custom_value=True,
+                mode=selector.SelectSelectorMode.DROPDOWN,
+            )
+        )
+    return str(value), selector.TextSelector(selector.TextSelectorConfig())
+
+
+def _station_field(
+    catalogue: StationCatalogue | None, value: Any
+) -> tuple[Any, selector.Selector]:
+    """Pick favourite stations from the catalogue when known, otherwise type codes."""
+    if catalogue and catalogue.stations:
+        options = [
+            selector.SelectOptionDict(
+                value=code, label=f"{station.get('name') or code} ({code})"
+            )
+            for code, station in sorted(
+                catalogue.stations.items(), key=lambda item: str(item[1].get("name") or "")
+            )
+        ]
+        return _comma_list(value), selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=options,
+                multiple=True,
+                custom_value=True,
+                mode=selector.SelectSelectorMode.DROPDOWN,
+            )
+        )
+    return str(value), selector.TextSelector(selector.TextSelectorConfig())
+
+
 class NswFuelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
     @staticmethod
-    def _build_location_schema(defaults: dict[str, Any]) -> vol.Schema:
+    def _build_location_schema(
+        defaults: dict[str, Any], catalogue: StationCatalogue | None = None
+    ) -> vol.Schema:
+        preferred_fuels = _pipe_list(defaults.get(CONF_PREFERRED_FUELS, DEFAULT_PREFERRED_FUELS))
+        brands_default, brands_selector = _brand_field(
+            catalogue, defaults.get(CONF_BRANDS, DEFAULT_BRANDS)
+        )
+        excluded_default, excluded_selector = _brand_field(
+            catalogue, defaults.get(CONF_EXCLUDED_BRANDS, DEFAULT_EXCLUDED_BRANDS)
+        )
+        favourite_default, favourite_selector = _station_field(
+            catalogue, defaults.get(CONF_FAVOURITE_STATION_CODE, "")
+        )
         return vol.Schema(
             {
                 vol.Required(
@@ -75,15 +178,25 @@ class NswFuelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     selector.NumberSelectorConfig(min=1, max=50, step=1, mode="box")
                 ),
                 vol.Optional(
-                    CONF_BRANDS,
-                    default=str(defaults.get(CONF_BRANDS, DEFAULT_BRANDS)),
-                ): selector.TextSelector(selector.TextSelectorConfig()),
+                    CONF_FETCH_RADIUS_KM,
+                    default=defaults.get(CONF_FETCH_RADIUS_KM, DEFAULT_FETCH_RADIUS_KM),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=50, step=1, mode="box")
+                ),
+                vol.Optional(CONF_BRANDS, default=brands_default): brands_selector,
+                vol.Optional(CONF_EXCLUDED_BRANDS, default=excluded_default): excluded_selector,
+                vol.Optional(
+                    CONF_LOCAL_BRAND_FILTER,
+                    default=bool(
+                        defaults.get(CONF_LOCAL_BRAND_FILTER, DEFAULT_LOCAL_BRAND_FILTER)
+                    ),
+                ): selector.BooleanSelector(),
                 vol.Optional(
                     CONF_PREFERRED_FUELS,
-                    default=_pipe_list(defaults.get(CONF_PREFERRED_FUELS, DEFAULT_PREFERRED_FUELS)),
+                    default=preferred_fuels,
                 ): selector.SelectSelector(
                     selector.SelectSelectorConfig(
-                        options=["E10", "U91", "P95", "P98"],
+                        options=_fuel_type_options(catalogue, preferred_fuels),
                         multiple=True,
                         mode=selector.SelectSelectorMode.DROPDOWN,
                     )
@@ -98,9 +211,105 @@ class NswFuelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     )
                 ),
                 vol.Optional(
-                    CONF_FAVOURITE_STATION_CODE,
-                    default=str(defaults.get(CONF_FAVOURITE_STATION_CODE, "")),
-                ): selector.TextSelector(selector.TextSelectorConfig()),
+                    CONF_FAVOURITE_STATION_CODE, default=favourite_default
+                ): favourite_selector,
+                vol.Optional(
+                    CONF_FETCH_MODE,
+                    default=str(defaults.get(CONF_FETCH_MODE, DEFAULT_FETCH_MODE)),
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[FETCH_MODE_NEARBY, FETCH_MODE_SNAPSHOT],
+                        mode=selector.SelectSelectorMode.DROPDOWN,
+                    )
+                ),
+                vol.Optional(
+                    CONF_NEARBY_MAX_CONCURRENCY,
+                    default=defaults.get(CONF_NEARBY_MAX_CONCURRENCY, DEFAULT_NEARBY_MAX_CONCURRENCY),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=1, max=10, step=1, mode="box")
+                ),
+                vol.Optional(
+                    CONF_REQUEST_TIMEOUT_SECONDS,
+                    default=defaults.get(
+                        CONF_REQUEST_TIMEOUT_SECONDS, DEFAULT_REQUEST_TIMEOUT_SECONDS
+                    ),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=5, max=300, step=1, mode="box")
+                ),
+                vol.Optional(
+                    CONF_SNAPSHOT_TIMEOUT_SECONDS,
+                    default=defaults.get(
+                        CONF_SNAPSHOT_TIMEOUT_SECONDS, DEFAULT_SNAPSHOT_TIMEOUT_SECONDS
+                    ),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=5, max=600, step=1, mode="box")
+                ),
+                vol.Optional(
+                    CONF_NEARBY_UPDATE_MINUTES,
+                    default=defaults.get(CONF_NEARBY_UPDATE_MINUTES, DEFAULT_NEARBY_UPDATE_MINUTES),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=1440, step=1, mode="box")
+                ),
+                vol.Optional(
+                    CONF_FAVOURITE_UPDATE_MINUTES,
+                    default=defaults.get(
+                        CONF_FAVOURITE_UPDATE_MINUTES, DEFAULT_FAVOURITE_UPDATE_MINUTES
+                    ),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=1440, step=1, mode="box")
+                ),
+                vol.Optional(
+                    CONF_DAILY_QUOTA,
+                    default=defaults.get(CONF_DAILY_QUOTA, DEFAULT_DAILY_QUOTA),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=10000, step=1, mode="box")
+                ),
+                vol.Optional(
+                    CONF_MOVE_THRESHOLD_KM,
+                    default=defaults.get(CONF_MOVE_THRESHOLD_KM, DEFAULT_MOVE_THRESHOLD_KM),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=50, step=0.1, mode="box")
+                ),
+                vol.Optional(
+                    CONF_NEARBY_RESULT_TTL_MINUTES,
+                    description={"suggested_value": defaults.get(CONF_NEARBY_RESULT_TTL_MINUTES)},
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=1440, step=1, mode="box")
+                ),
+                vol.Optional(
+                    CONF_TRACK_PERSON_CHANGES,
+                    default=bool(
+                        defaults.get(CONF_TRACK_PERSON_CHANGES, DEFAULT_TRACK_PERSON_CHANGES)
+                    ),
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_PERSON_DEBOUNCE_SECONDS,
+                    default=defaults.get(
+                        CONF_PERSON_DEBOUNCE_SECONDS, DEFAULT_PERSON_DEBOUNCE_SECONDS
+                    ),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=10, max=3600, step=1, mode="box")
+                ),
+                vol.Optional(
+                    CONF_NEARBY_CACHE_GRID_KM,
+                    default=defaults.get(CONF_NEARBY_CACHE_GRID_KM, DEFAULT_NEARBY_CACHE_GRID_KM),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=5, step=0.1, mode="box")
+                ),
+                vol.Optional(
+                    CONF_NEARBY_CACHE_TTL_MINUTES,
+                    default=defaults.get(
+                        CONF_NEARBY_CACHE_TTL_MINUTES, DEFAULT_NEARBY_CACHE_TTL_MINUTES
+                    ),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=1440, step=1, mode="box")
+                ),
+                vol.Optional(
+                    CONF_MERGE_NEARBY_QUERIES,
+                    default=bool(
+                        defaults.get(CONF_MERGE_NEARBY_QUERIES, DEFAULT_MERGE_NEARBY_QUERIES)
+                    ),
+                ): selector.BooleanSelector(),
             }
         )
 
@@ -136,11 +345,28 @@ class NswFuelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 CONF_HOME_LAT: "",
                 CONF_HOME_LON: "",
                 CONF_RADIUS_KM: DEFAULT_RADIUS_KM,
+                CONF_FETCH_RADIUS_KM: DEFAULT_FETCH_RADIUS_KM,
                 CONF_BRANDS: DEFAULT_BRANDS,
+                CONF_EXCLUDED_BRANDS: DEFAULT_EXCLUDED_BRANDS,
+                CONF_LOCAL_BRAND_FILTER: DEFAULT_LOCAL_BRAND_FILTER,
                 CONF_PREFERRED_FUELS: DEFAULT_PREFERRED_FUELS,
                 CONF_PERSON_ENTITIES: "",
                 CONF_FAVOURITE_STATION_CODE: "",
-            }
+                CONF_FETCH_MODE: DEFAULT_FETCH_MODE,
+                CONF_NEARBY_MAX_CONCURRENCY: DEFAULT_NEARBY_MAX_CONCURRENCY,
+                CONF_REQUEST_TIMEOUT_SECONDS: DEFAULT_REQUEST_TIMEOUT_SECONDS,
+                CONF_SNAPSHOT_TIMEOUT_SECONDS: DEFAULT_SNAPSHOT_TIMEOUT_SECONDS,
+                CONF_NEARBY_UPDATE_MINUTES: DEFAULT_NEARBY_UPDATE_MINUTES,
+                CONF_FAVOURITE_UPDATE_MINUTES: DEFAULT_FAVOURITE_UPDATE_MINUTES,
+                CONF_DAILY_QUOTA: DEFAULT_DAILY_QUOTA,
+                CONF_MOVE_THRESHOLD_KM: DEFAULT_MOVE_THRESHOLD_KM,
+                CONF_TRACK_PERSON_CHANGES: DEFAULT_TRACK_PERSON_CHANGES,
+                CONF_PERSON_DEBOUNCE_SECONDS: DEFAULT_PERSON_DEBOUNCE_SECONDS,
+                CONF_NEARBY_CACHE_GRID_KM: DEFAULT_NEARBY_CACHE_GRID_KM,
+                CONF_NEARBY_CACHE_TTL_MINUTES: DEFAULT_NEARBY_CACHE_TTL_MINUTES,
+                CONF_MERGE_NEARBY_QUERIES: DEFAULT_MERGE_NEARBY_QUERIES,
+            },
+            await async_get_catalogue(self.hass),
         )
         return self.async_show_form(step_id="location", data_schema=schema)
 
@@ -170,7 +396,9 @@ class NswFuelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     CONF_API_SECRET,
                     default=str(entry.data.get(CONF_API_SECRET, "")),
                 ): selector.TextSelector(selector.TextSelectorConfig(type="password")),
-                **self._build_location_schema(entry.data).schema,
+                **self._build_location_schema(
+                    entry.data, await async_get_catalogue(self.hass)
+                ).schema,
             }
         )
         return self.async_show_form(step_id="reconfigure", data_schema=schema)
@@ -12,11 +12,73 @@ CONF_PERSON_ENTITIES = "person_entities"
 CONF_FAVOURITE_STATION_CODE = "favourite_station_code"
 CONF_NEARBY_UPDATE_MINUTES = "nearby_update_minutes"
 CONF_FAVOURITE_UPDATE_MINUTES = "favourite_update_minutes"
+CONF_FETCH_MODE = "fetch_mode"
+CONF_NEARBY_MAX_CONCURRENCY = "nearby_max_concurrency"
+CONF_DAILY_QUOTA = "daily_quota"
+CONF_MOVE_THRESHOLD_KM = "move_threshold_km"
+CONF_NEARBY_RESULT_TTL_MINUTES = "nearby_result_ttl_minutes"
+CONF_TRACK_PERSON_CHANGES = "track_person_changes"
+CONF_PERSON_DEBOUNCE_SECONDS = "person_debounce_seconds"
+CONF_NEARBY_CACHE_GRID_KM = "nearby_cache_grid_km"
+CONF_NEARBY_CACHE_TTL_MINUTES = "nearby_cache_ttl_minutes"
+CONF_MERGE_NEARBY_QUERIES = "merge_nearby_queries"
+CONF_EXCLUDED_BRANDS = "excluded_brands"
+CONF_LOCAL_BRAND_FILTER = "local_brand_filter"
+CONF_FETCH_RADIUS_KM = "fetch_radius_km"
+CONF_REQUEST_TIMEOUT_SECONDS = "request_timeout_seconds"
+CONF_SNAPSHOT_TIMEOUT_SECONDS = "snapshot_timeout_seconds"
+
+FETCH_MODE_NEARBY = "nearby"
+FETCH_MODE_SNAPSHOT = "snapshot"
 
 DEFAULT_RADIUS_KM = "10"
 DEFAULT_BRANDS = ""
 DEFAULT_PREFERRED_FUELS = "E10|U91|P95|P98"
+# Fuel types offered before the station catalogue has been fetched.
+DEFAULT_FUEL_TYPES = ("E10", "U91", "P95", "P98")
 DEFAULT_NEARBY_UPDATE_MINUTES = 360
 DEFAULT_FAVOURITE_UPDATE_MINUTES = 360
+DEFAULT_FETCH_MODE = FETCH_MODE_NEARBY
+DEFAULT_NEARBY_MAX_CONCURRENCY = 4
+DEFAULT_DAILY_QUOTA = 0
+DEFAULT_MOVE_THRESHOLD_KM = 1.0
+DEFAULT_TRACK_PERSON_CHANGES = False
+DEFAULT_PERSON_DEBOUNCE_SECONDS = 120
+DEFAULT_NEARBY_CACHE_GRID_KM = 0.5
+DEFAULT_NEARBY_CACHE_TTL_MINUTES = 30
+DEFAULT_MERGE_NEARBY_QUERIES = False
+DEFAULT_EXCLUDED_BRANDS = ""
+DEFAULT_LOCAL_BRAND_FILTER = False
+DEFAULT_FETCH_RADIUS_KM = 0
+DEFAULT_REQUEST_TIMEOUT_SECONDS = 20
+DEFAULT_SNAPSHOT_TIMEOUT_SECONDS = 60
+
+# Refreshes due within this window of each other run as one batch, so a
+# cycle can start up to the window early.
+MIN_ALIGN_WINDOW_MINUTES = 5
+ALIGN_WINDOW_FRACTION = 0.1
+
+# Largest radius the nearby endpoint is asked for.
+MAX_NEARBY_RADIUS_KM = 50
+
+# From this many favourite stations one statewide snapshot is fetched
+# instead of one station request each. The snapshot is one call but a
+# download of several megabytes, so fewer favourites only use it when a
+# fresh one is already cached (e.g. from nearby snapshot mode).
+FAVOURITE_SNAPSHOT_MIN_STATIONS = 5
+
+# Seconds API responses stay fresh, then stale-but-servable while they are
+# revalidated in the background, per endpoint. Nearby responses are left
+# out: the nearby coordinator keeps its own grid-snapped response cache.
+API_CACHE_TTLS = {
+    "station": (300, 1800),
+    "all_prices": (300, 1800),
+}
+
+# Radii (km) reported as cheapest-within attributes.
+RADIUS_LADDER_KM = (2, 5, 10)
+
+# Stations listed per fuel (and overall) in the top_stations attribute.
+TOP_STATIONS_COUNT = 5
 
 SERVICE_REFRESH = "refresh"
@@ -1,29 +1,80 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Awaitable, Callable
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from math import ceil, inf
+from typing import Awaitable, Callable, Iterable, Iterator, Mapping, Set, Tuple
 from typing import Any, Dict, List, Optional
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
 from .api import NswFuelApi
+from .cache import ResponseCache, snap_coordinates, snap_offset_km
+from .catalogue import StationCatalogue
+from .planner import QueryCircle, covering_radius, plan_covering_circles
+from .distance import detour_km, distance_matrix, haversine_km
+from .price_table import PriceTable
+from .records import PriceRecord, Station
 from .const import (
+    ALIGN_WINDOW_FRACTION,
     CONF_BRANDS,
+    CONF_DAILY_QUOTA,
+    CONF_EXCLUDED_BRANDS,
     CONF_FAVOURITE_STATION_CODE,
+    CONF_FETCH_MODE,
+    CONF_FETCH_RADIUS_KM,
     CONF_HOME_LAT,
     CONF_HOME_LON,
     CONF_HOME_NAMEDLOCATION,
+    CONF_LOCAL_BRAND_FILTER,
+    CONF_MERGE_NEARBY_QUERIES,
+    CONF_MOVE_THRESHOLD_KM,
+    CONF_NEARBY_CACHE_GRID_KM,
+    CONF_NEARBY_CACHE_TTL_MINUTES,
+    CONF_NEARBY_MAX_CONCURRENCY,
+    CONF_NEARBY_RESULT_TTL_MINUTES,
+    CONF_NEARBY_UPDATE_MINUTES,
+    CONF_PERSON_DEBOUNCE_SECONDS,
     CONF_PERSON_ENTITIES,
     CONF_PREFERRED_FUELS,
     CONF_RADIUS_KM,
+    DEFAULT_DAILY_QUOTA,
+    DEFAULT_EXCLUDED_BRANDS,
+    DEFAULT_FETCH_MODE,
+    DEFAULT_FETCH_RADIUS_KM,
+    DEFAULT_LOCAL_BRAND_FILTER,
+    DEFAULT_MERGE_NEARBY_QUERIES,
+    DEFAULT_MOVE_THRESHOLD_KM,
+    DEFAULT_NEARBY_CACHE_GRID_KM,
+    DEFAULT_NEARBY_CACHE_TTL_MINUTES,
+    DEFAULT_NEARBY_MAX_CONCURRENCY,
+    DEFAULT_NEARBY_UPDATE_MINUTES,
+    DEFAULT_PERSON_DEBOUNCE_SECONDS,
+    DEFAULT_RADIUS_KM,
+    FAVOURITE_SNAPSHOT_MIN_STATIONS,
+    FETCH_MODE_SNAPSHOT,
+    MAX_NEARBY_RADIUS_KM,
+    MIN_ALIGN_WINDOW_MINUTES,
+    RADIUS_LADDER_KM,
+    TOP_STATIONS_COUNT,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Name of the scheduled cycle whose API calls are being measured.
+_CURRENT_CYCLE: ContextVar[Optional[str]] = ContextVar("nsw_fuel_current_cycle", default=None)
+
+# (fueltype, latitude, longitude, namedlocation, radius_km, brands)
+NearbyQueryKey = tuple[str, str, str, str, str, tuple[str, ...]]
+
 
 def _split_pipe(value: Any) -> List[str]:
     if isinstance(value, list):
@@ -82,51 +133,120 @@ def _get_entity_location(hass: HomeAssistant, entity_id: str) -> Optional[Dict[s
     return {"lat": str(lat_str), "lon": str(lon_str), "postal": str(postal or "")}
 
 
-def _join_station_prices(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
-    stations = {str(s.get("code")): s for s in payload.get("stations", [])}
-    joined: List[Dict[str, Any]] = []
+def _iter_station_prices(
+    payload: Dict[str, Any],
+    stations: Optional[Mapping[str, Dict[str, Any]]] = None,
+    fuels: Optional[Set[str]] = None,
+) -> Iterator[PriceRecord]:
+    """Yield prices joined with their station, one record at a time.
+
+    Prices for fuels outside ``fuels`` are skipped before a record is
+    built, so a statewide payload never turns into a full joined list.
+    Every price at a station shares one ``Station``.
+    """
+    if stations is None:
+        stations = {str(s.get("code")): s for s in payload.get("stations", [])}
+    joined: Dict[str, Station] = {}
     for price in payload.get("prices", []):
+        if fuels is not None and price.get("fueltype") not in fuels:
+            continue
         code = str(price.get("stationcode"))
-        station = stations.get(code, {})
-        location = station.get("location") or {}
-        price_value = _to_float(price.get("price"))
-        joined.append(
-            {
-                "stationcode": code,
-                "fueltype": price.get("fueltype"),
-                "price": price_value,
-                "lastupdated": price.get("lastupdated"),
-                "brand": station.get("brand"),
-                "name": station.get("name"),
-                "address": station.get("address"),
-                "distance": location.get("distance"),
-                "latitude": location.get("latitude"),
-                "longitude": location.get("longitude"),
-            }
+        station = joined.get(code)
+        if station is None:
+            station = joined[code] = Station.from_payload(stations.get(code) or {}, code)
+        yield PriceRecord(
+            station,
+            price.get("fueltype"),
+            _to_float(price.get("price")),
+            price.get("lastupdated"),
+            station.distance,
         )
-    return joined
 
 
-def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    from math import radians, sin, cos, asin, sqrt
+def _filter_brands(
+    records: Iterable[PriceRecord], include: List[str], exclude: List[str]
+) -> Iterable[PriceRecord]:
+    """Keep records whose brand is in ``include`` (if given) and not in ``exclude``."""
+    if not include and not exclude:
+        return records
+    wanted = set(include)
+    unwanted = set(exclude)
+    return (
+        record
+        for record in records
+        if (not wanted or record.brand in wanted) and record.brand not in unwanted
+    )
 
-    r = 6371.0
-    dlat = radians(lat2 - lat1)
-    dlon = radians(lon2 - lon1)
-    a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
-    c = 2 * asin(sqrt(a))
-    return r * c
 
+def _rank_within(
+    records: List[PriceRecord],
+    loc: Dict[str, Any],
+    radius_km: Optional[float],
+    coverage_km: Optional[float],
+) -> Tuple[
+    Optional[PriceRecord], Dict[str, Optional[PriceRecord]], Dict[str, List[PriceRecord]]
+]:
+    """Rank records for ``loc``: the cheapest, the ladder and the top stations.
+
+    The cheapest and top stations are limited to ``radius_km``. Distances
+    are measured from ``loc`` itself, so a merged or snapped query's
+    response can be re-ranked for one of its members; records without
+    station coordinates cannot be placed and are skipped. Ladder radii
+    beyond ``coverage_km`` are ``None`` because the fetched stations may
+    not include everything that far out.
+    """
+    ladder: Dict[str, Optional[PriceRecord]] = {str(rung): None for rung in RADIUS_LADDER_KM}
+    lat = _to_float(loc.get("lat"))
+    lon = _to_float(loc.get("lon"))
+    if lat is None or lon is None:
+        return None, ladder, {}
+    table = PriceTable(records)
+    keep = table.brand_mask([], [])
+    distances = table.distances_from([(lat, lon)])[0]
+    for rung in RADIUS_LADDER_KM:
+        if coverage_km is not None and rung <= coverage_km:
+            ladder[str(rung)] = table.cheapest(keep, distances, rung)
+    radius_km = inf if radius_km is None else radius_km
+    best = table.cheapest(keep, distances, radius_km)
+    return best, ladder, table.top(keep, TOP_STATIONS_COUNT, distances, radius_km)
 
-def _pick_cheapest(records: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    records = [r for r in records if r.get("price") is not None]
-    if not records:
-        return None
-    records.sort(key=lambda r: r.get("price"))
-    return records[0]
+
+def _pick_cheapest(records: Iterable[PriceRecord]) -> Optional[PriceRecord]:
+    # Same order as PriceTable: price, then reported distance, then code.
+    return min(
+        (r for r in records if r.price is not None),
+        key=lambda r: (r.price, inf if r.distance is None else r.distance, r.stationcode),
+        default=None,
+    )
+
+
+def _as_answer(
+    best: Optional[PriceRecord],
+    cheapest_within: Dict[str, Optional[PriceRecord]],
+    top_stations: Dict[str, List[PriceRecord]],
+) -> Dict[str, Any]:
+    """Flatten picked records into the dicts kept in coordinator data."""
+    return {
+        "best": best.as_dict() if best else None,
+        "cheapest_within": {
+            rung: record.as_dict() if record else None
+            for rung, record in cheapest_within.items()
+        },
+        "top_stations": {
+            group: [record.as_dict() for record in records]
+            for group, records in top_stations.items()
+        },
+    }
 
 
 class ApiCallCounter(DataUpdateCoordinator[Dict[str, Any]]):
+    """Count API calls per day and plan refreshes against a daily quota.
+
+    Scheduled cycles report their cost through ``async_measure_cycle``; with
+    a quota configured, ``planned_interval`` stretches refresh intervals so
+    the projected calls until midnight fit in what is left of the quota.
+    """
+
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         super().__init__(hass, logger=_LOGGER, name="nsw_fuel_api_calls", update_interval=None)
         today = dt_util.now().date().isoformat()
@@ -136,17 +256,36 @@ class ApiCallCounter(DataUpdateCoordinator[Dict[str, Any]]):
             "count": 0,
             "last_reset": dt_util.now().isoformat(),
         }
+        try:
+            self.quota = max(0, int(float(entry.data.get(CONF_DAILY_QUOTA, DEFAULT_DAILY_QUOTA))))
+        except (TypeError, ValueError):
+            self.quota = DEFAULT_DAILY_QUOTA
+        self._schedule: Dict[str, timedelta] = {}
+        self._cost_estimates: Dict[str, Callable[[], float]] = {}
+        self._cycle_costs: Dict[str, float] = {}
+        self._cycle_calls: Dict[str, int] = {}
 
     async def async_increment(self, amount: int = 1) -> None:
         await self.async_reset_if_new_day()
+        amount = max(0, int(amount))
+        cycle = _CURRENT_CYCLE.get()
+        if cycle is not None and cycle in self._cycle_calls:
+            self._cycle_calls[cycle] += amount
         current = int(self.data.get("count", 0))
         self.async_set_updated_data(
             {
                 **self.data,
-                "count": current + max(0, int(amount)),
+                "count": current + amount,
             }
         )
 
+    @callback
+    def record_retry(self, reason: str) -> None:
+        """Count an API retry by reason; the retried attempt itself is a counted call."""
+        retries = dict(self.data.get("retries") or {})
+        retries[reason] = retries.get(reason, 0) + 1
+        self.async_set_updated_data({**self.data, "retries": retries})
+
     async def async_reset_if_new_day(self, force: bool = False) -> None:
         today = dt_util.now().date().isoformat()
         if force or self.data.get("date") != today:
@@ -158,6 +297,135 @@ class ApiCallCounter(DataUpdateCoordinator[Dict[str, Any]]):
                 }
             )
 
+    @callback
+    def async_restore(self, stored: Optional[Dict[str, Any]]) -> None:
+        """Resume today's count saved before a restart; other days are ignored."""
+        if not stored or stored.get("date") != self.data.get("date"):
+            return
+        try:
+            count = max(0, int(stored.get("count", 0)))
+        except (TypeError, ValueError):
+            return
+        self.async_set_updated_data(
+            {
+                **self.data,
+                "count": count,
+                "last_reset": stored.get("last_reset") or self.data.get("last_reset"),
+                "retries": dict(stored.get("retries") or {}),
+            }
+        )
+
+    def set_schedule(
+        self,
+        intervals: Dict[str, timedelta],
+        estimates: Optional[Dict[str, Callable[[], float]]] = None,
+    ) -> None:
+        """Add scheduled intervals and worst-case costs for unmeasured cycles.
+
+        Entries sharing credentials share one counter, so each scheduler
+        registers its own cycle names alongside the others.
+        """
+        self._schedule.update(
+            {name: interval for name, interval in intervals.items() if interval}
+        )
+        self._cost_estimates.update(estimates or {})
+
+    def clear_schedule(self, names: Iterable[str]) -> None:
+        for name in names:
+            self._schedule.pop(name, None)
+            self._cost_estimates.pop(name, None)
+            self._cycle_costs.pop(name, None)
+
+    async def async_measure_cycle(self, name: str, refresh: Callable[[], Awaitable[Any]]) -> Any:
+        """Run one refresh and fold the calls it made into the cycle cost estimate."""
+        self._cycle_calls[name] = 0
+        token = _CURRENT_CYCLE.set(name)
+        try:
+            return await refresh()
+        finally:
+            _CURRENT_CYCLE.reset(token)
+            calls = self._cycle_calls.pop(name, 0)
+            previous = self._cycle_costs.get(name)
+            self._cycle_costs[name] = (
+                float(calls) if previous is None else (previous + calls) / 2
+            )
+
+    def cycle_cost(self, name: str) -> float:
+        measured = self._cycle_costs.get(name)
+        if measured is not None:
+            return measured
+        estimate = self._cost_estimates.get(name)
+        return float(estimate()) if estimate is not None else 1.0
+
+    @property
+    def remaining(self) -> Optional[int]:
+        if not self.quota:
+            return None
+        return max(0, self.quota - int(self.data.get("count", 0)))
+
+    def _seconds_until_reset(self) -> float:
+        now = dt_util.now()
+        midnight = dt_util.start_of_local_day(now + timedelta(days=1))
+        return max(0.0, (midnight - now).total_seconds())
+
+    def _scheduled_call_rate(self) -> float:
+        return sum(
+            self.cycle_cost(name) / interval.total_seconds()
+            for name, interval in self._schedule.items()
+        )
+
+    def interval_scale(self) -> float:
+        """Factor to stretch scheduled intervals by so the quota lasts the day."""
+        remaining = self.remaining
+        if remaining is None:
+            return 1.0
+        projected = self._scheduled_call_rate() * self._seconds_until_reset()
+        if projected <= remaining:
+            return 1.0
+        if remaining <= 0:
+            return float("inf")
+        return projected / remaining
+
+    def planned_interval(self, name: str, interval: timedelta) -> timedelta:
+        scale = self.interval_scale()
+        if scale <= 1.0:
+            return interval
+        seconds_left = self._seconds_until_reset()
+        stretched = interval.total_seconds() * scale
+        # Never stretch past the quota reset; the plan starts over at midnight.
+        return timedelta(seconds=max(interval.total_seconds(), min(stretched, seconds_left)))
+
+    def can_afford(self, name: str) -> bool:
+        remaining = self.remaining
+        return remaining is None or remaining >= self.cycle_cost(name)
+
+    def projected_exhaustion(self) -> Optional[datetime]:
+        """When the quota runs out at the configured intervals, if before reset."""
+        remaining = self.remaining
+        if remaining is None:
+            return None
+        rate = self._scheduled_call_rate()
+        if rate <= 0:
+            return None
+        seconds = remaining / rate
+        if seconds >= self._seconds_until_reset():
+            return None
+        return dt_util.now() + timedelta(seconds=seconds)
+
+    def budget(self) -> Dict[str, Any]:
+        exhaustion = self.projected_exhaustion()
+        projected = int(self.data.get("count", 0)) + round(
+            self._scheduled_call_rate() * self._seconds_until_reset()
+        )
+        scale = self.interval_scale()
+        return {
+            "quota": self.quota or None,
+            "remaining": self.remaining,
+            "projected_calls": projected,
+            "interval_scale": round(scale, 2) if scale != float("inf") else None,
+            "projected_exhaustion": exhaustion.isoformat() if exhaustion else None,
+        }
+
 
 class NearbyCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry, api: NswFuelApi) -> None:
@@ -169,10 +437,100 @@ class NearbyCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
         )
         self.api = api
         self.entry = entry
+        self.catalogue: Optional[StationCatalogue] = None
+        cache_ttl = _to_float(
+            entry.data.get(CONF_NEARBY_CACHE_TTL_MINUTES, DEFAULT_NEARBY_CACHE_TTL_MINUTES)
+        )
+        if cache_ttl is None:
+            cache_ttl = DEFAULT_NEARBY_CACHE_TTL_MINUTES
+        # Nearby responses shared across cycles, keyed on grid-snapped coordinates.
+        self.response_cache: ResponseCache[NearbyQueryKey, Dict[str, Any]] = ResponseCache(
+            ttl_seconds=max(0.0, cache_ttl) * 60
+        )
+        self._force_full_refresh = False
+        # Set while a person-change refresh runs so the scheduler does not
+        # treat it as a full nearby cycle.
+        self.partial_refresh = False
+        self._refresh_only: Optional[set[str]] = None
+        self._moved_people: set[str] = set()
+        self._person_debouncer: Optional[Debouncer] = None
+
+    def estimated_cycle_cost(self) -> float:
+        """Worst-case API calls for one refresh, before any cycle is measured."""
+        if self.entry.data.get(CONF_FETCH_MODE, DEFAULT_FETCH_MODE) == FETCH_MODE_SNAPSHOT:
+            return 1.0
+        fuels = _split_pipe(self.entry.data[CONF_PREFERRED_FUELS])
+        people = _split_commas(self.entry.data.get(CONF_PERSON_ENTITIES, ""))
+        return float((1 + len(people)) * max(1, len(fuels)))
+
+    async def async_request_full_refresh(self) -> None:
+        """Request a refresh that re-queries every location."""
+        self._force_full_refresh = True
+        await self.async_request_refresh()
+
+    @callback
+    def async_track_person_changes(self) -> CALLBACK_TYPE:
+        """Refresh people shortly after their location changes.
+
+        Changes are coalesced by a debouncer and only the people who changed
+        are considered, so someone driving around costs one refresh per
+        cooldown rather than a full cycle for every state update.
+        """
+        people = _split_commas(self.entry.data.get(CONF_PERSON_ENTITIES, ""))
+        if not people:
+            return lambda: None
+        cooldown = _to_float(
+            self.entry.data.get(CONF_PERSON_DEBOUNCE_SECONDS, DEFAULT_PERSON_DEBOUNCE_SECONDS)
+        )
+        if cooldown is None or cooldown < 0:
+            cooldown = DEFAULT_PERSON_DEBOUNCE_SECONDS
+        debouncer = Debouncer(
+            self.hass,
+            _LOGGER,
+            cooldown=cooldown,
+            immediate=False,
+            function=self._async_refresh_moved_people,
+        )
+        self._person_debouncer = debouncer
+        unsub_state = async_track_state_change_event(
+            self.hass, people, self._handle_person_change
+        )
+
+        @callback
+        def _stop() -> None:
+            unsub_state()
+            debouncer.async_cancel()
+            self._moved_people.clear()
+            self._person_debouncer = None
+
+        return _stop
+
+    @callback
+    def _handle_person_change(self, event: Event) -> None:
+        if event.data.get("new_state") is None or self._person_debouncer is None:
+            return
+        self._moved_people.add(event.data["entity_id"])
+        self._person_debouncer.async_schedule_call()
+
+    async def _async_refresh_moved_people(self) -> None:
+        moved, self._moved_people = self._moved_people, set()
+        if not moved:
+            return
+        _LOGGER.debug("Refreshing nearby results for changed people: %s", sorted(moved))
+        self._refresh_only = moved
+        self.partial_refresh = True
+        try:
+            await self.async_refresh()
+        finally:
+            self._refresh_only = None
+            self.partial_refresh = False
 
     async def _async_update_data(self) -> Dict[str, Any]:
         preferred_fuels = _split_pipe(self.entry.data[CONF_PREFERRED_FUELS])
         brands = _split_pipe(self.entry.data.get(CONF_BRANDS, ""))
+        excluded_brands = _split_pipe(
+            self.entry.data.get(CONF_EXCLUDED_BRANDS, DEFAULT_EXCLUDED_BRANDS)
+        )
         radius_raw = self.entry.data[CONF_RADIUS_KM]
         try:
             radius_km = str(int(float(radius_raw)))
@@ -190,46 +548,71 @@ class NearbyCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
             if loc:
                 locations[entity_id] = loc
 
+        fetch_mode = self.entry.data.get(CONF_FETCH_MODE, DEFAULT_FETCH_MODE)
+        query_signature = "|".join(
+            [
+                fetch_mode,
+                ",".join(preferred_fuels),
+                ",".join(brands),
+                ",".join(excluded_brands),
+                radius_km,
+            ]
+        )
+        previous = self.data or {}
+        use_cache = not self._force_full_refresh
+        if self._force_full_refresh:
+            self._force_full_refresh = False
+            stale = set(locations)
+        else:
+            stale = self._stale_locations(locations, previous, query_signature)
+            if self._refresh_only is not None:
+                stale &= self._refresh_only
+        _LOGGER.debug(
+            "Nearby cycle refreshing %s of %s locations: %s",
+            len(stale),
+            len(locations),
+            sorted(stale),
+        )
+
+        answers: Dict[str, Dict[str, Any]] = {}
+        if fetch_mode == FETCH_MODE_SNAPSHOT:
+            # One snapshot answers every location, so refresh them all together.
+            if stale:
+                stale = set(locations)
+                answers = await self._async_fetch_snapshot(
+                    locations,
+                    preferred_fuels,
+                    brands,
+                    excluded_brands,
+                    radius_km,
+                    use_cache=use_cache,
+                )
+        elif stale:
+            answers = await self._async_fetch_nearby(
+                {loc_id: loc for loc_id, loc in locations.items() if loc_id in stale},
+                preferred_fuels,
+                brands,
+                excluded_brands,
+                radius_km,
+                namedlocation,
+                use_cache=use_cache,
+            )
+
         results: Dict[str, Any] = {}
         home_best_coords: Optional[Dict[str, float]] = None
         checked_at = dt_util.utcnow().isoformat()
-        request_cache: Dict[tuple[str, str, str, str, str, tuple[str, ...]], Dict[str, Any]] = {}
-        max_queries = len(locations) * len(preferred_fuels)
 
         for loc_id, loc in locations.items():
-            best: Optional[Dict[str, Any]] = None
-            for fuel in preferred_fuels:
-                effective_namedlocation = loc.get("postal") or namedlocation
-                query_key = (
-                    fuel,
-                    loc["lat"],
-                    loc["lon"],
-                    effective_namedlocation,
-                    radius_km,
-                    tuple(brands),
-                )
-                try:
-                    payload = request_cache.get(query_key)
-                    if payload is None:
-                        payload = await self.api.get_prices_nearby(
-                            fueltype=fuel,
-                            brands=brands,
-                            namedlocation=effective_namedlocation,
-                            latitude=loc["lat"],
-                            longitude=loc["lon"],
-                            radius_km=radius_km,
-                            sortby="price",
-                            sortascending="true",
-                        )
-                        request_cache[query_key] = payload
-                except Exception as err:
-                    _LOGGER.error("Nearby request failed for %s (%s): %s", loc_id, fuel, err)
-                    raise UpdateFailed(f"Nearby request failed: {err}") from err
-                joined = _join_station_prices(payload)
-                cheapest = _pick_cheapest(joined)
-                if cheapest and (not best or cheapest["price"] < best["price"]):
-                    best = cheapest
-
+            if loc_id not in stale:
+                if previous.get(loc_id):
+                    results[loc_id] = dict(previous[loc_id])
+                continue
+            if loc_id not in answers and previous.get(loc_id):
+                _LOGGER.warning("Keeping previous nearby result for %s after failed requests", loc_id)
+                results[loc_id] = dict(previous[loc_id])
+                continue
+            answer = answers.get(loc_id) or {}
+            best = answer.get("best")
             if not best:
                 _LOGGER.warning(
                     "No prices found for %s (lat=%s lon=%s postal=%s fuels=%s)",
@@ -239,45 +622,409 @@ class NearbyCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
                     loc.get("postal"),
                     preferred_fuels,
                 )
-            if loc_id == "home" and best:
-                try:
-                    home_best_coords = {
-                        "lat": float(best.get("latitude")),
-                        "lon": float(best.get("longitude")),
-                    }
-                except (TypeError, ValueError):
-                    _LOGGER.warning("Home cheapest station missing lat/lon: %s", best)
             results[loc_id] = {
                 "best": best,
+                "cheapest_within": answer.get("cheapest_within") or {},
+                "top_stations": answer.get("top_stations") or {},
                 "last_checked": checked_at,
+                "queried_location": {
+                    "lat": _to_float(loc.get("lat")),
+                    "lon": _to_float(loc.get("lon")),
+                },
+                "query": query_signature,
             }
 
+        home_best = (results.get("home") or {}).get("best")
+        if home_best:
+            try:
+                home_best_coords = {
+                    "lat": float(home_best.get("latitude")),
+                    "lon": float(home_best.get("longitude")),
+                }
+            except (TypeError, ValueError):
+                _LOGGER.warning("Home cheapest station missing lat/lon: %s", home_best)
+
         if home_best_coords:
+            people: Dict[str, Tuple[float, float]] = {}
             for loc_id, loc in locations.items():
-                if loc_id == "home":
+                if loc_id == "home" or loc_id not in results:
                     continue
-                try:
-                    dist = _haversine_km(
-                        float(loc["lat"]),
-                        float(loc["lon"]),
-                        home_best_coords["lat"],
-                        home_best_coords["lon"],
+                results[loc_id]["distance_to_home_cheapest"] = None
+                results[loc_id]["detour_to_home_cheapest"] = None
+                lat, lon = _to_float(loc.get("lat")), _to_float(loc.get("lon"))
+                if lat is not None and lon is not None:
+                    people[loc_id] = (lat, lon)
+            home = locations.get("home") or {}
+            home_point = (_to_float(home.get("lat")), _to_float(home.get("lon")))
+            has_home = None not in home_point
+            # One matrix: every person, then home, against the station and home.
+            origins = list(people.values()) + ([home_point] if has_home else [])
+            targets = [(home_best_coords["lat"], home_best_coords["lon"])]
+            if has_home:
+                targets.append(home_point)
+            matrix = distance_matrix(origins, targets)
+            for row, loc_id in enumerate(people):
+                results[loc_id]["distance_to_home_cheapest"] = float(matrix[row][0])
+                if has_home:
+                    results[loc_id]["detour_to_home_cheapest"] = round(
+                        detour_km(
+                            float(matrix[row][0]), float(matrix[-1][0]), float(matrix[row][1])
+                        ),
+                        2,
                     )
-                except (TypeError, ValueError):
-                    dist = None
-                results[loc_id]["distance_to_home_cheapest"] = dist
+
+        return results
+
+    def _stale_locations(
+        self,
+        locations: Dict[str, Dict[str, str]],
+        previous: Dict[str, Any],
+        query_signature: str,
+    ) -> set[str]:
+        """Return locations whose previous result cannot be reused.
+
+        A result is reused while it was produced by the same query settings,
+        is younger than the result TTL, and the location has not moved more
+        than the movement threshold since it was queried.
+        """
+        threshold_km = _to_float(
+            self.entry.data.get(CONF_MOVE_THRESHOLD_KM, DEFAULT_MOVE_THRESHOLD_KM)
+        )
+        if threshold_km is None:
+            threshold_km = DEFAULT_MOVE_THRESHOLD_KM
+        ttl = self._result_ttl()
+        now = dt_util.utcnow()
+
+        stale: set[str] = set()
+        for loc_id, loc in locations.items():
+            prev = previous.get(loc_id) or {}
+            checked = dt_util.parse_datetime(str(prev.get("last_checked") or ""))
+            if prev.get("query") != query_signature or checked is None or now - checked >= ttl:
+                stale.add(loc_id)
+                continue
+            queried = prev.get("queried_location") or {}
+            coords = (
+                _to_float(loc.get("lat")),
+                _to_float(loc.get("lon")),
+                _to_float(queried.get("lat")),
+                _to_float(queried.get("lon")),
+            )
+            if any(value is None for value in coords):
+                stale.add(loc_id)
+                continue
+            if haversine_km(*coords) > threshold_km:
+                stale.add(loc_id)
+        return stale
+
+    def _result_ttl(self) -> timedelta:
+        """Return how long a stationary location's result is reused.
+
+        Without a configured TTL results last just under one nearby update
+        interval: a batch can start up to the scheduler's alignment window
+        early, and the next scheduled cycle must still re-query, so prices
+        are never older than about one interval.
+        """
+        ttl_minutes = _to_float(self.entry.data.get(CONF_NEARBY_RESULT_TTL_MINUTES))
+        if ttl_minutes is None:
+            interval = _to_float(
+                self.entry.data.get(CONF_NEARBY_UPDATE_MINUTES, DEFAULT_NEARBY_UPDATE_MINUTES)
+            )
+            if not interval or interval < 0:
+                interval = DEFAULT_NEARBY_UPDATE_MINUTES
+            align_window = max(MIN_ALIGN_WINDOW_MINUTES, interval * ALIGN_WINDOW_FRACTION)
+            ttl_minutes = interval - align_window
+        return timedelta(minutes=max(0.0, ttl_minutes))
+
+    async def _async_fetch_nearby(
+        self,
+        locations: Dict[str, Dict[str, str]],
+        preferred_fuels: List[str],
+        brands: List[str],
+        excluded_brands: List[str],
+        radius_km: str,
+        namedlocation: str,
+        use_cache: bool = True,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Query nearby prices for every location and preferred fuel.
+
+        Coordinates are snapped to the cache grid so nearby locations share
+        queries, and responses still fresh in ``response_cache`` are reused
+        across cycles. The remaining queries are sent once each, concurrently
+        up to the configured limit. Locations whose queries all failed are
+        left out of the result so the caller can keep their previous answer.
+
+        Excluded brands are always dropped locally. With the local brand
+        filter enabled the brand list is applied locally too and queries are
+        sent unfiltered, so differing brand settings share responses.
+
+        With a fetch radius larger than the configured radius, queries use
+        the fetch radius and every location is re-ranked locally, so other
+        radius settings and the cheapest-within ladder cost no extra calls.
+        """
+        if self.entry.data.get(CONF_LOCAL_BRAND_FILTER, DEFAULT_LOCAL_BRAND_FILTER):
+            query_brands: List[str] = []
+            local_brands = brands
+        else:
+            query_brands, local_brands = brands, []
+        grid_km = _to_float(
+            self.entry.data.get(CONF_NEARBY_CACHE_GRID_KM, DEFAULT_NEARBY_CACHE_GRID_KM)
+        )
+        if grid_km is None:
+            grid_km = DEFAULT_NEARBY_CACHE_GRID_KM
+        radius = _to_float(radius_km)
+        fetch_radius = _to_float(
+            self.entry.data.get(CONF_FETCH_RADIUS_KM, DEFAULT_FETCH_RADIUS_KM)
+        )
+        query_radius_km = radius_km
+        if radius is not None and fetch_radius and fetch_radius > radius:
+            query_radius_km = str(int(min(fetch_radius, MAX_NEARBY_RADIUS_KM)))
+
+        request_cache: Dict[NearbyQueryKey, Optional[Dict[str, Any]]] = {}
+        location_queries: Dict[str, List[NearbyQueryKey]] = {}
+        for lat, lon, query_radius, members in self._plan_nearby_queries(
+            locations, query_radius_km, grid_km
+        ):
+            effective_namedlocation = locations[members[0]].get("postal") or namedlocation
+            keys = [
+                (fuel, lat, lon, effective_namedlocation, query_radius, tuple(query_brands))
+                for fuel in preferred_fuels
+            ]
+            for loc_id in members:
+                location_queries[loc_id] = keys
+            for query_key in keys:
+                if query_key not in request_cache:
+                    request_cache[query_key] = (
+                        self.response_cache.get(query_key) if use_cache else None
+                    )
+
+        misses = [key for key, cached in request_cache.items() if cached is None]
+        fetched = await self._async_dispatch_nearby(misses, force=not use_cache)
+        if misses and not fetched:
+            raise UpdateFailed("All nearby requests failed")
+        for query_key, payload in fetched.items():
+            self.response_cache.set(query_key, payload)
+        payloads = {
+            key: cached for key, cached in request_cache.items() if cached is not None
+        }
+        payloads.update(fetched)
+
+        answers: Dict[str, Dict[str, Any]] = {}
+        for loc_id, query_keys in location_queries.items():
+            answered = [payloads[key] for key in query_keys if key in payloads]
+            if query_keys and not answered:
+                continue
+            loc = locations[loc_id]
+            records = [
+                record
+                for payload in answered
+                for record in _filter_brands(
+                    _iter_station_prices(payload), local_brands, excluded_brands
+                )
+            ]
+            # Every location is ranked from its own position, so merged,
+            # snapped and wider queries give the same answer as its own query.
+            best, ladder, top_stations = _rank_within(
+                records, loc, radius, _to_float(query_radius_km)
+            )
+            if _to_float(loc.get("lat")) is None or _to_float(loc.get("lon")) is None:
+                # Unplaced locations are never merged; rank by reported distance.
+                best = _pick_cheapest(records)
+            answers[loc_id] = _as_answer(best, ladder, top_stations)
 
         _LOGGER.debug(
-            "Nearby cycle unique requests=%s (worst-case=%s, locations=%s, preferred_fuels=%s)",
+            "Nearby cycle unique requests=%s sent=%s failed=%s (worst-case=%s, locations=%s, preferred_fuels=%s, cache=%s)",
             len(request_cache),
-            max_queries,
+            len(misses),
+            len(misses) - len(fetched),
+            len(locations) * len(preferred_fuels),
             len(locations),
             len(preferred_fuels),
+            self.response_cache.stats(),
         )
-        return results
+        return answers
+
+    def _plan_nearby_queries(
+        self,
+        locations: Dict[str, Dict[str, str]],
+        radius_km: str,
+        grid_km: float,
+    ) -> List[tuple[str, str, str, List[str]]]:
+        """Return ``(lat, lon, radius_km, members)`` for each nearby query.
+
+        Locations get their own query at grid-snapped coordinates, with the
+        radius padded so the search circle still covers the location's own.
+        With query merging enabled, clustered locations share one query whose radius
+        covers all of their search circles, up to ``MAX_NEARBY_RADIUS_KM``.
+        """
+        radius = _to_float(radius_km)
+        points: Dict[str, tuple[float, float]] = {}
+        queries: List[tuple[str, str, str, List[str]]] = []
+        for loc_id, loc in locations.items():
+            lat, lon = _to_float(loc.get("lat")), _to_float(loc.get("lon"))
+            if lat is None or lon is None:
+                queries.append((loc["lat"], loc["lon"], radius_km, [loc_id]))
+            else:
+                points[loc_id] = (lat, lon)
+
+        merge = self.entry.data.get(CONF_MERGE_NEARBY_QUERIES, DEFAULT_MERGE_NEARBY_QUERIES)
+        if merge and radius is not None:
+            circles = plan_covering_circles(points, radius, MAX_NEARBY_RADIUS_KM)
+        else:
+            circles = [
+                QueryCircle(lat, lon, radius or 0.0, [loc_id])
+                for loc_id, (lat, lon) in points.items()
+            ]
+
+        for circle in circles:
+            if not circle.merged:
+                loc = locations[circle.members[0]]
+                lat, lon = loc["lat"], loc["lon"]
+                query_radius = radius_km
+                if grid_km > 0:
+                    lat, lon = snap_coordinates(circle.lat, circle.lon, grid_km)
+                    if radius is not None:
+                        padded = ceil(radius + snap_offset_km(grid_km))
+                        query_radius = str(min(padded, MAX_NEARBY_RADIUS_KM))
+                queries.append((lat, lon, query_radius, circle.members))
+                continue
+            lat, lon = f"{circle.lat:.6f}", f"{circle.lon:.6f}"
+            needed = circle.radius_km
+            if grid_km > 0:
+                snapped = snap_coordinates(circle.lat, circle.lon, grid_km)
+                snapped_needed = covering_radius(
+                    (float(snapped[0]), float(snapped[1])),
+                    [points[member] for member in circle.members],
+                    radius,
+                )
+                if snapped_needed <= MAX_NEARBY_RADIUS_KM:
+                    (lat, lon), needed = snapped, snapped_needed
+            queries.append((lat, lon, str(ceil(needed)), circle.members))
+        return queries
+
+    async def _async_dispatch_nearby(
+        self, query_keys: List[NearbyQueryKey], force: bool = False
+    ) -> Dict[NearbyQueryKey, Dict[str, Any]]:
+        semaphore = asyncio.Semaphore(_nearby_limit(self.entry))
+
+        async def _fetch(query_key: NearbyQueryKey) -> Dict[str, Any]:
+            fuel, lat, lon, effective_namedlocation, radius_km, brands = query_key
+            async with semaphore:
+                return await self.api.get_prices_nearby(
+                    fueltype=fuel,
+                    brands=list(brands),
+                    namedlocation=effective_namedlocation,
+                    latitude=lat,
+                    longitude=lon,
+                    radius_km=radius_km,
+                    sortby="price",
+                    sortascending="true",
+                    force=force,
+                )
+
+        responses = await asyncio.gather(
+            *(_fetch(query_key) for query_key in query_keys), return_exceptions=True
+        )
+        payloads: Dict[NearbyQueryKey, Dict[str, Any]] = {}
+        for query_key, response in zip(query_keys, responses):
+            if isinstance(response, BaseException):
+                if isinstance(response, asyncio.CancelledError):
+                    raise response
+                _LOGGER.error(
+                    "Nearby request failed (fuel=%s lat=%s lon=%s): %s",
+                    query_key[0],
+                    query_key[1],
+                    query_key[2],
+                    response,
+                )
+                continue
+            payloads[query_key] = response
+        return payloads
+
+    async def _async_fetch_snapshot(
+        self,
+        locations: Dict[str, Dict[str, str]],
+        preferred_fuels: List[str],
+        brands: List[str],
+        excluded_brands: List[str],
+        radius_km: str,
+        use_cache: bool = True,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Answer every location from one all-current-prices payload."""
+        try:
+            payload = await self.api.get_all_prices(force=not use_cache)
+        except Exception as err:
+            _LOGGER.error("All prices request failed: %s", err)
+            raise UpdateFailed(f"All prices request failed: {err}") from err
+
+        table = PriceTable(
+            _iter_station_prices(payload, self._snapshot_stations(payload), set(preferred_fuels))
+        )
+        keep = table.brand_mask(brands, excluded_brands)
+
+        radius = _to_float(radius_km)
+        if radius is None:
+            radius = float(DEFAULT_RADIUS_KM)
+        answers: Dict[str, Dict[str, Any]] = {}
+        points: Dict[str, Tuple[float, float]] = {}
+        for loc_id, loc in locations.items():
+            lat = _to_float(loc.get("lat"))
+            lon = _to_float(loc.get("lon"))
+            if lat is None or lon is None:
+                answers[loc_id] = {"best": None}
+            else:
+                points[loc_id] = (lat, lon)
+        matrix = table.distances_from(list(points.values()))
+        for loc_id, distances in zip(points, matrix):
+            answers[loc_id] = _as_answer(
+                table.cheapest(keep, distances, radius),
+                {
+                    str(rung): table.cheapest(keep, distances, rung)
+                    for rung in RADIUS_LADDER_KM
+                },
+                table.top(keep, TOP_STATIONS_COUNT, distances, radius),
+            )
+
+        _LOGGER.debug(
+            "Snapshot cycle requests=1 (candidate_stations=%s, locations=%s, preferred_fuels=%s, vectorised=%s)",
+            len(table.stations),
+            len(locations),
+            len(preferred_fuels),
+            table.vectorised,
+        )
+        return answers
+
+    def _snapshot_stations(self, payload: Dict[str, Any]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Catalogue stations by code, or ``None`` to use the payload's own list.
+
+        The payload's list is used when it prices stations the catalogue
+        does not know yet.
+        """
+        catalogue = self.catalogue
+        if catalogue is not None and catalogue.loaded:
+            codes = {str(price.get("stationcode")) for price in payload.get("prices", [])}
+            if codes <= catalogue.stations.keys():
+                return catalogue.stations
+            _LOGGER.debug("Snapshot lists stations missing from the catalogue; using payload")
+        return None
+
+
+def _nearby_limit(entry: ConfigEntry) -> int:
+    limit_raw = entry.data.get(CONF_NEARBY_MAX_CONCURRENCY, DEFAULT_NEARBY_MAX_CONCURRENCY)
+    try:
+        return max(1, int(float(limit_raw)))
+    except (TypeError, ValueError):
+        return DEFAULT_NEARBY_MAX_CONCURRENCY
 
 
 class FavouriteStationCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
+    """Prices for the favourite stations, refreshed together in one cycle.
+
+    A few stations use the per-station endpoint. From
+    ``FAVOURITE_SNAPSHOT_MIN_STATIONS`` stations on, or when a fresh
+    all-prices snapshot is already cached, one snapshot answers them all
+    for a single call.
+    """
+
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry, api: NswFuelApi) -> None:
         super().__init__(
             hass,
@@ -287,34 +1034,110 @@ class FavouriteStationCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
         )
         self.api = api
         self.entry = entry
+        self.catalogue: Optional[StationCatalogue] = None
+        self._force_full_refresh = False
+
+    async def async_request_full_refresh(self) -> None:
+        """Request a refresh that skips cached API responses."""
+        self._force_full_refresh = True
+        await self.async_request_refresh()
+
+    @property
+    def station_codes(self) -> List[str]:
+        return _split_commas(self.entry.data.get(CONF_FAVOURITE_STATION_CODE, ""))
+
+    def estimated_cycle_cost(self) -> float:
+        codes = self.station_codes
+        if self._use_snapshot(codes):
+            return 1.0
+        return float(len(codes))
+
+    def _use_snapshot(self, codes: List[str], force: bool = False) -> bool:
+        if len(codes) >= FAVOURITE_SNAPSHOT_MIN_STATIONS:
+            return True
+        # A forced refresh would download the snapshot again, so only reuse
+        # one fetched in this window for an ordinary refresh.
+        return len(codes) > 1 and not force and self.api.is_fresh("all_prices", "all_prices")
 
     async def _async_update_data(self) -> Dict[str, Any]:
-        station_code = self.entry.data.get(CONF_FAVOURITE_STATION_CODE, "")
-        if not station_code:
+        codes = self.station_codes
+        if not codes:
             _LOGGER.info("Favourite station code not configured; skipping update.")
             return {}
         preferred_fuels = set(_split_pipe(self.entry.data[CONF_PREFERRED_FUELS]))
         checked_at = dt_util.utcnow().isoformat()
+        force = self._force_full_refresh
+        self._force_full_refresh = False
+        if self._use_snapshot(codes, force):
+            payloads = await self._async_fetch_snapshot(codes, force)
+        else:
+            payloads = await self._async_fetch_stations(codes, force)
+
+        previous = (self.data or {}).get("stations") or {}
+        stations: Dict[str, Any] = {}
+        for code in codes:
+            payload = payloads.get(code)
+            if payload is None:
+                if previous.get(code):
+                    _LOGGER.warning("Keeping previous prices for favourite station %s", code)
+                    stations[code] = previous[code]
+                continue
+            prices = []
+            for entry in payload.get("prices", []):
+                if entry.get("fueltype") not in preferred_fuels:
+                    continue
+                price_value = _to_float(entry.get("price"))
+                if price_value is None:
+                    continue
+                cleaned = dict(entry)
+                cleaned["price"] = price_value
+                prices.append(cleaned)
+            prices.sort(key=lambda p: p.get("price"))
+            station = (self.catalogue.station(code) if self.catalogue else None) or {}
+            stations[code] = {
+                "station_code": code,
+                "name": station.get("name"),
+                "brand": station.get("brand"),
+                "address": station.get("address"),
+                "prices": prices,
+                "best": prices[0] if prices else None,
+                "last_checked": checked_at,
+            }
+        return {"stations": stations}
+
+    async def _async_fetch_stations(
+        self, codes: List[str], force: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        semaphore = asyncio.Semaphore(_nearby_limit(self.entry))
+
+        async def _fetch(code: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.api.get_station_prices(code, force=force)
+
+        responses = await asyncio.gather(*(_fetch(code) for code in codes), return_exceptions=True)
+        payloads: Dict[str, Dict[str, Any]] = {}
+        for code, response in zip(codes, responses):
+            if isinstance(response, BaseException):
+                if isinstance(response, asyncio.CancelledError):
+                    raise response
+                _LOGGER.error("Favourite station request failed (%s): %s", code, response)
+                continue
+            payloads[code] = response
+        if not payloads:
+            raise UpdateFailed("All favourite station requests failed")
+        return payloads
+
+    async def _async_fetch_snapshot(
+        self, codes: List[str], force: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
         try:
-            payload = await self.api.get_station_prices(station_code)
+            payload = await self.api.get_all_prices(force=force)
         except Exception as err:
-            _LOGGER.error("Favourite station request failed (%s): %s", station_code, err)
+            _LOGGER.error("All prices request for favourite stations failed: %s", err)
             raise UpdateFailed(f"Favourite station request failed: {err}") from err
-        prices = []
-        for entry in payload.get("prices", []):
-            if entry.get("fueltype") not in preferred_fuels:
-                continue
-            price_value = _to_float(entry.get("price"))
-            if price_value is None:
-                continue
-            cleaned = dict(entry)
-            cleaned["price"] = price_value
-            prices.append(cleaned)
-        prices.sort(key=lambda p: p.get("price"))
-        best = prices[0] if prices else None
-        return {
-            "station_code": station_code,
-            "prices": prices,
-            "best": best,
-            "last_checked": checked_at,
-        }
+        payloads: Dict[str, Dict[str, Any]] = {code: {"prices": []} for code in codes}
+        for price in payload.get("prices", []):
+            station = payloads.get(str(price.get("stationcode")))
+            if station is not None:
+                station["prices"].append(price)
+        return payloads
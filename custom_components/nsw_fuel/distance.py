@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from math import asin, cos, isnan, nan, radians, sin, sqrt
+from typing import Any, Optional, Sequence, Tuple
+
+# NumPy is optional; without it matrices are lists of rows.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+EARTH_RADIUS_KM = 6371.0
+
+Point = Tuple[float, float]
+Matrix = Any
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(sqrt(min(1.0, a)))
+
+
+def distance_matrix(
+    origins: Sequence[Point], targets: Sequence[Point], vectorised: Optional[bool] = None
+) -> Matrix:
+    """Great-circle km from every origin (rows) to every target (columns).
+
+    With NumPy the whole matrix is one broadcast pass and an array is
+    returned; otherwise a list of rows. NaN coordinates give NaN distances.
+    """
+    if np is None or vectorised is False:
+        return [
+            [
+                nan if isnan(t_lat) or isnan(o_lat) else haversine_km(o_lat, o_lon, t_lat, t_lon)
+                for t_lat, t_lon in targets
+            ]
+            for o_lat, o_lon in origins
+        ]
+    origin = np.radians(np.asarray(origins, dtype=np.float64).reshape(-1, 2))
+    target = np.radians(np.asarray(targets, dtype=np.float64).reshape(-1, 2))
+    lat1 = origin[:, 0:1]
+    lat2 = target[:, 0]
+    dlat = lat2 - lat1
+    dlon = target[:, 1] - origin[:, 1:2]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(1.0, a)))
+
+
+def detour_km(to_stop: float, stop_to_destination: float, direct: float) -> float:
+    """Extra distance from calling at a stop instead of driving straight there."""
+    return max(0.0, to_stop + stop_to_destination - direct)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from .distance import haversine_km
+
+Point = Tuple[float, float]
+
+
+@dataclass
+class QueryCircle:
+    """One nearby query covering the search circles of its members."""
+
+    lat: float
+    lon: float
+    radius_km: float
+    members: List[str] = field(default_factory=list)
+
+    @property
+    def merged(self) -> bool:
+        return len(self.members) > 1
+
+
+def _centroid(points: List[Point]) -> Point:
+    return (
+        sum(lat for lat, _lon in points) / len(points),
+        sum(lon for _lat, lon in points) / len(points),
+    )
+
+
+def covering_radius(centre: Point, points: List[Point], radius_km: float) -> float:
+    """Radius around ``centre`` that contains a ``radius_km`` circle around every point."""
+    return radius_km + max(haversine_km(*centre, *point) for point in points)
+
+
+def plan_covering_circles(
+    points: Dict[str, Point], radius_km: float, max_radius_km: float
+) -> List[QueryCircle]:
+    """Greedily group locations whose search circles fit in one larger query.
+
+    Each location joins the existing group whose covering circle grows the
+    least, as long as that circle stays within ``max_radius_km``; otherwise
+    it starts a new group. Every station within ``radius_km`` of a member is
+    inside its group's circle, so re-ranking the group's response per member
+    gives the same answer as a separate query.
+    """
+    groups: List[List[str]] = []
+    for loc_id, point in points.items():
+        best_group = None
+        best_radius = max_radius_km
+        for group in groups:
+            members = [points[member] for member in group] + [point]
+            needed = covering_radius(_centroid(members), members, radius_km)
+            if needed <= best_radius:
+                best_group, best_radius = group, needed
+        if best_group is None:
+            groups.append([loc_id])
+        else:
+            best_group.append(loc_id)
+
+    circles: List[QueryCircle] = []
+    for group in groups:
+        members = [points[member] for member in group]
+        if len(group) == 1:
+            lat, lon = members[0]
+            circles.append(QueryCircle(lat, lon, radius_km, list(group)))
+            continue
+        centre = _centroid(members)
+        circles.append(
+            QueryCircle(*centre, covering_radius(centre, members, radius_km), list(group))
+        )
+    return circles
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import heapq
+from math import inf, isnan, nan
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .distance import Point, distance_matrix
+from .records import PriceRecord, Station
+
+# NumPy is optional; without it the table keeps plain lists and loops.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+Mask = Any
+Distances = Any
+
+
+class PriceTable:
+    """Snapshot prices held as columns for ranking many locations.
+
+    Each row is one price; station metadata and coordinates are stored
+    once per station and rows refer to them by slot. With NumPy the
+    columns are arrays and brand, radius and ranking steps run as
+    vectorised masks and ``argmin``/``argpartition``; otherwise the same
+    operations run over lists.
+    """
+
+    def __init__(self, records: Iterable[PriceRecord], vectorised: Optional[bool] = None) -> None:
+        self.vectorised = np is not None and vectorised is not False
+        self.stations: List[Station] = []
+        slots: Dict[str, int] = {}
+        fuels: Dict[Optional[str], int] = {}
+        station_col: List[int] = []
+        fuel_col: List[int] = []
+        price_col: List[float] = []
+        self.lastupdated: List[Optional[str]] = []
+        for record in records:
+            slot = slots.get(record.stationcode)
+            if slot is None:
+                slot = slots[record.stationcode] = len(self.stations)
+                self.stations.append(record.station)
+            station_col.append(slot)
+            fuel_col.append(fuels.setdefault(record.fueltype, len(fuels)))
+            price_col.append(nan if record.price is None else record.price)
+            self.lastupdated.append(record.lastupdated)
+        self.fuel_types: List[Optional[str]] = list(fuels)
+        # Each station's place in station code order, the last tie-breaker.
+        code_rank = [0] * len(self.stations)
+        for rank, slot in enumerate(
+            sorted(range(len(self.stations)), key=lambda slot: self.stations[slot].code)
+        ):
+            code_rank[slot] = rank
+        self.coords: List[Point] = [
+            (
+                nan if s.latitude is None else s.latitude,
+                nan if s.longitude is None else s.longitude,
+            )
+            for s in self.stations
+        ]
+        if self.vectorised:
+            self.station = np.array(station_col, dtype=np.intp)
+            self.fuel = np.array(fuel_col, dtype=np.intp)
+            self.price = np.array(price_col, dtype=np.float64)
+            self.code_rank = np.array(code_rank, dtype=np.intp)
+        else:
+            self.station = station_col
+            self.fuel = fuel_col
+            self.price = price_col
+            self.code_rank = code_rank
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    def brand_mask(self, include: Sequence[str], exclude: Sequence[str]) -> Mask:
+        """Rows whose brand is in ``include`` (if given) and not in ``exclude``."""
+        wanted = set(include)
+        unwanted = set(exclude)
+        keep = [
+            (not wanted or s.brand in wanted) and s.brand not in unwanted
+            for s in self.stations
+        ]
+        if self.vectorised:
+            return np.array(keep, dtype=bool)[self.station]
+        return [keep[slot] for slot in self.station]
+
+    def distances_from(self, points: Sequence[Point]) -> List[Distances]:
+        """Distances in km from each point to every station, NaN when unplaced.
+
+        All points are measured in one matrix pass. Distances are rounded
+        to 0.01 km, the precision reported in sensor attributes.
+        """
+        matrix = distance_matrix(points, self.coords, self.vectorised)
+        if self.vectorised:
+            return list(np.round(matrix, 2))
+        return [[round(distance, 2) for distance in row] for row in matrix]
+
+    def radius_mask(self, distances: Distances, radius_km: float) -> Mask:
+        if self.vectorised:
+            return distances[self.station] <= radius_km
+        return [distances[slot] <= radius_km for slot in self.station]
+
+    def cheapest_rows(self, mask: Mask, k: int = 1, distances: Distances = None) -> List[int]:
+        """Rows of the ``k`` cheapest priced prices in ``mask``, cheapest first.
+
+        Equal prices are ordered by distance when ``distances`` is given,
+        then by station code, then by row order.
+        """
+        if k <= 0 or not len(self):
+            return []
+        if not self.vectorised:
+            rows = [row for row, keep in enumerate(mask) if keep and not isnan(self.price[row])]
+            return heapq.nsmallest(k, rows, key=lambda row: self._rank(row, distances))
+        prices = np.where(mask & ~np.isnan(self.price), self.price, inf)
+        if k == 1:
+            best = prices.min()
+            if best == inf:
+                return []
+            tied = np.flatnonzero(prices == best)
+            if len(tied) > 1:
+                tied = tied[np.lexsort(self._tie_keys(tied, distances))]
+            return [int(tied[0])]
+        k = min(k, len(prices))
+        kth = prices[np.argpartition(prices, k - 1)[k - 1]]
+        # Keep every row tied with the k-th price so ties break the same way.
+        rows = np.flatnonzero((prices <= kth) & (prices != inf))
+        keys = self._tie_keys(rows, distances) + [prices[rows]]
+        return [int(row) for row in rows[np.lexsort(keys)][:k]]
+
+    def _tie_keys(self, rows: Any, distances: Distances) -> list:
+        # lexsort orders by the last key first: distance, then code, then row.
+        keys = [rows, self.code_rank[self.station[rows]]]
+        if distances is not None:
+            keys.append(distances[self.station[rows]])
+        return keys
+
+    def _rank(self, row: int, distances: Distances) -> tuple:
+        slot = self.station[row]
+        if distances is None:
+            return (self.price[row], self.code_rank[slot], row)
+        return (self.price[row], distances[slot], self.code_rank[slot], row)
+
+    def _within(self, mask: Mask, distances: Distances, radius_km: Optional[float]) -> Mask:
+        if radius_km is None or distances is None:
+            return mask
+        in_range = self.radius_mask(distances, radius_km)
+        if self.vectorised:
+            return mask & in_range
+        return [keep and near for keep, near in zip(mask, in_range)]
+
+    def fuel_mask(self, mask: Mask, fueltype: Optional[str]) -> Mask:
+        """Rows of ``mask`` that price ``fueltype``."""
+        code = self.fuel_types.index(fueltype)
+        if self.vectorised:
+            return mask & (self.fuel == code)
+        return [keep and fuel == code for keep, fuel in zip(mask, self.fuel)]
+
+    def cheapest(
+        self, mask: Mask, distances: Distances = None, radius_km: Optional[float] = None
+    ) -> Optional[PriceRecord]:
+        """The cheapest price in ``mask``, within ``radius_km`` when given."""
+        rows = self.cheapest_rows(self._within(mask, distances, radius_km), 1, distances)
+        return self.record(rows[0], distances) if rows else None
+
+    def top(
+        self,
+        mask: Mask,
+        k: int,
+        distances: Distances = None,
+        radius_km: Optional[float] = None,
+    ) -> Dict[str, List[PriceRecord]]:
+        """The ``k`` cheapest prices overall and for each fuel type, cheapest first.
+
+        Each list is a partial selection (``argpartition`` or a bounded
+        heap), so the cost is O(n log k) rather than a full sort per list.
+        """
+        mask = self._within(mask, distances, radius_km)
+        leaders = {
+            "overall": [self.record(row, distances) for row in self.cheapest_rows(mask, k, distances)]
+        }
+        for fueltype in self.fuel_types:
+            if fueltype is None:
+                continue
+            rows = self.cheapest_rows(self.fuel_mask(mask, fueltype), k, distances)
+            if rows:
+                leaders[fueltype] = [self.record(row, distances) for row in rows]
+        return leaders
+
+    def record(self, row: int, distances: Distances = None) -> PriceRecord:
+        slot = int(self.station[row])
+        station = self.stations[slot]
+        distance = station.distance if distances is None else float(distances[slot])
+        return PriceRecord(
+            station,
+            self.fuel_types[int(self.fuel[row])],
+            float(self.price[row]),
+            self.lastupdated[row],
+            distance,
+        )
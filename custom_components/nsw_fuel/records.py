@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from typing import Any, Dict, NamedTuple, Optional
+
+
+def _coord(location: Dict[str, Any], key: str) -> Optional[float]:
+    try:
+        return float(location[key])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class Station(NamedTuple):
+    """Station metadata shared by every price record at that station."""
+
+    code: str
+    brand: Optional[str] = None
+    name: Optional[str] = None
+    address: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    # Distance from the query point, when the API reported one.
+    distance: Optional[float] = None
+
+    @classmethod
+    def from_payload(cls, station: Dict[str, Any], code: Optional[str] = None) -> Station:
+        location = station.get("location") or {}
+        return cls(
+            code=code if code is not None else str(station.get("code")),
+            brand=station.get("brand"),
+            name=station.get("name"),
+            address=station.get("address"),
+            latitude=_coord(location, "latitude"),
+            longitude=_coord(location, "longitude"),
+            distance=location.get("distance"),
+        )
+
+
+class PriceRecord(NamedTuple):
+    """One fuel price, pointing at its station rather than copying it."""
+
+    station: Station
+    fueltype: Optional[str]
+    price: Optional[float]
+    lastupdated: Optional[str]
+    distance: Optional[float]
+
+    @property
+    def stationcode(self) -> str:
+        return self.station.code
+
+    @property
+    def brand(self) -> Optional[str]:
+        return self.station.brand
+
+    @property
+    def latitude(self) -> Optional[float]:
+        return self.station.latitude
+
+    @property
+    def longitude(self) -> Optional[float]:
+        return self.station.longitude
+
+    def with_distance(self, distance: Optional[float]) -> PriceRecord:
+        return self._replace(distance=distance)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Flatten to the dict stored in coordinator data and shown as attributes."""
+        station = self.station
+        return {
+            "stationcode": station.code,
+            "fueltype": self.fueltype,
+            "price": self.price,
+            "lastupdated": self.lastupdated,
+            "brand": station.brand,
+            "name": station.name,
+            "address": station.address,
+            "distance": self.distance,
+            "latitude": station.latitude,
+            "longitude": station.longitude,
+        }
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Dict, List, Optional
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+
+from .const import ALIGN_WINDOW_FRACTION, MIN_ALIGN_WINDOW_MINUTES
+from .coordinator import ApiCallCounter
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_JITTER = timedelta(seconds=90)
+MIN_ALIGN_WINDOW = timedelta(minutes=MIN_ALIGN_WINDOW_MINUTES)
+
+
+class RefreshScheduler:
+    """Refresh one entry's coordinators on their configured intervals.
+
+    Coordinators that fall due within a shared window run in the same
+    batch so they reuse the access token and HTTP connection, and each
+    batch is delayed by a random jitter so entries do not fire together.
+    A coordinator with a zero interval is left to manual refreshes.
+
+    With a ``planner``, intervals are stretched to fit the daily quota and a
+    cycle the remaining quota cannot cover is skipped, keeping cached data.
+    ``cycle_prefix`` keeps cycle names apart when several entries share one
+    planner.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinators: Dict[str, DataUpdateCoordinator],
+        intervals: Dict[str, timedelta],
+        last_refreshed: Optional[Dict[str, datetime]] = None,
+        jitter: timedelta = DEFAULT_JITTER,
+        planner: Optional[ApiCallCounter] = None,
+        cycle_prefix: str = "",
+    ) -> None:
+        self.hass = hass
+        self._coordinators = coordinators
+        self._intervals = {
+            name: interval
+            for name, interval in intervals.items()
+            if name in coordinators and interval > timedelta(0)
+        }
+        self._last_refreshed: Dict[str, datetime] = dict(last_refreshed or {})
+        self._jitter = jitter
+        self._planner = planner
+        self._cycle_prefix = cycle_prefix
+        if planner is not None:
+            planner.set_schedule(
+                {self._cycle(name): interval for name, interval in self._intervals.items()},
+                {
+                    self._cycle(name): coordinator.estimated_cycle_cost
+                    for name, coordinator in coordinators.items()
+                    if hasattr(coordinator, "estimated_cycle_cost")
+                },
+            )
+        self._cancel_timer: Optional[CALLBACK_TYPE] = None
+        self._unsub_listeners: List[CALLBACK_TYPE] = []
+        self._running = False
+        self.next_run: Optional[datetime] = None
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        for name in self._intervals:
+            self._unsub_listeners.append(
+                self._coordinators[name].async_add_listener(partial(self._handle_update, name))
+            )
+        self._schedule_next()
+        return self.async_stop
+
+    @callback
+    def async_stop(self) -> None:
+        if self._cancel_timer is not None:
+            self._cancel_timer()
+            self._cancel_timer = None
+        while self._unsub_listeners:
+            self._unsub_listeners.pop()()
+        if self._planner is not None:
+            self._planner.clear_schedule(self._cycle(name) for name in self._intervals)
+        self.next_run = None
+
+    def _cycle(self, name: str) -> str:
+        return f"{self._cycle_prefix}{name}"
+
+    def interval(self, name: str) -> Optional[timedelta]:
+        interval = self._intervals.get(name)
+        if interval is None or self._planner is None:
+            return interval
+        return self._planner.planned_interval(self._cycle(name), interval)
+
+    def due_at(self, name: str) -> datetime:
+        last = self._last_refreshed.get(name)
+        if last is None:
+            return dt_util.utcnow()
+        return last + self.interval(name)
+
+    def _align_window(self) -> timedelta:
+        shortest = min(self._intervals.values())
+        return max(MIN_ALIGN_WINDOW, shortest * ALIGN_WINDOW_FRACTION)
+
+    @callback
+    def _schedule_next(self) -> None:
+        if self._cancel_timer is not None:
+            self._cancel_timer()
+            self._cancel_timer = None
+        self.next_run = None
+        if not self._intervals or self._running:
+            return
+        now = dt_util.utcnow()
+        due = min(self.due_at(name) for name in self._intervals)
+        delay = max(0.0, (due - now).total_seconds())
+        delay += random.uniform(0, self._jitter.total_seconds())
+        self.next_run = now + timedelta(seconds=delay)
+        self._cancel_timer = async_call_later(self.hass, delay, self._async_run_due)
+
+    async def _async_run_due(self, _now: datetime) -> None:
+        self._cancel_timer = None
+        horizon = dt_util.utcnow() + self._align_window()
+        due = [name for name in self._intervals if self.due_at(name) <= horizon]
+        self._running = True
+        try:
+            skipped = [name for name in due if not self._can_afford(name)]
+            for name in skipped:
+                _LOGGER.warning(
+                    "Skipping scheduled %s refresh: daily API quota nearly used; keeping cached data",
+                    name,
+                )
+                self._last_refreshed[name] = dt_util.utcnow()
+            due = [name for name in due if name not in skipped]
+            _LOGGER.debug("Scheduled refresh for %s", ", ".join(due))
+            results = await asyncio.gather(
+                *(self._async_refresh(name) for name in due),
+                return_exceptions=True,
+            )
+            for name, result in zip(due, results):
+                if isinstance(result, Exception):
+                    _LOGGER.error("Scheduled %s refresh failed: %s", name, result)
+                # Record failed attempts too so an outage waits a full interval
+                # instead of retrying in a tight loop.
+                self._last_refreshed[name] = dt_util.utcnow()
+        finally:
+            self._running = False
+            self._schedule_next()
+
+    def _can_afford(self, name: str) -> bool:
+        return self._planner is None or self._planner.can_afford(self._cycle(name))
+
+    async def _async_refresh(self, name: str) -> None:
+        refresh = self._coordinators[name].async_refresh
+        if self._planner is None:
+            await refresh()
+            return
+        await self._planner.async_measure_cycle(self._cycle(name), refresh)
+
+    @callback
+    def _handle_update(self, name: str) -> None:
+        coordinator = self._coordinators[name]
+        if not coordinator.last_update_success or getattr(coordinator, "partial_refresh", False):
+            return
+        self._last_refreshed[name] = dt_util.utcnow()
+        self._schedule_next()
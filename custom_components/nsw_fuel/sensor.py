@@ -9,10 +9,21 @@ from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import CONF_FAVOURITE_STATION_CODE, CONF_PERSON_ENTITIES, DOMAIN
+from .const import CONF_FAVOURITE_STATION_CODE, CONF_PERSON_ENTITIES, DOMAIN, RADIUS_LADDER_KM
 from .coordinator import ApiCallCounter, FavouriteStationCoordinator, NearbyCoordinator, _split_commas
 
 
+def _ladder_summary(record: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not record:
+        return None
+    return {
+        "price": _to_float(record.get("price")),
+        "fueltype": record.get("fueltype"),
+        "station_name": record.get("name"),
+        "distance": record.get("distance"),
+    }
+
+
 def _to_float(value: Any) -> Optional[float]:
     if value is None:
         return None
@@ -43,9 +54,9 @@ async def async_setup_entry(
             )
         )
 
-    if entry.data.get(CONF_FAVOURITE_STATION_CODE, ""):
-        entities.append(NswFuelFavouriteStationSensor(favourite_coordinator))
-    entities.append(NswFuelApiCallsSensor(api_calls))
+    for idx, code in enumerate(_split_commas(entry.data.get(CONF_FAVOURITE_STATION_CODE, ""))):
+        entities.append(NswFuelFavouriteStationSensor(favourite_coordinator, code, primary=idx == 0))
+    entities.append(NswFuelApiCallsSensor(api_calls, nearby_coordinator))
 
     async_add_entities(entities)
 
@@ -99,8 +110,12 @@ class NswFuelNearbySensor(CoordinatorEntity, SensorEntity, RestoreEntity):
                 "last_checked": None,
                 "last_changed": None,
             }
+            for rung in RADIUS_LADDER_KM:
+                attrs[f"cheapest_within_{rung}km"] = None
+            attrs["top_stations"] = None
             if self._key != "home":
                 attrs["distance_to_home_cheapest"] = None
+                attrs["detour_to_home_cheapest"] = None
             return attrs
         best = data.get("best") or {}
         attrs = {
@@ -113,8 +128,16 @@ class NswFuelNearbySensor(CoordinatorEntity, SensorEntity, RestoreEntity):
             "last_checked": data.get("last_checked"),
             "last_changed": best.get("lastupdated"),
         }
+        ladder = data.get("cheapest_within") or {}
+        for rung in RADIUS_LADDER_KM:
+            attrs[f"cheapest_within_{rung}km"] = _ladder_summary(ladder.get(str(rung)))
+        attrs["top_stations"] = {
+            group: [_ladder_summary(record) for record in records]
+            for group, records in (data.get("top_stations") or {}).items()
+        }
         if self._key != "home":
             attrs["distance_to_home_cheapest"] = data.get("distance_to_home_cheapest")
+            attrs["detour_to_home_cheapest"] = data.get("detour_to_home_cheapest")
         return attrs
 
 
@@ -125,10 +148,18 @@ class NswFuelFavouriteStationSensor(CoordinatorEntity, SensorEntity, RestoreEnti
     _attr_native_unit_of_measurement = "c/L"
     _attr_state_class = SensorStateClass.MEASUREMENT
 
-    def __init__(self, coordinator: FavouriteStationCoordinator) -> None:
+    def __init__(
+        self, coordinator: FavouriteStationCoordinator, station_code: str, primary: bool = True
+    ) -> None:
         super().__init__(coordinator)
-        self._attr_name = "Favourite Station Fuel"
-        self._attr_unique_id = f"{DOMAIN}_favourite_station"
+        self._station_code = station_code
+        # The first favourite keeps the ids it had before multiple stations.
+        if primary:
+            self._attr_name = "Favourite Station Fuel"
+            self._attr_unique_id = f"{DOMAIN}_favourite_station"
+        else:
+            self._attr_name = f"Favourite Station {station_code} Fuel"
+            self._attr_unique_id = f"{DOMAIN}_favourite_station_{station_code}"
         self._restored_native_value: Optional[float] = None
         self._restored_attrs: Dict[str, Any] = {}
 
@@ -142,9 +173,16 @@ class NswFuelFavouriteStationSensor(CoordinatorEntity, SensorEntity, RestoreEnti
         self._restored_native_value = _to_float(last_state.state)
         self._restored_attrs = dict(last_state.attributes)
 
+    def _station_data(self) -> Dict[str, Any]:
+        data = self.coordinator.data or {}
+        if "stations" not in data:
+            # Results stored before multiple favourites held a single station.
+            return data if data.get("station_code") == self._station_code else {}
+        return data["stations"].get(self._station_code) or {}
+
     @property
     def native_value(self) -> Optional[float]:
-        data = self.coordinator.data or {}
+        data = self._station_data()
         if not data:
             return self._restored_native_value
         best = data.get("best") or {}
@@ -152,12 +190,15 @@ class NswFuelFavouriteStationSensor(CoordinatorEntity, SensorEntity, RestoreEnti
 
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
-        data = self.coordinator.data or {}
+        data = self._station_data()
         if not data:
             if self._restored_attrs:
                 return self._restored_attrs
             return {
-                "station_code": None,
+                "station_code": self._station_code,
+                "station_name": None,
+                "brand": None,
+                "address": None,
                 "fueltype": None,
                 "last_checked": None,
                 "last_changed": None,
@@ -166,6 +207,9 @@ class NswFuelFavouriteStationSensor(CoordinatorEntity, SensorEntity, RestoreEnti
         best = data.get("best") or {}
         return {
             "station_code": data.get("station_code"),
+            "station_name": data.get("name"),
+            "brand": data.get("brand"),
+            "address": data.get("address"),
             "fueltype": best.get("fueltype"),
             "last_checked": data.get("last_checked"),
             "last_changed": best.get("lastupdated"),
@@ -179,8 +223,11 @@ class NswFuelApiCallsSensor(CoordinatorEntity, SensorEntity):
     _attr_icon = "mdi:counter"
     _attr_native_unit_of_measurement = "calls"
 
-    def __init__(self, coordinator: ApiCallCounter) -> None:
+    def __init__(
+        self, coordinator: ApiCallCounter, nearby: Optional[NearbyCoordinator] = None
+    ) -> None:
         super().__init__(coordinator)
+        self._nearby = nearby
         self._attr_name = "API Calls Used Today"
         self._attr_unique_id = f"{DOMAIN}_api_calls_today"
 
@@ -194,4 +241,8 @@ class NswFuelApiCallsSensor(CoordinatorEntity, SensorEntity):
         return {
             "date": data.get("date"),
             "last_reset": data.get("last_reset"),
+            "retries": data.get("retries", {}),
+            **self.coordinator.budget(),
+            "nearby_cache": self._nearby.response_cache.stats() if self._nearby else None,
+            "api_cache": self._nearby.api.cache_stats() if self._nearby else None,
         }
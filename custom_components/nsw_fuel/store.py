@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10
+
+
+class NswFuelStore:
+    """Persist the access token, daily API call count and last coordinator results for one entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[Dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}"
+        )
+        self._data: Dict[str, Any] = {}
+
+    async def async_load(self) -> None:
+        data = await self._store.async_load()
+        self._data = data if isinstance(data, dict) else {}
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+    @callback
+    def _schedule_save(self) -> None:
+        self._store.async_delay_save(lambda: self._data, STORAGE_SAVE_DELAY)
+
+    def token(self) -> Optional[Tuple[str, float]]:
+        stored = self._data.get("token") or {}
+        token = stored.get("access_token")
+        expiry = stored.get("expiry")
+        if not token or not isinstance(expiry, (int, float)):
+            return None
+        if time.time() >= expiry:
+            return None
+        return token, float(expiry)
+
+    @callback
+    def async_set_token(self, token: str, expiry: Optional[float]) -> None:
+        if expiry is None:
+            # Without an expiry we cannot tell when a restored token goes stale.
+            self._data.pop("token", None)
+        else:
+            self._data["token"] = {"access_token": token, "expiry": expiry}
+        self._schedule_save()
+
+    def api_calls(self) -> Optional[Dict[str, Any]]:
+        stored = self._data.get("api_calls")
+        return dict(stored) if isinstance(stored, dict) else None
+
+    @callback
+    def async_set_api_calls(self, data: Optional[Dict[str, Any]]) -> None:
+        if not data:
+            return
+        self._data["api_calls"] = {
+            "date": data.get("date"),
+            "count": data.get("count", 0),
+            "last_reset": data.get("last_reset"),
+            "retries": dict(data.get("retries") or {}),
+        }
+        self._schedule_save()
+
+    def coordinator_saved_at(self, name: str) -> Optional[datetime]:
+        stored = (self._data.get("coordinators") or {}).get(name) or {}
+        return dt_util.parse_datetime(str(stored.get("saved_at") or ""))
+
+    def coordinator_data(self, name: str, max_age: timedelta) -> Optional[Dict[str, Any]]:
+        stored = (self._data.get("coordinators") or {}).get(name) or {}
+        saved_at = self.coordinator_saved_at(name)
+        data = stored.get("data")
+        if saved_at is None or not data:
+            return None
+        age = dt_util.utcnow() - saved_at
+        if age > max_age:
+            _LOGGER.debug("Stored %s data is stale (age=%s, max_age=%s)", name, age, max_age)
+            return None
+        return data
+
+    @callback
+    def async_set_coordinator_data(self, name: str, data: Optional[Dict[str, Any]]) -> None:
+        if not data:
+            return
+        coordinators = self._data.setdefault("coordinators", {})
+        coordinators[name] = {"saved_at": dt_util.utcnow().isoformat(), "data": data}
+        self._schedule_save()
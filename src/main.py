@@ -5,7 +5,7 @@ import os
 from dotenv import load_dotenv
 
 from nsw_fuel_client import NswFuelClient
-from parser import filter_cheapest_fuels, join_station_prices
+from parser import filter_cheapest_fuels, join_station_prices, stream_station_prices
 
 
 def main() -> None:
@@ -37,18 +37,31 @@ def main() -> None:
         print(f"Station {station_code} prices: {len(joined)}")
         for item in joined:
             print(
-                f"{item.get('price')} {item.get('fueltype')} | {item.get('lastupdated')}"
+                f"{item.price} {item.fueltype} | {item.lastupdated}"
             )
         return
 
-    if not namedlocation or not latitude or not longitude:
-        raise SystemExit("Missing NSW_FUEL_API_NAMEDLOCATION or NSW_FUEL_API_LAT/LON.")
-
     preferred = os.environ.get("NSW_FUEL_API_PREFERRED_FUELS", "E10|U91|P95|P98")
     preferred_list = [f for f in preferred.split("|") if f]
     limit = int(os.environ.get("NSW_FUEL_API_RESULTS_LIMIT", "10"))
     query_fuels = preferred_list if preferred_list else [fueltype]
 
+    states = os.environ.get("NSW_FUEL_API_STATES", "")
+    if states:
+        # Statewide payloads are large; join records while the body streams in.
+        records = stream_station_prices(client.iter_prices_v2_chunks(states), query_fuels)
+        cheapest = filter_cheapest_fuels(records, query_fuels, limit=limit)
+        print(f"Cheapest {len(cheapest)} prices in {states}.")
+        for item in cheapest:
+            print(
+                f"{item.price} {item.fueltype} | {item.brand} | "
+                f"{item.name} | {item.address} | {item.lastupdated}"
+            )
+        return
+
+    if not namedlocation or not latitude or not longitude:
+        raise SystemExit("Missing NSW_FUEL_API_NAMEDLOCATION or NSW_FUEL_API_LAT/LON.")
+
     merged_payload = {"stations": [], "prices": []}
     seen_station_codes: set[str] = set()
 
@@ -77,8 +90,8 @@ def main() -> None:
     print(f"Retrieved {len(joined)} prices; showing {len(cheapest)} cheapest.")
     for item in cheapest:
         print(
-            f"{item.get('price')} {item.get('fueltype')} | {item.get('brand')} | "
-            f"{item.get('name')} | {item.get('address')} | {item.get('lastupdated')}"
+            f"{item.price} {item.fueltype} | {item.brand} | "
+            f"{item.name} | {item.address} | {item.lastupdated}"
         )
 
 
@@ -5,7 +5,7 @@ import time
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 import requests
 
@@ -81,6 +81,18 @@ class NswFuelClient:
         response.raise_for_status()
         return response.json()
 
+    def iter_prices_v2_chunks(
+        self, states: Optional[str] = None, chunk_size: int = 64 * 1024
+    ) -> Iterator[bytes]:
+        """Stream the all-prices body for ``parser.stream_station_prices``."""
+        url = f"{self.base_url.rstrip('/')}/FuelPriceCheck/v2/fuel/prices"
+        params = {"states": states} if states else None
+        with requests.get(
+            url, headers=self._headers(), params=params, timeout=30, stream=True
+        ) as response:
+            response.raise_for_status()
+            yield from response.iter_content(chunk_size=chunk_size)
+
     def get_reference_data_v1(self) -> Dict[str, Any]:
         url = f"{self.base_url.rstrip('/')}/FuelCheckRefData/v1/fuel/lovs"
         response = requests.get(url, headers=self._headers(), timeout=30)
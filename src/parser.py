@@ -1,6 +1,209 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional
+import codecs
+import heapq
+import json
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+Chunk = Union[bytes, str]
+
+# Drop consumed text from the stream buffer once this much has piled up.
+_COMPACT_AFTER = 64 * 1024
+_WHITESPACE = " \t\n\r"
+_DECODER = json.JSONDecoder()
+
+
+class _Buffer:
+    """Text from a chunked JSON body, read left to right."""
+
+    def __init__(self, chunks: Iterable[Chunk]) -> None:
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.exhausted = False
+
+    def fill(self) -> bool:
+        """Append the next chunk; returns False once the body is used up."""
+        if self.exhausted:
+            return False
+        if self.pos > _COMPACT_AFTER:
+            self.text = self.text[self.pos:]
+            self.pos = 0
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                self.text += text
+                return True
+        self.text += self._utf8.decode(b"", final=True)
+        self.exhausted = True
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON body")
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode one complete JSON value, reading more chunks until it is whole."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number ending at the buffer edge may continue in the next chunk.
+            if end == len(self.text) and not self.exhausted:
+                self.fill()
+                continue
+            self.pos = end
+            return value
+
+
+def iter_payload_items(
+    chunks: Iterable[Chunk], arrays: Tuple[str, ...] = ("stations", "prices")
+) -> Iterator[Tuple[str, Any]]:
+    """Yield ``(key, item)`` for each element of the named top-level arrays.
+
+    The body is read chunk by chunk and each array element is decoded as
+    soon as it is complete, so the whole payload is never held at once.
+    Other top-level values are decoded and skipped.
+    """
+    buffer = _Buffer(chunks)
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        return
+    while True:
+        key = buffer.value()
+        buffer.expect(":")
+        if key in arrays and buffer.peek() == "[":
+            buffer.expect("[")
+            if buffer.peek() != "]":
+                while True:
+                    yield key, buffer.value()
+                    if buffer.peek() != ",":
+                        break
+                    buffer.expect(",")
+            buffer.expect("]")
+        else:
+            buffer.value()
+        if buffer.peek() != ",":
+            break
+        buffer.expect(",")
+    buffer.expect("}")
+
+
+# The CLI keeps its own record types instead of sharing
+# custom_components/nsw_fuel/records.py: it runs without Home Assistant,
+# which importing that package would load, and it prints stations as the
+# API sent them (raw location, AdBlue flag) rather than the parsed
+# coordinates and query distance the integration ranks by.
+
+
+class CliStation(NamedTuple):
+    """Station metadata as printed by the CLI, shared by its price records."""
+
+    code: str
+    brand: Optional[str] = None
+    name: Optional[str] = None
+    address: Optional[str] = None
+    location: Optional[Dict[str, Any]] = None
+    isAdBlueAvailable: Optional[bool] = None
+
+    @classmethod
+    def from_payload(cls, station: Dict[str, Any]) -> CliStation:
+        return cls(
+            code=str(station.get("code")),
+            brand=station.get("brand"),
+            name=station.get("name"),
+            address=station.get("address"),
+            location=station.get("location"),
+            isAdBlueAvailable=station.get("isAdBlueAvailable"),
+        )
+
+
+class JoinedPrice(NamedTuple):
+    """A price joined with its ``CliStation``."""
+
+    station: CliStation
+    fueltype: Optional[str]
+    price: Optional[float]
+    lastupdated: Optional[str]
+
+    @property
+    def stationcode(self) -> str:
+        return self.station.code
+
+    @property
+    def brand(self) -> Optional[str]:
+        return self.station.brand
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.station.name
+
+    @property
+    def address(self) -> Optional[str]:
+        return self.station.address
+
+
+def _joined(price: Dict[str, Any], stations: Dict[str, CliStation]) -> JoinedPrice:
+    code = str(price.get("stationcode"))
+    station = stations.get(code)
+    if station is None:
+        # Unknown codes still share one placeholder per code.
+        station = stations[code] = CliStation(code)
+    return JoinedPrice(station, price.get("fueltype"), price.get("price"), price.get("lastupdated"))
+
+
+def iter_station_prices(
+    items: Iterable[Tuple[str, Any]], fueltypes: Optional[Iterable[str]] = None
+) -> Iterator[JoinedPrice]:
+    """Join streamed ``(key, item)`` pairs into price records as they arrive.
+
+    Stations are kept by code (they are small next to the prices). Prices
+    that arrive after the stations are yielded straight away; any seen
+    earlier wait until the stations are in. With ``fueltypes``, other fuels
+    are dropped before a record is built.
+    """
+    wanted = {f.strip() for f in fueltypes if f.strip()} if fueltypes is not None else None
+    stations: Dict[str, CliStation] = {}
+    early: List[Dict[str, Any]] = []
+    for key, item in items:
+        if key == "stations":
+            station = CliStation.from_payload(item)
+            stations[station.code] = station
+            continue
+        if key != "prices" or (wanted is not None and item.get("fueltype") not in wanted):
+            continue
+        if not stations:
+            early.append(item)
+            continue
+        for price in early:
+            yield _joined(price, stations)
+        early.clear()
+        yield _joined(item, stations)
+    for price in early:
+        yield _joined(price, stations)
+
+
+def stream_station_prices(
+    chunks: Iterable[Chunk], fueltypes: Optional[Iterable[str]] = None
+) -> Iterator[JoinedPrice]:
+    """Parse a chunked prices body and yield joined records incrementally."""
+    return iter_station_prices(iter_payload_items(chunks), fueltypes)
 
 
 def parse_prices(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -9,37 +212,25 @@ def parse_prices(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
     return list(items)
 
 
-def join_station_prices(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+def join_station_prices(payload: Dict[str, Any]) -> List[JoinedPrice]:
     """Join prices with station metadata for easier display."""
-    stations = {str(s.get("code")): s for s in payload.get("stations", [])}
-    joined: List[Dict[str, Any]] = []
-    for price in payload.get("prices", []):
-        code = str(price.get("stationcode"))
-        station = stations.get(code, {})
-        joined.append(
-            {
-                "stationcode": code,
-                "fueltype": price.get("fueltype"),
-                "price": price.get("price"),
-                "lastupdated": price.get("lastupdated"),
-                "brand": station.get("brand"),
-                "name": station.get("name"),
-                "address": station.get("address"),
-                "location": station.get("location"),
-                "isAdBlueAvailable": station.get("isAdBlueAvailable"),
-            }
-        )
-    return joined
+    items = [("stations", s) for s in payload.get("stations", [])]
+    items.extend(("prices", p) for p in payload.get("prices", []))
+    return list(iter_station_prices(items))
+
+
+def _price_order(record: JoinedPrice) -> Tuple[bool, Optional[float]]:
+    return record.price is None, record.price
 
 
 def filter_cheapest_fuels(
-    records: Iterable[Dict[str, Any]],
+    records: Iterable[JoinedPrice],
     fueltypes: Iterable[str],
     limit: Optional[int] = None,
-) -> List[Dict[str, Any]]:
+) -> List[JoinedPrice]:
     wanted = {f.strip() for f in fueltypes if f.strip()}
-    filtered = [r for r in records if r.get("fueltype") in wanted]
-    filtered.sort(key=lambda r: (r.get("price") is None, r.get("price")))
+    filtered = (r for r in records if r.fueltype in wanted)
     if limit is not None:
-        return filtered[: max(limit, 0)]
-    return filtered
+        # A bounded heap keeps only ``limit`` records instead of sorting them all.
+        return heapq.nsmallest(max(limit, 0), filtered, key=_price_order)
+    return sorted(filtered, key=_price_order)
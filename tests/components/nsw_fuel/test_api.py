@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import pytest
+pytest.importorskip("homeassistant")
+
+from aiohttp import ClientConnectionError
+
+from custom_components.nsw_fuel import api as api_module
+from custom_components.nsw_fuel.api import (
+    RETRY_NETWORK,
+    RETRY_RATE_LIMITED,
+    RETRY_SERVER_ERROR,
+    RETRY_UNAUTHORIZED,
+    TOKEN_RENEW_BEFORE_SECONDS,
+    NswFuelApi,
+    NswFuelApiError,
+    NswFuelCircuitOpenError,
+)
+from custom_components.nsw_fuel.breaker import STATE_OPEN, CircuitBreaker
+
+
+class _FakeResponse:
+    def __init__(self, status: int, payload: object, headers: dict | None = None) -> None:
+        self.status = status
+        self.headers = headers or {}
+        self._body = json.dumps(payload)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_exc):
+        return False
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise RuntimeError(self.status)
+
+    async def json(self, content_type=None):
+        del content_type
+        return json.loads(self._body)
+
+    async def text(self) -> str:
+        return self._body
+
+    async def read(self) -> bytes:
+        return self._body.encode("utf-8")
+
+
+class _FakeSession:
+    def __init__(self, expires_in: int = 3600, token_delay: float = 0.01) -> None:
+        self.expires_in = expires_in
+        self.token_delay = token_delay
+        self.token_calls = 0
+        self.data_calls = 0
+
+    def get(self, url, **_kwargs):
+        if url.endswith("/accesstoken"):
+            self.token_calls += 1
+            return self._token_response(self.token_calls)
+        self.data_calls += 1
+        return _FakeResponse(200, {"prices": []})
+
+    def _token_response(self, number: int):
+        session = self
+
+        class _Delayed(_FakeResponse):
+            async def __aenter__(self):
+                await asyncio.sleep(session.token_delay)
+                return self
+
+        return _Delayed(200, {"access_token": f"token-{number}", "expires_in": self.expires_in})
+
+
+class _ScriptedSession(_FakeSession):
+    """Answers data requests from a script of statuses, headers or errors."""
+
+    def __init__(self, script: list) -> None:
+        super().__init__(token_delay=0)
+        self.script = list(script)
+        self.timeouts: list[float] = []
+        self.request_headers: list[dict] = []
+
+    def get(self, url, **kwargs):
+        if url.endswith("/accesstoken"):
+            return super().get(url, **kwargs)
+        self.data_calls += 1
+        self.timeouts.append(kwargs["timeout"].total)
+        step = self.script.pop(0) if self.script else 200
+        if isinstance(step, Exception):
+            raise step
+        status, headers = step if isinstance(step, tuple) else (step, None)
+        self.request_headers.append(kwargs["headers"])
+        return _FakeResponse(status, {"prices": []}, headers)
+
+
+def _api(session: _FakeSession, **kwargs) -> NswFuelApi:
+    return NswFuelApi(
+        session=session,
+        base_url="https://example.test",
+        api_key="key",
+        api_secret="secret",
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_token_fetch():
+    session = _FakeSession()
+    api = _api(session)
+
+    tokens = await asyncio.gather(*(api._get_access_token() for _ in range(5)))
+
+    assert session.token_calls == 1
+    assert set(tokens) == {"token-1"}
+    api.close()
+
+
+@pytest.mark.asyncio
+async def test_token_near_expiry_is_renewed_in_background():
+    session = _FakeSession()
+    api = _api(session)
+    await api._get_access_token()
+    api._token_expiry = time.time() + TOKEN_RENEW_BEFORE_SECONDS - 1
+
+    token = await api._get_access_token()
+    assert token == "token-1"
+
+    await asyncio.sleep(session.token_delay * 3)
+    assert await api._get_access_token() == "token-2"
+    assert session.token_calls == 2
+    api.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_token_is_not_renewed_by_timer():
+    session = _FakeSession(expires_in=TOKEN_RENEW_BEFORE_SECONDS + 30, token_delay=0)
+    api = _api(session)
+    await api._refresh_token()
+    api._token_expiry = time.time() + 1
+    api._schedule_token_renewal()
+
+    await asyncio.sleep(0.05)
+
+    assert session.token_calls == 1
+    api.close()
+
+
+@pytest.mark.asyncio
+async def test_short_lived_token_renews_at_half_its_lifetime():
+    session = _FakeSession(expires_in=90, token_delay=0)
+    api = _api(session)
+
+    for _ in range(3):
+        assert await api._get_access_token() == "token-1"
+    await asyncio.sleep(0.01)
+    assert session.token_calls == 1
+    assert api._renew_margin() == 30
+
+    api._token_expiry = time.time() + 29
+    await api._get_access_token()
+    await asyncio.sleep(0.01)
+    assert session.token_calls == 2
+    api.close()
+
+
+@pytest.mark.asyncio
+async def test_identical_in_flight_requests_are_coalesced():
+    session = _FakeSession(token_delay=0.01)
+    api = _api(session)
+
+    results = await asyncio.gather(
+        api.get_station_prices("100"),
+        api.get_station_prices("100"),
+        api.get_station_prices("200"),
+    )
+
+    assert session.data_calls == 2
+    assert results[0] is results[1]
+    await api.get_station_prices("100")
+    assert session.data_calls == 3
+    api.close()
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(api_module, "RETRY_BACKOFF_BASE_SECONDS", 0)
+
+
+@pytest.mark.asyncio
+async def test_server_and_network_errors_are_retried(no_backoff):
+    session = _ScriptedSession([503, ClientConnectionError("reset"), 200])
+    retries: list[str] = []
+    calls: list[int] = []
+
+    async def _count(amount):
+        calls.append(amount)
+
+    api = _api(session, on_retry=retries.append, on_api_call=_count)
+
+    assert await api.get_station_prices("100") == {"prices": []}
+    assert session.data_calls == 3
+    assert retries == [RETRY_SERVER_ERROR, RETRY_NETWORK]
+    assert len(calls) == 4  # token + three attempts
+    api.close()
+
+
+@pytest.mark.asyncio
+async def test_server_errors_give_up_after_max_retries(no_backoff):
+    session = _ScriptedSession([500] * 10)
+    api = _api(session)
+
+    with pytest.raises(NswFuelApiError) as err:
+        await api.get_station_prices("100")
+
+    assert err.value.status == 500
+    assert session.data_calls == api_module.MAX_RETRIES + 1
+    api.close()
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_honours_retry_after(monkeypatch):
+    waits: list[float] = []
+    real_sleep = asyncio.sleep
+
+    async def _sleep(delay):
+        waits.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(api_module.asyncio, "sleep", _sleep)
+    session = _ScriptedSession([(429, {"Retry-After": "7"}), 200])
+    retries: list[str] = []
+    api = _api(session, on_retry=retries.append)
+
+    await api.get_station_prices("100")
+
+    assert [wait for wait in waits if wait] == [7.0]
+    assert retries == [RETRY_RATE_LIMITED]
+    api.close()
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_with_long_retry_after_fails_fast():
+    session = _ScriptedSession([(429, {"Retry-After": "3600"})])
+    api = _api(session)
+
+    with pytest.raises(NswFuelApiError):
+        await api.get_station_prices("100")
+
+    assert session.data_calls == 1
+    api.close()
+
+
+@pytest.mark.asyncio
+async def test_rejected_token_is_refetched_once():
+    session = _ScriptedSession([401, 200, 401, 401])
+    retries: list[str] = []
+    api = _api(session, on_retry=retries.append)
+
+    await api.get_station_prices("100")
+    assert session.token_calls == 2
+    assert retries == [RETRY_UNAUTHORIZED]
+
+    with pytest.raises(NswFuelApiError):
+        await api.get_station_prices("200")
+    assert session.token_calls == 3
+    api.close()
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    session = _ScriptedSession([404])
+    api = _api(session)
+
+    with pytest.raises(NswFuelApiError):
+        await api.get_station_prices("100")
+
+    assert session.data_calls == 1
+    api.close()
+
+
+@pytest.mark.asyncio
+async def test_requests_use_per_endpoint_timeouts():
+    session = _ScriptedSession([])
+    api = _api(session, timeouts={"station": 5, "all_prices": 90})
+
+    await api.get_station_prices("100")
+    await api.get_all_prices()
+
+    assert session.timeouts == [5, 90]
+    api.close()
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_serves_last_good_response_without_calls(no_backoff):
+    session = _ScriptedSession([200, 503, 503, 503, 503])
+    breaker = CircuitBreaker(failure_threshold=1, cool_down_seconds=600)
+    api = _api(session, breaker=breaker)
+
+    first = await api.get_station_prices("100")
+    with pytest.raises(NswFuelApiError):
+        await api.get_all_prices()
+    assert breaker.state == STATE_OPEN
+    calls_before = session.data_calls
+
+    assert await api.get_station_prices("100") == first
+    with pytest.raises(NswFuelCircuitOpenError):
+        await api.get_station_prices("200")
+    assert session.data_calls == calls_before
+    api.close()
+
+
+@pytest.mark.asyncio
+async def test_statewide_payload_is_not_kept_as_a_last_good_response(no_backoff):
+    session = _ScriptedSession([200, 200, 503, 503, 503, 503])
+    breaker = CircuitBreaker(failure_threshold=1, cool_down_seconds=600)
+    api = _api(session, breaker=breaker, last_good_entries=1)
+
+    await api.get_station_prices("100")
+    await api.get_all_prices()
+    with pytest.raises(NswFuelApiError):
+        await api.get_station_prices("200")
+
+    assert await api.get_station_prices("100")
+    with pytest.raises(NswFuelCircuitOpenError):
+        await api.get_all_prices()
+    api.close()
+
+
+@pytest.mark.asyncio
+async def test_fresh_cached_responses_skip_the_network():
+    session = _ScriptedSession([])
+    api = _api(session, cache_ttls={"station": (600, 1800)})
+
+    first = await api.get_station_prices("100")
+    assert await api.get_station_prices("100") is first
+    assert session.data_calls == 1
+    assert api.cache_stats()["station"]["hits"] == 1
+    api.close()
+
+
+@pytest.mark.asyncio
+async def test_is_fresh_reports_cached_answers_without_counting_lookups():
+    session = _ScriptedSession([])
+    api = _api(session, cache_ttls={"all_prices": (600, 1800), "station": (0, 1800)})
+
+    assert not api.is_fresh("all_prices", "all_prices")
+    await api.get_all_prices()
+    await api.get_station_prices("100")
+
+    assert api.is_fresh("all_prices", "all_prices")
+    assert not api.is_fresh("station", ("station", "100"))
+    assert not api.is_fresh("nearby", "anything")
+    assert api.cache_stats()["all_prices"]["hits"] == 0
+    api.close()
+
+
+@pytest.mark.asyncio
+async def test_forced_request_skips_the_cache_and_replaces_it():
+    session = _ScriptedSession([])
+    api = _api(session, cache_ttls={"station": (600, 1800)})
+
+    first = await api.get_station_prices("100")
+    forced = await api.get_station_prices("100", force=True)
+
+    assert forced is not first
+    assert session.data_calls == 2
+    assert await api.get_station_prices("100") is forced
+    api.close()
+
+
+@pytest.mark.asyncio
+async def test_stale_cached_response_is_served_and_revalidated_once():
+    session = _ScriptedSession([])
+    api = _api(session, cache_ttls={"station": (0, 1800)})
+    first = await api.get_station_prices("100")
+
+    stale = await asyncio.gather(api.get_station_prices("100"), api.get_station_prices("100"))
+    assert stale == [first, first]
+
+    await asyncio.sleep(0.01)
+    assert session.data_calls == 2
+    assert await api.get_station_prices("100") is not first
+    api.close()
+
+
+@pytest.mark.asyncio
+async def test_reference_data_is_requested_conditionally():
+    session = _ScriptedSession([200, 304])
+    api = _api(session)
+
+    assert await api.get_reference_data() == {"prices": []}
+    assert "if-modified-since" not in session.request_headers[0]
+
+    assert await api.get_reference_data("01/01/2026 01:00:00 AM") is None
+    assert session.request_headers[1]["if-modified-since"] == "01/01/2026 01:00:00 AM"
+    api.close()
+
+
+@pytest.mark.asyncio
+async def test_responses_decode_from_bytes_without_orjson(monkeypatch):
+    monkeypatch.setattr(api_module, "json_loads", json.loads)
+    session = _ScriptedSession([])
+    api = _api(session)
+
+    assert await api.get_station_prices("100") == {"prices": []}
+    assert await api._get_access_token() == "token-1"
+    api.close()
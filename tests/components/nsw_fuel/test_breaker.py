@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+pytest.importorskip("homeassistant")
+
+from custom_components.nsw_fuel.breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_after_consecutive_failures_and_cools_down():
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=2, cool_down_seconds=60, clock=clock)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in() == 60
+
+    clock.now = 60
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # one trial at a time
+
+
+def test_breaker_trial_outcome_closes_or_reopens():
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=1, cool_down_seconds=60, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 60
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert breaker.retry_in() == 60
+
+    clock.now = 120
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
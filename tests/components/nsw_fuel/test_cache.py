@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import pytest
+pytest.importorskip("homeassistant")
+
+from custom_components.nsw_fuel.cache import ResponseCache, snap_coordinates
+
+
+def test_response_cache_expires_and_evicts_least_recently_used():
+    now = [0.0]
+    cache: ResponseCache[str, int] = ResponseCache(ttl_seconds=60, max_entries=2, clock=lambda: now[0])
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    now[0] = 61
+    assert cache.get("c") is None
+    assert cache.stats() == {
+        "hits": 2,
+        "misses": 2,
+        "hit_rate": 0.5,
+        "entries": 1,
+        "evictions": 1,
+    }
+
+
+def test_snap_coordinates_groups_points_in_the_same_cell():
+    assert snap_coordinates(-33.80001, 151.0, 1.0) == snap_coordinates(-33.8003, 151.0003, 1.0)
+    assert snap_coordinates(-33.8, 151.0, 1.0) != snap_coordinates(-33.82, 151.0, 1.0)
+    assert snap_coordinates(-33.8, 151.0, 0) == ("-33.800000", "151.000000")
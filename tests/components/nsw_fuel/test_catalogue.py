@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import pytest
+pytest.importorskip("homeassistant")
+
+from custom_components.nsw_fuel.catalogue import (
+    STORAGE_KEY,
+    StationCatalogue,
+    async_get_catalogue,
+)
+
+LOVS = {
+    "brands": {"items": [{"name": "Caltex"}, {"name": "Ampol"}]},
+    "fueltypes": {"items": [{"code": "E10", "name": "Ethanol 94"}, {"code": "U91"}]},
+    "stations": {
+        "items": [
+            {
+                "code": 100,
+                "brand": "Ampol",
+                "name": "Ampol Example",
+                "address": "1 Example St",
+                "location": {"latitude": -32.9, "longitude": 151.66},
+            }
+        ]
+    },
+}
+
+
+class _RefApi:
+    def __init__(self, payloads: list) -> None:
+        self.payloads = list(payloads)
+        self.calls: list[str | None] = []
+
+    async def get_reference_data(self, if_modified_since=None):
+        self.calls.append(if_modified_since)
+        return self.payloads.pop(0)
+
+
+@pytest.mark.asyncio
+async def test_catalogue_refresh_parses_lovs_then_sends_if_modified_since(hass):
+    catalogue = StationCatalogue(hass)
+    api = _RefApi([LOVS, None])
+
+    assert await catalogue.async_refresh(api)
+    assert api.calls == [None]
+    assert catalogue.station(100)["name"] == "Ampol Example"
+    assert catalogue.brands == ["Ampol", "Caltex"]
+    assert catalogue.fuel_types == {"E10": "Ethanol 94", "U91": "U91"}
+    assert "location" in catalogue.station("100")
+    assert not catalogue.due()
+
+    assert not await catalogue.async_refresh(api)
+    assert api.calls[1] == catalogue.modified_since
+    assert catalogue.station("100") is not None
+
+
+@pytest.mark.asyncio
+async def test_catalogue_is_loaded_from_storage_and_shared(hass, hass_storage):
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": {
+            "stations": {"100": {"code": "100", "name": "Stored"}},
+            "brands": ["Ampol"],
+            "fuel_types": {"E10": "Ethanol 94"},
+            "modified_since": "01/01/2026 01:00:00 AM",
+            "checked_at": "2026-01-01T01:00:00+00:00",
+        },
+    }
+
+    catalogue = await async_get_catalogue(hass)
+
+    assert catalogue is await async_get_catalogue(hass)
+    assert catalogue.station("100")["name"] == "Stored"
+    assert catalogue.modified_since == "01/01/2026 01:00:00 AM"
+    assert catalogue.due()
+
+
+@pytest.mark.asyncio
+async def test_failed_catalogue_refresh_keeps_existing_data(hass):
+    catalogue = StationCatalogue(hass)
+    await catalogue.async_refresh(_RefApi([LOVS]))
+
+    class _Failing:
+        async def get_reference_data(self, if_modified_since=None):
+            raise RuntimeError("down")
+
+    catalogue.checked_at = None
+    await catalogue.async_refresh_if_due(_Failing())
+
+    assert catalogue.station("100") is not None
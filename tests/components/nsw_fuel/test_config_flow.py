@@ -13,6 +13,7 @@ from custom_components.nsw_fuel.const import (
     CONF_API_KEY,
     CONF_API_SECRET,
     CONF_BRANDS,
+    CONF_EXCLUDED_BRANDS,
     CONF_FAVOURITE_STATION_CODE,
     CONF_HOME_LAT,
     CONF_HOME_LON,
@@ -22,6 +23,7 @@ from custom_components.nsw_fuel.const import (
     CONF_RADIUS_KM,
     DOMAIN,
 )
+from custom_components.nsw_fuel.catalogue import DATA_CATALOGUE, StationCatalogue
 
 
 async def _create_entry(hass):
@@ -165,3 +167,51 @@ async def test_reconfigure_updates_values_and_preserves_name(hass, monkeypatch):
     assert updated_entry.data[CONF_API_SECRET] == "new-secret"
     assert updated_entry.data[CONF_PREFERRED_FUELS] == "P95|P98"
     assert updated_entry.data[CONF_PERSON_ENTITIES] == "person.alice,sensor.phone_loc"
+
+
+@pytest.mark.asyncio
+async def test_location_step_offers_catalogue_lists(hass):
+    catalogue = StationCatalogue(hass)
+    catalogue.stations = {"100": {"code": "100", "name": "Ampol Example"}}
+    catalogue.brands = ["Ampol", "Caltex"]
+    catalogue.fuel_types = {"E10": "Ethanol 94", "LPG": "LPG"}
+    hass.data[DATA_CATALOGUE] = catalogue
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN,
+        context={"source": config_entries.SOURCE_USER},
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {
+            CONF_NAME: "NSW Fuel",
+            CONF_API_KEY: "test-key",
+            CONF_API_SECRET: "test-secret",
+        },
+    )
+    schema = {str(key): value for key, value in result["data_schema"].schema.items()}
+    fuel_options = schema[CONF_PREFERRED_FUELS].config["options"]
+    assert {option["value"] for option in fuel_options} >= {"E10", "LPG", "U91"}
+    assert schema[CONF_BRANDS].config["options"] == ["Ampol", "Caltex"]
+    assert schema[CONF_FAVOURITE_STATION_CODE].config["options"] == [
+        {"value": "100", "label": "Ampol Example (100)"}
+    ]
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {
+            CONF_HOME_NAMEDLOCATION: "2287",
+            CONF_HOME_LAT: "-32.8928",
+            CONF_HOME_LON: "151.6620",
+            CONF_BRANDS: ["Ampol", "Caltex"],
+            CONF_EXCLUDED_BRANDS: [],
+            CONF_PREFERRED_FUELS: ["LPG"],
+            CONF_FAVOURITE_STATION_CODE: ["100", "200"],
+        },
+    )
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_BRANDS] == "Ampol|Caltex"
+    assert result["data"][CONF_EXCLUDED_BRANDS] == ""
+    assert result["data"][CONF_PREFERRED_FUELS] == "LPG"
+    assert result["data"][CONF_FAVOURITE_STATION_CODE] == "100,200"
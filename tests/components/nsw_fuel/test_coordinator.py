@@ -1,18 +1,41 @@
 from __future__ import annotations
 
+import asyncio
+from datetime import timedelta
 from types import SimpleNamespace
 
 import pytest
 pytest.importorskip("homeassistant")
 
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
 from custom_components.nsw_fuel.const import (
+    CONF_BRANDS,
+    CONF_EXCLUDED_BRANDS,
+    CONF_FAVOURITE_STATION_CODE,
+    CONF_FETCH_MODE,
+    CONF_FETCH_RADIUS_KM,
     CONF_HOME_LAT,
     CONF_HOME_LON,
     CONF_HOME_NAMEDLOCATION,
+    CONF_LOCAL_BRAND_FILTER,
+    CONF_MERGE_NEARBY_QUERIES,
+    CONF_NEARBY_CACHE_GRID_KM,
+    CONF_NEARBY_CACHE_TTL_MINUTES,
+    CONF_NEARBY_MAX_CONCURRENCY,
+    CONF_NEARBY_RESULT_TTL_MINUTES,
+    CONF_PERSON_DEBOUNCE_SECONDS,
     CONF_PERSON_ENTITIES,
     CONF_PREFERRED_FUELS,
+    CONF_RADIUS_KM,
+    FETCH_MODE_SNAPSHOT,
 )
-from custom_components.nsw_fuel.coordinator import NearbyCoordinator
+from custom_components.nsw_fuel.cache import KM_PER_DEG_LAT, snap_coordinates
+from custom_components.nsw_fuel.catalogue import StationCatalogue
+from custom_components.nsw_fuel.coordinator import FavouriteStationCoordinator, NearbyCoordinator
+from custom_components.nsw_fuel.scheduler import RefreshScheduler
 
 
 class _FakeApi:
@@ -36,6 +59,45 @@ class _FakeApi:
         }
 
 
+class _FakeSnapshotApi:
+    def __init__(self) -> None:
+        self.all_price_calls = 0
+        self.nearby_calls = 0
+        self.forced: list[bool] = []
+
+    async def get_prices_nearby(self, **_kwargs):
+        self.nearby_calls += 1
+        return {"stations": [], "prices": []}
+
+    async def get_all_prices(self, force=False):
+        self.all_price_calls += 1
+        self.forced.append(force)
+        return {
+            "stations": [
+                {
+                    "code": "100",
+                    "brand": "Near Brand",
+                    "name": "Near Station",
+                    "address": "1 Near Street",
+                    "location": {"latitude": -32.90, "longitude": 151.66},
+                },
+                {
+                    "code": "200",
+                    "brand": "Far Brand",
+                    "name": "Far Station",
+                    "address": "1 Far Street",
+                    "location": {"latitude": -33.87, "longitude": 151.21},
+                },
+            ],
+            "prices": [
+                {"stationcode": "100", "fueltype": "E10", "price": 175.9},
+                {"stationcode": "100", "fueltype": "U91", "price": 179.9},
+                {"stationcode": "200", "fueltype": "E10", "price": 150.0},
+                {"stationcode": "200", "fueltype": "U91", "price": 155.0},
+            ],
+        }
+
+
 @pytest.mark.asyncio
 async def test_nearby_coordinator_deduplicates_identical_location_queries(
     hass, nsw_entry_data, sample_nearby_payload
@@ -76,3 +138,622 @@ async def test_nearby_interval_is_disabled_for_daily_schedule(
     api = _FakeApi(sample_nearby_payload)
     coordinator = NearbyCoordinator(hass, entry, api)
     assert coordinator.update_interval is None
+
+
+@pytest.mark.asyncio
+async def test_snapshot_mode_uses_one_call_per_cycle(hass, nsw_entry_data):
+    data = dict(nsw_entry_data)
+    data[CONF_FETCH_MODE] = FETCH_MODE_SNAPSHOT
+    data[CONF_PREFERRED_FUELS] = "E10|U91|P95|P98"
+    data[CONF_PERSON_ENTITIES] = "person.alice,person.bob"
+    entry = SimpleNamespace(data=data)
+
+    hass.states.async_set("person.alice", "home", {"latitude": -32.91, "longitude": 151.67})
+    hass.states.async_set("person.bob", "away", {"latitude": -33.86, "longitude": 151.20})
+
+    api = _FakeSnapshotApi()
+    coordinator = NearbyCoordinator(hass, entry, api)
+
+    data = await coordinator._async_update_data()
+
+    assert api.all_price_calls == 1
+    assert api.nearby_calls == 0
+    assert data["home"]["best"]["stationcode"] == "100"
+    assert data["home"]["best"]["price"] == 175.9
+    assert data["home"]["best"]["distance"] < 10
+    assert data["home"]["top_stations"]["overall"][0] == data["home"]["best"]
+    assert data["person.alice"]["best"]["stationcode"] == "100"
+    assert data["person.bob"]["best"]["stationcode"] == "200"
+    assert data["person.bob"]["distance_to_home_cheapest"] > 100
+    # Home's cheapest station is near home, so calling there on the way costs little.
+    assert 0 <= data["person.bob"]["detour_to_home_cheapest"] < 10
+
+    # A manual refresh must not be answered from the API client's cache.
+    coordinator._force_full_refresh = True
+    await coordinator._async_update_data()
+    assert api.forced == [False, True]
+
+
+class _SlowFlakyApi:
+    def __init__(self, failing_fuel: str | None = None) -> None:
+        self.failing_fuel = failing_fuel
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    async def get_prices_nearby(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if kwargs["fueltype"] == self.failing_fuel:
+                raise RuntimeError("500 upstream error")
+            return {
+                "stations": [
+                    {
+                        "code": kwargs["latitude"],
+                        "brand": "Test Brand",
+                        "name": "Test Station",
+                        "location": {
+                            "latitude": float(kwargs["latitude"]),
+                            "longitude": float(kwargs["longitude"]),
+                            "distance": 1.0,
+                        },
+                    }
+                ],
+                "prices": [
+                    {
+                        "stationcode": kwargs["latitude"],
+                        "fueltype": kwargs["fueltype"],
+                        "price": {"E10": 170.1, "U91": 180.2, "P95": 190.3}[kwargs["fueltype"]],
+                    }
+                ],
+            }
+        finally:
+            self.in_flight -= 1
+
+
+def _people_entry(hass, nsw_entry_data, count: int) -> SimpleNamespace:
+    data = dict(nsw_entry_data)
+    data[CONF_PREFERRED_FUELS] = "E10|U91|P95"
+    data[CONF_PERSON_ENTITIES] = ",".join(f"person.p{idx}" for idx in range(count))
+    data[CONF_NEARBY_MAX_CONCURRENCY] = 2
+    for idx in range(count):
+        hass.states.async_set(
+            f"person.p{idx}", "away", {"latitude": f"-33.{idx}", "longitude": "151.0"}
+        )
+    return SimpleNamespace(data=data)
+
+
+@pytest.mark.asyncio
+async def test_nearby_queries_respect_concurrency_limit(hass, nsw_entry_data):
+    entry = _people_entry(hass, nsw_entry_data, 3)
+    api = _SlowFlakyApi()
+    coordinator = NearbyCoordinator(hass, entry, api)
+
+    data = await coordinator._async_update_data()
+
+    assert api.calls == 12
+    assert api.max_in_flight == 2
+    assert data["person.p2"]["best"]["price"] == 170.1
+
+
+@pytest.mark.asyncio
+async def test_nearby_query_failures_are_isolated(hass, nsw_entry_data):
+    entry = _people_entry(hass, nsw_entry_data, 2)
+    api = _SlowFlakyApi(failing_fuel="E10")
+    coordinator = NearbyCoordinator(hass, entry, api)
+
+    data = await coordinator._async_update_data()
+
+    assert set(data) == {"home", "person.p0", "person.p1"}
+    assert data["home"]["best"]["price"] == 180.2
+    assert data["person.p1"]["best"]["fueltype"] == "U91"
+
+
+@pytest.mark.asyncio
+async def test_nearby_cycle_only_requeries_moved_locations(hass, nsw_entry_data):
+    entry = _people_entry(hass, nsw_entry_data, 3)
+    api = _SlowFlakyApi()
+    coordinator = NearbyCoordinator(hass, entry, api)
+
+    coordinator.data = await coordinator._async_update_data()
+    assert api.calls == 12
+
+    hass.states.async_set("person.p1", "away", {"latitude": "-33.1005", "longitude": "151.0"})
+    hass.states.async_set("person.p2", "away", {"latitude": "-33.5", "longitude": "151.0"})
+    data = await coordinator._async_update_data()
+
+    assert api.calls == 15
+    assert data["home"] == coordinator.data["home"]
+    assert data["person.p1"]["last_checked"] == coordinator.data["person.p1"]["last_checked"]
+    assert data["person.p2"]["queried_location"] == {"lat": -33.5, "lon": 151.0}
+
+
+@pytest.mark.asyncio
+async def test_nearby_cycle_requeries_after_ttl_or_settings_change(hass, nsw_entry_data):
+    entry = _people_entry(hass, nsw_entry_data, 1)
+    entry.data[CONF_NEARBY_RESULT_TTL_MINUTES] = 60
+    entry.data[CONF_NEARBY_CACHE_TTL_MINUTES] = 0
+    api = _SlowFlakyApi()
+    coordinator = NearbyCoordinator(hass, entry, api)
+
+    coordinator.data = await coordinator._async_update_data()
+    assert api.calls == 6
+
+    expired = (dt_util.utcnow() - timedelta(minutes=61)).isoformat()
+    for result in coordinator.data.values():
+        result["last_checked"] = expired
+    coordinator.data = await coordinator._async_update_data()
+    assert api.calls == 12
+
+    entry.data[CONF_PREFERRED_FUELS] = "E10"
+    await coordinator._async_update_data()
+    assert api.calls == 14
+
+
+def test_default_result_ttl_is_just_under_one_interval(hass, nsw_entry_data):
+    entry = SimpleNamespace(data=dict(nsw_entry_data))
+    coordinator = NearbyCoordinator(hass, entry, _SlowFlakyApi())
+
+    # 360 minutes less the scheduler's 36 minute alignment window.
+    assert coordinator._result_ttl() == timedelta(minutes=324)
+
+
+@pytest.mark.asyncio
+async def test_manual_full_refresh_requeries_every_location(hass, nsw_entry_data):
+    entry = _people_entry(hass, nsw_entry_data, 1)
+    api = _SlowFlakyApi()
+    coordinator = NearbyCoordinator(hass, entry, api)
+
+    coordinator.data = await coordinator._async_update_data()
+    await coordinator._async_update_data()
+    assert api.calls == 6
+
+    coordinator._force_full_refresh = True
+    await coordinator._async_update_data()
+    assert api.calls == 12
+    assert coordinator._force_full_refresh is False
+
+
+@pytest.mark.asyncio
+async def test_default_scheduled_cycle_requeries_only_moved_people(
+    hass, freezer, nsw_entry_data, sample_nearby_payload
+):
+    data = dict(nsw_entry_data)
+    data[CONF_PERSON_ENTITIES] = "person.p0,person.p1"
+    hass.states.async_set("person.p0", "home", {"latitude": "-32.89", "longitude": "151.66"})
+    hass.states.async_set("person.p1", "away", {"latitude": "-33.0", "longitude": "151.0"})
+    api = _FakeApi(sample_nearby_payload)
+    coordinator = NearbyCoordinator(hass, SimpleNamespace(data=data), api)
+    await coordinator.async_refresh()
+    # person.p0 is in home's cache cell, so their queries are shared.
+    assert len(api.calls) == 8
+
+    now = dt_util.utcnow()
+    scheduler = RefreshScheduler(
+        hass,
+        {"nearby": coordinator},
+        {"nearby": timedelta(minutes=360)},
+        last_refreshed={"nearby": now},
+        jitter=timedelta(0),
+    )
+    unsub = scheduler.async_start()
+    hass.states.async_set("person.p1", "away", {"latitude": "-33.1", "longitude": "151.0"})
+
+    later = now + timedelta(minutes=361)
+    freezer.move_to(later)
+    async_fire_time_changed(hass, later)
+    await hass.async_block_till_done()
+
+    assert len(api.calls) == 12
+    assert {call["latitude"] for call in api.calls[8:]} == {snap_coordinates(-33.1, 151.0, 0.5)[0]}
+    unsub()
+
+
+def test_estimated_cycle_cost_covers_every_location_and_fuel(hass, nsw_entry_data):
+    entry = _people_entry(hass, nsw_entry_data, 6)
+    coordinator = NearbyCoordinator(hass, entry, _SlowFlakyApi())
+    assert coordinator.estimated_cycle_cost() == 21
+
+    entry.data[CONF_FETCH_MODE] = FETCH_MODE_SNAPSHOT
+    assert coordinator.estimated_cycle_cost() == 1
+
+
+@pytest.mark.asyncio
+async def test_person_changes_trigger_one_debounced_refresh_for_movers(
+    hass, nsw_entry_data, sample_nearby_payload
+):
+    data = dict(nsw_entry_data)
+    data[CONF_PERSON_ENTITIES] = "person.p0,person.p1"
+    data[CONF_PERSON_DEBOUNCE_SECONDS] = 30
+    hass.states.async_set("person.p0", "away", {"latitude": "-33.0", "longitude": "151.0"})
+    hass.states.async_set("person.p1", "away", {"latitude": "-33.5", "longitude": "151.0"})
+    api = _FakeApi(sample_nearby_payload)
+    coordinator = NearbyCoordinator(hass, SimpleNamespace(data=data), api)
+    await coordinator.async_refresh()
+    assert len(api.calls) == 12
+    unsub = coordinator.async_track_person_changes()
+
+    for lat in ("-33.05", "-33.1", "-33.15"):
+        hass.states.async_set("person.p0", "away", {"latitude": lat, "longitude": "151.0"})
+    await hass.async_block_till_done()
+    assert len(api.calls) == 12
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=31))
+    await hass.async_block_till_done()
+
+    assert len(api.calls) == 16
+    assert {call["latitude"] for call in api.calls[12:]} == {snap_coordinates(-33.15, 151.0, 0.5)[0]}
+    assert coordinator.data["person.p0"]["queried_location"]["lat"] == -33.15
+    assert coordinator.partial_refresh is False
+    unsub()
+
+
+@pytest.mark.asyncio
+async def test_nearby_cache_shares_snapped_queries_across_cycles(
+    hass, nsw_entry_data, sample_nearby_payload
+):
+    data = dict(nsw_entry_data)
+    data[CONF_PREFERRED_FUELS] = "E10"
+    data[CONF_PERSON_ENTITIES] = "person.p0,person.p1"
+    data[CONF_NEARBY_CACHE_GRID_KM] = 1.0
+    hass.states.async_set("person.p0", "away", {"latitude": "-33.80001", "longitude": "151.0"})
+    hass.states.async_set("person.p1", "away", {"latitude": "-33.80030", "longitude": "151.0003"})
+    api = _GeoApi([("100", -33.81, 151.01, 170.1)])
+    coordinator = NearbyCoordinator(hass, SimpleNamespace(data=data), api)
+
+    coordinator.data = await coordinator._async_update_data()
+    assert len(api.calls) == 2
+    assert coordinator.data["person.p0"]["best"]["distance"] != coordinator.data["person.p1"]["best"]["distance"]
+
+    hass.states.async_set("person.p0", "away", {"latitude": "-32.8930", "longitude": "151.6620"})
+    coordinator.data = await coordinator._async_update_data()
+    assert len(api.calls) == 2
+    assert coordinator.response_cache.stats()["hits"] == 1
+    assert coordinator.response_cache.stats()["misses"] == 2
+
+    coordinator._force_full_refresh = True
+    await coordinator._async_update_data()
+    assert len(api.calls) == 4
+
+
+class _GeoApi:
+    """Nearby endpoint that honours the query point and radius."""
+
+    def __init__(self, stations: list[tuple[str, float, float, float]]) -> None:
+        self.stations = stations
+        self.calls: list[dict[str, object]] = []
+
+    async def get_prices_nearby(self, **kwargs):
+        from custom_components.nsw_fuel.distance import haversine_km
+
+        self.calls.append(kwargs)
+        lat, lon = float(kwargs["latitude"]), float(kwargs["longitude"])
+        hits = [
+            (code, s_lat, s_lon, price, haversine_km(lat, lon, s_lat, s_lon))
+            for code, s_lat, s_lon, price in self.stations
+        ]
+        hits = [hit for hit in hits if hit[4] <= float(kwargs["radius_km"])]
+        return {
+            "stations": [
+                {
+                    "code": code,
+                    "brand": "Brand",
+                    "name": f"Station {code}",
+                    "location": {"latitude": s_lat, "longitude": s_lon, "distance": round(dist, 2)},
+                }
+                for code, s_lat, s_lon, _price, dist in hits
+            ],
+            "prices": [
+                {"stationcode": code, "fueltype": kwargs["fueltype"], "price": price}
+                for code, _s_lat, _s_lon, price, _dist in hits
+            ],
+        }
+
+
+@pytest.mark.asyncio
+async def test_merged_queries_cover_clustered_people_with_same_answers(hass, nsw_entry_data):
+    stations = [
+        ("1", -32.95, 151.66, 199.0),
+        ("2", -33.00, 151.60, 185.0),
+        ("3", -33.05, 151.70, 170.0),
+        ("4", -33.20, 151.70, 150.0),
+        ("5", -34.00, 151.00, 120.0),
+    ]
+    data = dict(nsw_entry_data)
+    data[CONF_PREFERRED_FUELS] = "E10|U91"
+    data[CONF_PERSON_ENTITIES] = "person.p0,person.p1,person.p2"
+    data[CONF_NEARBY_CACHE_GRID_KM] = 0
+    hass.states.async_set("person.p0", "away", {"latitude": "-32.92", "longitude": "151.65"})
+    hass.states.async_set("person.p1", "away", {"latitude": "-33.00", "longitude": "151.68"})
+    hass.states.async_set("person.p2", "away", {"latitude": "-34.01", "longitude": "151.01"})
+
+    separate_api = _GeoApi(stations)
+    separate = await NearbyCoordinator(
+        hass, SimpleNamespace(data=data), separate_api
+    )._async_update_data()
+
+    merged_api = _GeoApi(stations)
+    merged = await NearbyCoordinator(
+        hass, SimpleNamespace(data={**data, CONF_MERGE_NEARBY_QUERIES: True}), merged_api
+    )._async_update_data()
+
+    assert len(separate_api.calls) == 8
+    assert len(merged_api.calls) == 4
+    assert max(int(call["radius_km"]) for call in merged_api.calls) <= 50
+    for loc_id in ("home", "person.p0", "person.p1", "person.p2"):
+        assert merged[loc_id]["best"]["stationcode"] == separate[loc_id]["best"]["stationcode"]
+        assert merged[loc_id]["best"]["price"] == separate[loc_id]["best"]["price"]
+        assert merged[loc_id]["best"]["distance"] == pytest.approx(
+            separate[loc_id]["best"]["distance"], abs=0.01
+        )
+
+
+class _UnplacedStationApi(_GeoApi):
+    """Also answers every query with a cheap station that has no coordinates."""
+
+    async def get_prices_nearby(self, **kwargs):
+        payload = await super().get_prices_nearby(**kwargs)
+        payload["stations"].append({"code": "0", "brand": "Brand", "location": {}})
+        payload["prices"].append(
+            {"stationcode": "0", "fueltype": kwargs["fueltype"], "price": 100.0}
+        )
+        return payload
+
+
+@pytest.mark.asyncio
+async def test_merged_and_separate_queries_break_ties_the_same_way(hass, nsw_entry_data):
+    # Equal prices: the farther station comes first in the response, and
+    # "20" and "3" are the same distance from person.p0.
+    stations = [
+        ("40", -33.05, 151.50, 150.0),
+        ("3", -33.01, 151.50, 150.0),
+        ("20", -32.99, 151.50, 150.0),
+    ]
+    data = dict(nsw_entry_data)
+    data[CONF_PREFERRED_FUELS] = "E10"
+    data[CONF_PERSON_ENTITIES] = "person.p0,person.p1"
+    data[CONF_NEARBY_CACHE_GRID_KM] = 0
+    hass.states.async_set("person.p0", "away", {"latitude": "-33.00", "longitude": "151.50"})
+    hass.states.async_set("person.p1", "away", {"latitude": "-33.02", "longitude": "151.52"})
+
+    answers = []
+    for merge in (False, True):
+        api = _UnplacedStationApi(stations)
+        entry = SimpleNamespace(data={**data, CONF_MERGE_NEARBY_QUERIES: merge})
+        answers.append(await NearbyCoordinator(hass, entry, api)._async_update_data())
+    separate, merged = answers
+
+    assert separate["person.p0"]["best"]["stationcode"] == "20"
+    assert separate["person.p1"]["best"]["stationcode"] == "3"
+    for loc_id in ("person.p0", "person.p1"):
+        assert merged[loc_id]["best"] == separate[loc_id]["best"]
+        assert merged[loc_id]["top_stations"] == separate[loc_id]["top_stations"]
+
+
+@pytest.mark.asyncio
+async def test_local_brand_filter_sends_unfiltered_queries(hass, nsw_entry_data):
+    stations = [
+        ("1", -32.90, 151.66, 150.0),
+        ("2", -32.91, 151.66, 160.0),
+        ("3", -32.92, 151.66, 170.0),
+    ]
+    api = _GeoApi(stations)
+    brands = {"1": "Cheap Co", "2": "Mid Co", "3": "Nice Co"}
+    original = api.get_prices_nearby
+
+    async def _branded(**kwargs):
+        payload = await original(**kwargs)
+        for station in payload["stations"]:
+            station["brand"] = brands[station["code"]]
+        return payload
+
+    api.get_prices_nearby = _branded
+    data = dict(nsw_entry_data)
+    data[CONF_PREFERRED_FUELS] = "E10"
+    data[CONF_BRANDS] = "Mid Co|Nice Co"
+    data[CONF_EXCLUDED_BRANDS] = "Mid Co"
+    data[CONF_LOCAL_BRAND_FILTER] = True
+    coordinator = NearbyCoordinator(hass, SimpleNamespace(data=data), api)
+
+    result = await coordinator._async_update_data()
+
+    assert api.calls[0]["brands"] == []
+    assert result["home"]["best"]["stationcode"] == "3"
+
+    data[CONF_BRANDS] = ""
+    result = await coordinator._async_update_data()
+    assert len(api.calls) == 1
+    assert result["home"]["best"]["stationcode"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_fetch_radius_serves_smaller_radii_and_ladder_locally(hass, nsw_entry_data):
+    api = _GeoApi(
+        [
+            ("near", -32.90, 151.66, 170.0),
+            ("mid", -32.93, 151.66, 160.0),
+            ("far", -32.97, 151.66, 150.0),
+            ("outside", -33.05, 151.66, 120.0),
+        ]
+    )
+    data = dict(nsw_entry_data)
+    data[CONF_PREFERRED_FUELS] = "E10"
+    data[CONF_FETCH_RADIUS_KM] = 20
+    coordinator = NearbyCoordinator(hass, SimpleNamespace(data=data), api)
+
+    result = await coordinator._async_update_data()
+
+    # Padded so the snapped query still covers 20 km around home.
+    assert [call["radius_km"] for call in api.calls] == ["21"]
+    assert result["home"]["best"]["stationcode"] == "far"
+    ladder = result["home"]["cheapest_within"]
+    assert ladder["2"]["stationcode"] == "near"
+    assert ladder["5"]["stationcode"] == "mid"
+    assert ladder["10"]["stationcode"] == "far"
+
+    data[CONF_RADIUS_KM] = "5"
+    result = await coordinator._async_update_data()
+    assert len(api.calls) == 1
+    assert result["home"]["best"]["stationcode"] == "mid"
+
+
+@pytest.mark.asyncio
+async def test_snapped_queries_are_ranked_from_the_real_location(hass, nsw_entry_data):
+    step = 1.0 / KM_PER_DEG_LAT
+    centre_lat = round(-33.8 / step) * step
+    # Half a kilometre south of the centre of its 1 km cell.
+    person_lat = centre_lat - 0.45 * step
+    _lat, lon = map(float, snap_coordinates(person_lat, 151.0, 1.0))
+    api = _GeoApi(
+        [
+            # 5.3 km from the person, but only 4.85 km from the cell centre.
+            ("outside", person_lat + 5.3 * step, lon, 150.0),
+            ("inside", person_lat - 1.0 * step, lon, 170.0),
+        ]
+    )
+    data = dict(nsw_entry_data)
+    data[CONF_PREFERRED_FUELS] = "E10"
+    data[CONF_PERSON_ENTITIES] = "person.p0"
+    data[CONF_RADIUS_KM] = "5"
+    data[CONF_NEARBY_CACHE_GRID_KM] = 1.0
+    hass.states.async_set("person.p0", "away", {"latitude": str(person_lat), "longitude": str(lon)})
+    coordinator = NearbyCoordinator(hass, SimpleNamespace(data=data), api)
+
+    result = await coordinator._async_update_data()
+
+    assert [call["radius_km"] for call in api.calls] == ["6", "6"]
+    assert result["person.p0"]["best"]["stationcode"] == "inside"
+    assert result["person.p0"]["best"]["distance"] == pytest.approx(1.0, abs=0.01)
+
+
+class _StationApi:
+    def __init__(self, failing: tuple[str, ...] = ()) -> None:
+        self.failing = failing
+        self.station_calls: list[str] = []
+        self.all_price_calls = 0
+        self.snapshot_cached = False
+
+    def is_fresh(self, endpoint, key):
+        return self.snapshot_cached and endpoint == key == "all_prices"
+
+    async def get_station_prices(self, code, force=False):
+        self.station_calls.append(code)
+        if code in self.failing:
+            raise RuntimeError("boom")
+        return {
+            "prices": [
+                {"stationcode": code, "fueltype": "U91", "price": "181.9"},
+                {"stationcode": code, "fueltype": "E10", "price": "171.9"},
+            ]
+        }
+
+    async def get_all_prices(self, force=False):
+        self.all_price_calls += 1
+        return {
+            "stations": [],
+            "prices": [
+                {"stationcode": "100", "fueltype": "E10", "price": 175.9},
+                {"stationcode": "200", "fueltype": "E10", "price": 150.0},
+                {"stationcode": "200", "fueltype": "P98", "price": 199.0},
+                {"stationcode": "300", "fueltype": "E10", "price": 160.0},
+            ],
+        }
+
+
+@pytest.mark.asyncio
+async def test_favourite_coordinator_single_station_uses_station_endpoint(hass, nsw_entry_data):
+    data = dict(nsw_entry_data)
+    data[CONF_PREFERRED_FUELS] = "E10|U91"
+    data[CONF_FAVOURITE_STATION_CODE] = "100"
+    api = _StationApi()
+    coordinator = FavouriteStationCoordinator(hass, SimpleNamespace(data=data), api)
+    coordinator.catalogue = StationCatalogue(hass)
+    coordinator.catalogue.stations = {
+        "100": {"code": "100", "name": "Near Station", "brand": "Near Brand"}
+    }
+
+    result = await coordinator._async_update_data()
+
+    assert api.station_calls == ["100"]
+    assert api.all_price_calls == 0
+    assert coordinator.estimated_cycle_cost() == 1
+    station = result["stations"]["100"]
+    assert station["name"] == "Near Station"
+    assert station["brand"] == "Near Brand"
+    assert station["best"]["price"] == 171.9
+    assert [p["fueltype"] for p in station["prices"]] == ["E10", "U91"]
+
+
+@pytest.mark.asyncio
+async def test_favourite_coordinator_serves_several_stations_from_one_snapshot(
+    hass, nsw_entry_data
+):
+    data = dict(nsw_entry_data)
+    data[CONF_PREFERRED_FUELS] = "E10"
+    data[CONF_FAVOURITE_STATION_CODE] = "100, 200,999,300,400"
+    api = _StationApi()
+    coordinator = FavouriteStationCoordinator(hass, SimpleNamespace(data=data), api)
+
+    result = await coordinator._async_update_data()
+
+    assert api.all_price_calls == 1
+    assert api.station_calls == []
+    assert coordinator.estimated_cycle_cost() == 1
+    assert set(result["stations"]) == {"100", "200", "999", "300", "400"}
+    assert result["stations"]["100"]["best"]["price"] == 175.9
+    assert result["stations"]["200"]["prices"] == [
+        {"stationcode": "200", "fueltype": "E10", "price": 150.0}
+    ]
+    assert result["stations"]["999"]["best"] is None
+
+
+@pytest.mark.asyncio
+async def test_favourite_coordinator_reuses_a_cached_snapshot_for_few_stations(
+    hass, nsw_entry_data
+):
+    data = dict(nsw_entry_data)
+    data[CONF_PREFERRED_FUELS] = "E10"
+    data[CONF_FAVOURITE_STATION_CODE] = "100,200"
+    api = _StationApi()
+    coordinator = FavouriteStationCoordinator(hass, SimpleNamespace(data=data), api)
+
+    assert coordinator.estimated_cycle_cost() == 2
+    await coordinator._async_update_data()
+    assert (api.station_calls, api.all_price_calls) == (["100", "200"], 0)
+
+    api.snapshot_cached = True
+    result = await coordinator._async_update_data()
+    assert (api.station_calls, api.all_price_calls) == (["100", "200"], 1)
+    assert coordinator.estimated_cycle_cost() == 1
+    assert result["stations"]["200"]["best"]["price"] == 150.0
+
+    coordinator._force_full_refresh = True
+    await coordinator._async_update_data()
+    assert (api.station_calls, api.all_price_calls) == (["100", "200"] * 2, 1)
+
+
+@pytest.mark.asyncio
+async def test_favourite_coordinator_keeps_previous_prices_for_failed_station(
+    hass, nsw_entry_data
+):
+    data = dict(nsw_entry_data)
+    data[CONF_PREFERRED_FUELS] = "E10"
+    data[CONF_FAVOURITE_STATION_CODE] = "100,200"
+    data[CONF_NEARBY_MAX_CONCURRENCY] = 1
+    api = _StationApi()
+    coordinator = FavouriteStationCoordinator(hass, SimpleNamespace(data=data), api)
+    coordinator.async_set_updated_data(await coordinator._async_update_data())
+    assert coordinator.estimated_cycle_cost() == 2
+
+    api.failing = ("200",)
+    result = await coordinator._async_update_data()
+
+    assert api.station_calls == ["100", "200", "100", "200"]
+    assert result["stations"]["200"] == coordinator.data["stations"]["200"]
+
+    api.failing = ("100", "200")
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
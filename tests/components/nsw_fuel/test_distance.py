@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import math
+import random
+
+import pytest
+pytest.importorskip("homeassistant")
+
+from custom_components.nsw_fuel import distance
+from custom_components.nsw_fuel.distance import detour_km, distance_matrix, haversine_km
+
+BACKENDS = [
+    False,
+    pytest.param(
+        True,
+        marks=pytest.mark.skipif(distance.np is None, reason="numpy not installed"),
+    ),
+]
+
+
+@pytest.mark.parametrize("vectorised", BACKENDS)
+def test_distance_matrix_matches_scalar_haversine(vectorised):
+    rng = random.Random(5)
+    origins = [(rng.uniform(-37, -28), rng.uniform(141, 153)) for _ in range(7)]
+    targets = [(rng.uniform(-37, -28), rng.uniform(141, 153)) for _ in range(40)]
+    targets.append((math.nan, math.nan))
+
+    matrix = distance_matrix(origins, targets, vectorised)
+
+    for row, origin in enumerate(origins):
+        for col, target in enumerate(targets[:-1]):
+            assert matrix[row][col] == pytest.approx(haversine_km(*origin, *target))
+        assert math.isnan(matrix[row][-1])
+
+
+@pytest.mark.parametrize("vectorised", BACKENDS)
+def test_distance_matrix_handles_empty_sides(vectorised):
+    assert len(distance_matrix([], [(-33.0, 151.0)], vectorised)) == 0
+    assert len(distance_matrix([(-33.0, 151.0)], [], vectorised)[0]) == 0
+
+
+def test_detour_is_extra_distance_and_never_negative():
+    assert detour_km(3.0, 8.0, 10.0) == pytest.approx(1.0)
+    assert detour_km(5.0, 5.0, 10.0 + 1e-9) == 0.0
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import pytest
+pytest.importorskip("homeassistant")
+
+from custom_components.nsw_fuel.planner import plan_covering_circles
+from custom_components.nsw_fuel.distance import haversine_km
+
+
+def test_plan_merges_clusters_within_max_radius():
+    points = {
+        "home": (-32.89, 151.66),
+        "person.a": (-32.92, 151.65),
+        "person.b": (-33.00, 151.68),
+        "person.far": (-34.0, 151.0),
+    }
+
+    circles = plan_covering_circles(points, radius_km=10, max_radius_km=25)
+
+    assert sorted(sorted(circle.members) for circle in circles) == [
+        ["home", "person.a", "person.b"],
+        ["person.far"],
+    ]
+    for circle in circles:
+        assert circle.radius_km <= 25
+        for member in circle.members:
+            assert haversine_km(circle.lat, circle.lon, *points[member]) + 10 <= circle.radius_km + 1e-9
+
+
+def test_plan_keeps_locations_separate_when_radius_cannot_grow():
+    points = {"home": (-32.89, 151.66), "person.a": (-32.90, 151.66)}
+
+    circles = plan_covering_circles(points, radius_km=10, max_radius_km=10)
+
+    assert [circle.members for circle in circles] == [["home"], ["person.a"]]
+    assert not any(circle.merged for circle in circles)
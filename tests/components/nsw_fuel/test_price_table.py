@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+pytest.importorskip("homeassistant")
+
+from custom_components.nsw_fuel import price_table
+from custom_components.nsw_fuel.distance import haversine_km
+from custom_components.nsw_fuel.price_table import PriceTable
+from custom_components.nsw_fuel.records import PriceRecord, Station
+
+BACKENDS = [
+    False,
+    pytest.param(
+        True,
+        marks=pytest.mark.skipif(price_table.np is None, reason="numpy not installed"),
+    ),
+]
+
+
+def _records(count: int) -> list[PriceRecord]:
+    rng = random.Random(3)
+    records = []
+    for idx in range(count):
+        station = Station(
+            str(idx),
+            brand=rng.choice(["BP", "Shell", "Ampol"]),
+            latitude=rng.uniform(-34.2, -33.5),
+            longitude=rng.uniform(150.8, 151.4),
+        )
+        for fuel in ("E10", "U91"):
+            price = round(rng.uniform(170, 190), 0) if rng.random() > 0.05 else None
+            records.append(PriceRecord(station, fuel, price, "01/01/2026", None))
+    records.append(PriceRecord(Station("unplaced", brand="BP"), "E10", 100.0, None, None))
+    return records
+
+
+def _brute_force(records, lat, lon, radius, excluded):
+    in_range = []
+    for row, record in enumerate(records):
+        if record.price is None or record.latitude is None or record.brand in excluded:
+            continue
+        distance = round(haversine_km(lat, lon, record.latitude, record.longitude), 2)
+        if distance <= radius:
+            in_range.append((record.price, distance, record.stationcode, row))
+    return sorted(in_range)
+
+
+@pytest.mark.parametrize("vectorised", BACKENDS)
+def test_cheapest_matches_brute_force(vectorised):
+    records = _records(600)
+    table = PriceTable(records, vectorised=vectorised)
+    keep = table.brand_mask([], ["Shell"])
+    lat, lon = -33.87, 151.21
+
+    assert table.vectorised is vectorised
+    distances = table.distances_from([(lat, lon)])[0]
+    for radius in (2, 5, 10, 50):
+        expected = _brute_force(records, lat, lon, radius, {"Shell"})
+        best = table.cheapest(keep, distances, radius)
+        if not expected:
+            assert best is None
+            continue
+        price, distance, _code, row = expected[0]
+        assert (best.price, best.distance, best.stationcode, best.fueltype) == (
+            price,
+            distance,
+            records[row].stationcode,
+            records[row].fueltype,
+        )
+
+
+@pytest.mark.parametrize("vectorised", BACKENDS)
+def test_cheapest_rows_ranks_k_cheapest(vectorised):
+    records = _records(200)
+    table = PriceTable(records, vectorised=vectorised)
+    keep = table.brand_mask(["BP"], [])
+
+    rows = table.cheapest_rows(keep, 5)
+
+    expected = sorted(
+        (r.price, r.stationcode, row)
+        for row, r in enumerate(records)
+        if r.brand == "BP" and r.price is not None
+    )
+    assert rows == [row for _price, _code, row in expected[:5]]
+    assert table.cheapest_rows(keep, 0) == []
+    assert PriceTable([], vectorised=vectorised).cheapest(keep) is None
+
+
+@pytest.mark.parametrize("vectorised", BACKENDS)
+def test_top_lists_k_cheapest_overall_and_per_fuel(vectorised):
+    records = _records(300)
+    table = PriceTable(records, vectorised=vectorised)
+    lat, lon = -33.87, 151.21
+    distances = table.distances_from([(lat, lon)])[0]
+
+    top = table.top(table.brand_mask([], []), 3, distances, 10)
+
+    ranked = _brute_force(records, lat, lon, 10, set())
+    assert set(top) == {"overall", "E10", "U91"}
+    assert [(r.price, r.distance) for r in top["overall"]] == [(p, d) for p, d, _code, _row in ranked[:3]]
+    for fuel in ("E10", "U91"):
+        expected = [(p, d) for p, d, _code, row in ranked if records[row].fueltype == fuel][:3]
+        assert [(r.price, r.distance) for r in top[fuel]] == expected
+
+
+@pytest.mark.parametrize("vectorised", BACKENDS)
+def test_equal_prices_break_ties_by_distance_then_station_code(vectorised):
+    def record(code, lat):
+        return PriceRecord(Station(code, latitude=lat, longitude=151.0), "E10", 170.0, None, None)
+
+    records = [record("300", -33.9), record("200", -33.8), record("100", -33.9)]
+    table = PriceTable(records, vectorised=vectorised)
+    keep = table.brand_mask([], [])
+    distances = table.distances_from([(-33.8, 151.0)])[0]
+
+    unranked = table.cheapest_rows(keep, 3)
+    assert [records[row].stationcode for row in unranked] == ["100", "200", "300"]
+    ranked = table.cheapest_rows(keep, 3, distances)
+    assert [records[row].stationcode for row in ranked] == ["200", "100", "300"]
+    assert table.cheapest(keep, distances).stationcode == "200"
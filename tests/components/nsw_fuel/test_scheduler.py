@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+pytest.importorskip("homeassistant")
+
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.nsw_fuel.const import CONF_DAILY_QUOTA
+from custom_components.nsw_fuel.coordinator import ApiCallCounter
+from custom_components.nsw_fuel.scheduler import RefreshScheduler
+
+
+class _FakeCoordinator:
+    def __init__(self) -> None:
+        self.refreshes = 0
+        self.last_update_success = True
+        self._listeners: list = []
+
+    def async_add_listener(self, update_callback):
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+    async def async_refresh(self) -> None:
+        self.refreshes += 1
+        for listener in list(self._listeners):
+            listener()
+
+
+@pytest.mark.asyncio
+async def test_coordinators_due_in_same_window_refresh_together(hass, freezer):
+    now = dt_util.utcnow()
+    nearby, favourite = _FakeCoordinator(), _FakeCoordinator()
+    scheduler = RefreshScheduler(
+        hass,
+        {"nearby": nearby, "favourite": favourite},
+        {"nearby": timedelta(minutes=60), "favourite": timedelta(minutes=120)},
+        last_refreshed={
+            "nearby": now - timedelta(minutes=50),
+            "favourite": now - timedelta(minutes=108),
+        },
+        jitter=timedelta(0),
+    )
+    unsub = scheduler.async_start()
+
+    assert scheduler.next_run is not None
+    assert scheduler.next_run - now == pytest.approx(timedelta(minutes=10), abs=timedelta(seconds=5))
+
+    freezer.move_to(now + timedelta(minutes=11))
+    async_fire_time_changed(hass, now + timedelta(minutes=11))
+    await hass.async_block_till_done()
+
+    assert nearby.refreshes == 1
+    assert favourite.refreshes == 1
+    assert scheduler.due_at("nearby") > now + timedelta(minutes=60)
+    unsub()
+
+
+@pytest.mark.asyncio
+async def test_zero_interval_is_manual_only_and_manual_refresh_reschedules(hass, freezer):
+    now = dt_util.utcnow()
+    nearby, favourite = _FakeCoordinator(), _FakeCoordinator()
+    scheduler = RefreshScheduler(
+        hass,
+        {"nearby": nearby, "favourite": favourite},
+        {"nearby": timedelta(minutes=30), "favourite": timedelta(0)},
+        last_refreshed={"nearby": now - timedelta(minutes=29)},
+        jitter=timedelta(0),
+    )
+    unsub = scheduler.async_start()
+    assert scheduler.interval("favourite") is None
+
+    await nearby.async_refresh()
+    assert scheduler.next_run - now >= timedelta(minutes=29)
+
+    freezer.move_to(now + timedelta(minutes=2))
+    async_fire_time_changed(hass, now + timedelta(minutes=2))
+    await hass.async_block_till_done()
+    assert nearby.refreshes == 1
+    assert favourite.refreshes == 0
+    unsub()
+    assert scheduler.next_run is None
+
+
+@pytest.mark.asyncio
+async def test_budget_planner_stretches_intervals_and_skips_unaffordable_cycles(hass, freezer):
+    noon = dt_util.start_of_local_day() + timedelta(hours=12)
+    freezer.move_to(noon)
+    counter = ApiCallCounter(hass, SimpleNamespace(data={CONF_DAILY_QUOTA: 100}))
+    counter.set_schedule({"nearby": timedelta(minutes=30)})
+
+    async def _refresh() -> None:
+        await counter.async_increment(5)
+
+    await counter.async_measure_cycle("nearby", _refresh)
+
+    assert counter.cycle_cost("nearby") == 5
+    assert counter.remaining == 95
+    # 24 cycles x 5 calls until midnight would need 120 calls.
+    assert counter.interval_scale() == pytest.approx(120 / 95)
+    assert counter.planned_interval("nearby", timedelta(minutes=30)) == pytest.approx(
+        timedelta(minutes=30 * 120 / 95)
+    )
+    exhaustion = counter.projected_exhaustion()
+    assert exhaustion is not None
+    assert exhaustion - dt_util.now() == pytest.approx(timedelta(hours=9.5), abs=timedelta(seconds=1))
+    assert counter.budget()["projected_calls"] == 125
+
+    await counter.async_increment(92)
+    assert not counter.can_afford("nearby")
+
+    coordinator = _FakeCoordinator()
+    scheduler = RefreshScheduler(
+        hass,
+        {"nearby": coordinator},
+        {"nearby": timedelta(minutes=30)},
+        last_refreshed={"nearby": noon - timedelta(days=1)},
+        jitter=timedelta(0),
+        planner=counter,
+    )
+    unsub = scheduler.async_start()
+    assert scheduler.next_run is not None
+    async_fire_time_changed(hass, noon)
+    await hass.async_block_till_done()
+    assert coordinator.refreshes == 0
+    assert scheduler.due_at("nearby") > noon
+    unsub()
+
+
+@pytest.mark.asyncio
+async def test_budget_planner_without_quota_keeps_intervals(hass):
+    counter = ApiCallCounter(hass, SimpleNamespace(data={}))
+    counter.set_schedule({"nearby": timedelta(minutes=30)})
+
+    assert counter.planned_interval("nearby", timedelta(minutes=30)) == timedelta(minutes=30)
+    assert counter.can_afford("nearby")
+    assert counter.budget()["projected_exhaustion"] is None
+
+
+@pytest.mark.asyncio
+async def test_unmeasured_cycle_uses_worst_case_estimate(hass):
+    counter = ApiCallCounter(hass, SimpleNamespace(data={CONF_DAILY_QUOTA: 100}))
+    nearby = _FakeCoordinator()
+    nearby.estimated_cycle_cost = lambda: 28.0
+    RefreshScheduler(
+        hass,
+        {"nearby": nearby, "favourite": _FakeCoordinator()},
+        {"nearby": timedelta(minutes=360), "favourite": timedelta(minutes=360)},
+        planner=counter,
+    )
+
+    assert counter.cycle_cost("nearby") == 28
+    assert counter.cycle_cost("favourite") == 1
+    await counter.async_increment(80)
+    assert not counter.can_afford("nearby")
+    assert counter.can_afford("favourite")
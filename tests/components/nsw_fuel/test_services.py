@@ -1,37 +1,59 @@
 from __future__ import annotations
 
 from types import SimpleNamespace
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock
+
+import time
 
 import pytest
 
 pytest.importorskip("homeassistant")
 
-from custom_components.nsw_fuel import __init__ as nsw_init
+import custom_components.nsw_fuel as nsw_init
 from custom_components.nsw_fuel.const import (
     CONF_FAVOURITE_STATION_CODE,
     DOMAIN,
     SERVICE_REFRESH,
 )
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
 
 
 class _FakeCoordinator:
     def __init__(self) -> None:
+        self.name = "fake_coordinator"
+        self.last_update_success = True
+        self.data = None
         self.async_config_entry_first_refresh = AsyncMock()
         self.async_request_refresh = AsyncMock()
+        self.async_refresh = AsyncMock()
+        self.async_set_updated_data = Mock()
+        self.async_add_listener = Mock(return_value=lambda: None)
 
 
 class _FakeApiCallCounter:
     def __init__(self, *_args, **_kwargs) -> None:
         self.async_increment = AsyncMock()
         self.async_reset_if_new_day = AsyncMock()
+        self.async_restore = Mock()
+        self.async_add_listener = Mock(return_value=lambda: None)
+        self.set_schedule = Mock()
+        self.clear_schedule = Mock()
+        self.record_retry = Mock()
+        self.planned_interval = lambda _name, interval: interval
         self.data = {"date": "2026-02-08", "count": 0, "last_reset": "2026-02-08T00:00:00+00:00"}
 
 
 class _FakeApi:
-    def __init__(self, *_args, **_kwargs) -> None:
-        return
+    instances: list["_FakeApi"] = []
+
+    def __init__(self, *_args, **kwargs) -> None:
+        self.kwargs = kwargs
+        self.closed = False
+        _FakeApi.instances.append(self)
+
+    def close(self) -> None:
+        self.closed = True
 
 
 def _entry(entry_id: str, data: dict[str, object]) -> SimpleNamespace:
@@ -158,3 +180,94 @@ async def test_refresh_service_logs_and_raises_on_failures(
 
     assert "Manual refresh failed for entry_id=entry-a coordinator=nearby" in caplog.text
     assert "boom" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_setup_warm_starts_from_stored_token_and_results(
+    hass, hass_storage, monkeypatch, nsw_entry_data
+):
+    nearby_by_entry, favourite_by_entry = _setup_patches(hass, monkeypatch)
+    expiry = time.time() + 600
+    stored_nearby = {"home": {"best": {"price": 170.1}, "last_checked": "2026-02-08T00:00:00+00:00"}}
+    hass_storage[f"{DOMAIN}.entry-a"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.entry-a",
+        "data": {
+            "token": {"access_token": "stored-token", "expiry": expiry},
+            "coordinators": {
+                "nearby": {"saved_at": dt_util.utcnow().isoformat(), "data": stored_nearby},
+            },
+        },
+    }
+
+    entry = _entry("entry-a", nsw_entry_data)
+    assert await nsw_init.async_setup_entry(hass, entry)
+
+    api = _FakeApi.instances[-1]
+    assert api.kwargs["token"] == "stored-token"
+    assert api.kwargs["token_expiry"] == expiry
+    nearby_by_entry["entry-a"].async_set_updated_data.assert_called_once_with(stored_nearby)
+    favourite_by_entry["entry-a"].async_set_updated_data.assert_not_called()
+    assert nearby_by_entry["entry-a"].async_request_refresh.await_count == 0
+
+
+@pytest.mark.asyncio
+async def test_entries_with_same_api_key_share_one_client(hass, monkeypatch, nsw_entry_data):
+    _setup_patches(hass, monkeypatch)
+    _FakeApi.instances.clear()
+    entry_a = _entry("entry-a", nsw_entry_data)
+    entry_b = _entry("entry-b", nsw_entry_data)
+    entry_c = _entry("entry-c", {**nsw_entry_data, "api_key": "other-key"})
+
+    for entry in (entry_a, entry_b, entry_c):
+        assert await nsw_init.async_setup_entry(hass, entry)
+
+    assert len(_FakeApi.instances) == 2
+    assert (
+        hass.data[DOMAIN]["entry-a"]["api_calls"] is hass.data[DOMAIN]["entry-b"]["api_calls"]
+    )
+    assert (
+        hass.data[DOMAIN]["entry-a"]["api_calls"] is not hass.data[DOMAIN]["entry-c"]["api_calls"]
+    )
+
+    shared = _FakeApi.instances[0]
+    assert await nsw_init.async_unload_entry(hass, entry_a)
+    assert not shared.closed
+    assert await nsw_init.async_unload_entry(hass, entry_b)
+    assert shared.closed
+    assert await nsw_init.async_unload_entry(hass, entry_c)
+
+
+@pytest.mark.asyncio
+async def test_shared_client_warns_about_differing_settings(
+    hass, monkeypatch, nsw_entry_data, caplog
+):
+    _setup_patches(hass, monkeypatch)
+    entry_a = _entry("entry-a", nsw_entry_data)
+    entry_b = _entry("entry-b", {**nsw_entry_data, "daily_quota": 500})
+
+    assert await nsw_init.async_setup_entry(hass, entry_a)
+    assert "sets" not in caplog.text
+    assert await nsw_init.async_setup_entry(hass, entry_b)
+
+    assert "entry-b shares an API client" in caplog.text
+    assert "sets daily_quota differently" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_failed_setup_releases_the_shared_client(hass, monkeypatch, nsw_entry_data):
+    _setup_patches(hass, monkeypatch)
+    _FakeApi.instances.clear()
+    monkeypatch.setattr(
+        hass.config_entries,
+        "async_forward_entry_setups",
+        AsyncMock(side_effect=RuntimeError("platform failed")),
+    )
+    entry = _entry("entry-a", nsw_entry_data)
+
+    with pytest.raises(RuntimeError):
+        await nsw_init.async_setup_entry(hass, entry)
+
+    assert _FakeApi.instances[0].closed
+    assert "test-key" not in hass.data[nsw_init.DATA_CLIENTS]
+    assert "entry-a" not in hass.data[DOMAIN]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+pytest.importorskip("homeassistant")
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.nsw_fuel.const import CONF_DAILY_QUOTA, DOMAIN
+from custom_components.nsw_fuel.coordinator import ApiCallCounter
+from custom_components.nsw_fuel.store import NswFuelStore
+
+
+@pytest.mark.asyncio
+async def test_store_round_trips_token_and_fresh_coordinator_data(hass):
+    store = NswFuelStore(hass, "entry-a")
+    await store.async_load()
+
+    expiry = time.time() + 600
+    store.async_set_token("token-1", expiry)
+    store.async_set_coordinator_data("nearby", {"home": {"best": {"price": 170.1}}})
+
+    assert store.token() == ("token-1", expiry)
+    assert store.coordinator_data("nearby", timedelta(minutes=5)) == {
+        "home": {"best": {"price": 170.1}}
+    }
+
+
+@pytest.mark.asyncio
+async def test_store_ignores_expired_token_and_stale_data(hass, hass_storage):
+    hass_storage[f"{DOMAIN}.entry-a"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.entry-a",
+        "data": {
+            "token": {"access_token": "old", "expiry": time.time() - 1},
+            "coordinators": {
+                "nearby": {
+                    "saved_at": (dt_util.utcnow() - timedelta(hours=7)).isoformat(),
+                    "data": {"home": {}},
+                }
+            },
+        },
+    }
+    store = NswFuelStore(hass, "entry-a")
+    await store.async_load()
+
+    assert store.token() is None
+    assert store.coordinator_data("nearby", timedelta(hours=6)) is None
+    assert store.coordinator_data("nearby", timedelta(hours=8)) == {"home": {}}
+
+
+@pytest.mark.asyncio
+async def test_api_call_count_survives_restart_on_same_day(hass):
+    store = NswFuelStore(hass, "entry-a")
+    await store.async_load()
+    counter = ApiCallCounter(hass, SimpleNamespace(data={CONF_DAILY_QUOTA: 100}))
+    await counter.async_increment(40)
+    counter.record_retry("server_error")
+    store.async_set_api_calls(counter.data)
+
+    restarted = ApiCallCounter(hass, SimpleNamespace(data={CONF_DAILY_QUOTA: 100}))
+    restarted.async_restore(store.api_calls())
+    assert restarted.data["count"] == 40
+    assert restarted.data["retries"] == {"server_error": 1}
+    assert restarted.remaining == 60
+
+    store.async_set_api_calls({**counter.data, "date": "2000-01-01"})
+    next_day = ApiCallCounter(hass, SimpleNamespace(data={CONF_DAILY_QUOTA: 100}))
+    next_day.async_restore(store.api_calls())
+    assert next_day.data["count"] == 0
+    assert next_day.remaining == 100
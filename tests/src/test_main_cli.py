@@ -21,6 +21,7 @@ def _set_common_env(monkeypatch) -> None:
     monkeypatch.setenv("NSW_FUEL_API_RADIUS_KM", "10")
     monkeypatch.setenv("NSW_FUEL_API_STATION_CODE", "")
     monkeypatch.setenv("NSW_FUEL_API_RESULTS_LIMIT", "10")
+    monkeypatch.setenv("NSW_FUEL_API_STATES", "")
 
 
 def test_main_calls_nearby_once_per_preferred_fuel(monkeypatch):
@@ -103,3 +104,33 @@ def test_main_falls_back_to_single_fuel_when_preferred_empty(monkeypatch):
     cli_main.main()
 
     assert calls == ["U91"]
+
+
+def test_main_streams_statewide_prices_when_states_set(monkeypatch, capsys):
+    _set_common_env(monkeypatch)
+    monkeypatch.setenv("NSW_FUEL_API_STATES", "NSW")
+    monkeypatch.setenv("NSW_FUEL_API_PREFERRED_FUELS", "E10")
+    monkeypatch.setenv("NSW_FUEL_API_RESULTS_LIMIT", "1")
+    body = (
+        b'{"stations": [{"code": "1", "brand": "A", "name": "One"},'
+        b' {"code": "2", "brand": "B", "name": "Two"}],'
+        b' "prices": [{"stationcode": "1", "fueltype": "E10", "price": 180.0},'
+        b' {"stationcode": "2", "fueltype": "E10", "price": 170.0},'
+        b' {"stationcode": "2", "fueltype": "U91", "price": 150.0}]}'
+    )
+
+    class FakeClient:
+        def __init__(self, **_kwargs) -> None:
+            return
+
+        def iter_prices_v2_chunks(self, states):
+            assert states == "NSW"
+            return (body[i : i + 16] for i in range(0, len(body), 16))
+
+    monkeypatch.setattr(cli_main, "NswFuelClient", FakeClient)
+
+    cli_main.main()
+
+    output = capsys.readouterr().out
+    assert "Cheapest 1 prices in NSW." in output
+    assert "170.0 E10 | B | Two" in output
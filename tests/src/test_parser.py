@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from parser import (
+    filter_cheapest_fuels,
+    iter_payload_items,
+    join_station_prices,
+    stream_station_prices,
+)
+
+PAYLOAD = {
+    "stations": [
+        {"code": "1", "brand": "Ampol", "name": "Café One", "location": {"latitude": -33.1}},
+        {"code": 2, "brand": "BP", "name": "Two"},
+    ],
+    "total": 12345,
+    "prices": [
+        {"stationcode": "1", "fueltype": "E10", "price": 170.5},
+        {"stationcode": 2, "fueltype": "U91", "price": 180},
+        {"stationcode": "9", "fueltype": "E10", "price": 160.1},
+    ],
+    "meta": {"nested": [1, {"a": "]"}]},
+}
+
+
+def _chunks(payload, size):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize("size", [1, 3, 17, 4096])
+def test_streamed_join_matches_materialised_join(size):
+    assert list(stream_station_prices(_chunks(PAYLOAD, size))) == join_station_prices(PAYLOAD)
+
+
+def test_streamed_records_are_yielded_before_the_body_ends():
+    chunks = iter(_chunks(PAYLOAD, 8))
+    records = stream_station_prices(chunks, ["E10"])
+
+    first = next(records)
+
+    assert first.name == "Café One"
+    assert next(chunks, None) is not None
+
+
+def test_stream_filters_fuels_and_handles_prices_before_stations():
+    reordered = {"prices": PAYLOAD["prices"], "stations": PAYLOAD["stations"]}
+
+    records = list(stream_station_prices(_chunks(reordered, 5), ["E10"]))
+
+    assert [(r.stationcode, r.name) for r in records] == [("1", "Café One"), ("9", None)]
+
+
+def test_records_at_one_station_share_its_metadata():
+    payload = {
+        "stations": [{"code": 1, "brand": "BP", "location": {"latitude": -33.1}}],
+        "prices": [
+            {"stationcode": 1, "fueltype": "E10", "price": 170.5},
+            {"stationcode": "1", "fueltype": "U91", "price": 180},
+            {"stationcode": 7, "fueltype": "E10", "price": 150},
+            {"stationcode": 7, "fueltype": "U91", "price": 160},
+        ],
+    }
+
+    e10, u91, unknown_e10, unknown_u91 = join_station_prices(payload)
+
+    assert e10.station is u91.station
+    assert (e10.brand, e10.station.location) == ("BP", {"latitude": -33.1})
+    assert unknown_e10.station is unknown_u91.station
+    assert unknown_e10.brand is None
+
+
+def test_payload_items_skip_other_values_and_reject_truncated_bodies():
+    items = list(iter_payload_items([b'{"count": 10, "prices": [], "stations": [{"code": 1}]}']))
+    assert items == [("stations", {"code": 1})]
+
+    with pytest.raises(ValueError):
+        list(iter_payload_items([b'{"prices": [{"stationcode": 1}']))
+
+
+def test_filter_cheapest_fuels_keeps_sorted_order_with_a_limit():
+    records = join_station_prices(
+        {
+            "stations": [],
+            "prices": [
+                {"stationcode": code, "fueltype": fuel, "price": price}
+                for code, fuel, price in [
+                    (1, "E10", 180), (2, "E10", None), (3, "U91", 150),
+                    (4, "E10", 170), (5, "E10", 170), (6, "DL", 100),
+                ]
+            ],
+        }
+    )
+
+    everything = filter_cheapest_fuels(records, ["E10", "U91"])
+
+    assert [r.stationcode for r in everything] == ["3", "4", "5", "1", "2"]
+    assert filter_cheapest_fuels(records, ["E10", "U91"], limit=3) == everything[:3]
+    assert filter_cheapest_fuels(records, ["E10"], limit=0) == []